@@ -1,18 +1,41 @@
-from flask import Blueprint, request, jsonify, session
-from src.main import supabase
+import math
+
+import numpy as np
+from flask import Blueprint, request, jsonify, g
+from src.repositories import get_repositories
+from src.reference_data import reference_data
+from src.airline_context import require_airline
+from src.query_executor import fan_out
+from src.profitability import RouteColumns, profit_matrix, ECONOMICS_FIELDS
+from src.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, page_params, paginate, page_body
+from src.http_caching import CATALOG_CACHE_CONTROL, content_tag, not_modified, tagged_json
+from src.result_cache import result_cache
+from src.repositories.schema import columns as table_columns
 
 aircraft_bp = Blueprint('aircraft', __name__)
 
 @aircraft_bp.route('/', methods=['GET'])
 def get_all_aircraft():
-    """Get all aircraft from the database"""
+    """Get aircraft from the database, one id-ordered page at a time"""
     try:
-        # Get all aircraft data
-        aircraft_data = supabase.table('aircraft').select('*').execute()
+        try:
+            page = page_params(table_columns('aircraft'))
+        except ValueError as e:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': str(e)
+            }), 400
+            
+        # The page is fully determined by the catalog snapshot and the query
+        tag = content_tag(reference_data.aircraft_tag(), page.limit, page.after_id, page.fields)
+        cached = not_modified(tag, CATALOG_CACHE_CONTROL)
+        if cached:
+            return cached
         
-        return jsonify({
-            'aircraft': aircraft_data.data
-        }), 200
+        # Page through the cached catalog
+        rows = paginate(reference_data.aircraft_rows(), page)
+        
+        return tagged_json(page_body('aircraft', rows, page), tag, CATALOG_CACHE_CONTROL), 200
             
     except Exception as e:
         return jsonify({
@@ -24,18 +47,23 @@ def get_all_aircraft():
 def get_aircraft(id):
     """Get a specific aircraft by ID"""
     try:
+        tag = content_tag(reference_data.aircraft_tag(), id)
+        cached = not_modified(tag, CATALOG_CACHE_CONTROL)
+        if cached:
+            return cached
+        
         # Get aircraft data
-        aircraft_data = supabase.table('aircraft').select('*').eq('id', id).execute()
+        aircraft = reference_data.aircraft(id)
         
-        if not aircraft_data.data:
+        if not aircraft:
             return jsonify({
                 'error': 'Aircraft not found',
                 'message': f'No aircraft found with ID {id}'
             }), 404
             
-        return jsonify({
-            'aircraft': aircraft_data.data[0]
-        }), 200
+        return tagged_json({
+            'aircraft': aircraft
+        }, tag, CATALOG_CACHE_CONTROL), 200
             
     except Exception as e:
         return jsonify({
@@ -43,6 +71,244 @@ def get_aircraft(id):
             'message': str(e)
         }), 500
 
+def operable_airports(aircraft_id, origin_code, min_distance, max_distance, limit, offset):
+    """Airports an aircraft type can use, optionally reachable from an origin.
+
+    Without an origin these are all airports with a long enough runway, in
+    catalog order. With one, they are the destinations within the distance
+    bounds (capped at the aircraft's range), nearest first, and none at all
+    if the aircraft cannot use the origin itself.
+    """
+    aircraft = reference_data.aircraft(aircraft_id)
+    
+    if not aircraft:
+        return jsonify({
+            'error': 'Aircraft not found',
+            'message': f'No aircraft found with ID {aircraft_id}'
+        }), 404
+        
+    airports = reference_data.airports()
+    usable = reference_data.runway_feasibility().airports_for(
+        reference_data.aircraft_list().position(aircraft_id)
+    )
+    
+    origin = None
+    distances = None
+    if origin_code:
+        origin = reference_data.airport(origin_code)
+        
+        if not origin:
+            return jsonify({
+                'error': 'Airport not found',
+                'message': f'No airport found with code {origin_code}'
+            }), 404
+            
+        # Destinations in range come from the spatial index, sorted by distance
+        origin_index = airports.position(origin_code)
+        radius = aircraft['range_km'] if max_distance is None else min(max_distance, aircraft['range_km'])
+        indexes, distances = reference_data.spatial_index().within(
+            origin['latitude'], origin['longitude'], radius
+        )
+        keep = (indexes != origin_index) & usable[indexes] & (distances >= min_distance)
+        if not usable[origin_index]:
+            keep[:] = False
+        indexes, distances = indexes[keep], distances[keep]
+    else:
+        indexes = np.flatnonzero(usable)
+        
+    page = []
+    for j in range(offset, min(offset + limit, len(indexes))):
+        airport = airports[indexes[j]]
+        if distances is not None:
+            airport = dict(airport)
+            airport['distance_km'] = round(float(distances[j]))
+        page.append(airport)
+        
+    return jsonify({
+        'aircraft': aircraft,
+        'origin': origin,
+        'count': len(indexes),
+        'limit': limit,
+        'offset': offset,
+        'airports': page
+    }), 200
+
+@aircraft_bp.route('/<int:id>/airports', methods=['GET'])
+def get_operable_airports(id):
+    """Airports where an aircraft type can operate"""
+    try:
+        origin_code = request.args.get('origin')
+        min_distance = request.args.get('min_distance_km', 0, type=float)
+        max_distance = request.args.get('max_distance_km', type=float)
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        
+        if (min_distance or max_distance is not None) and not origin_code:
+            return jsonify({
+                'error': 'Missing required parameters',
+                'message': 'Distance bounds require an origin airport code'
+            }), 400
+            
+        distances = [min_distance] if max_distance is None else [min_distance, max_distance]
+        if limit < 1 or limit > MAX_PAGE_SIZE or offset < 0 or not all(math.isfinite(d) and d >= 0 for d in distances):
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': f'limit must be between 1 and {MAX_PAGE_SIZE}, offset non-negative and distances finite and non-negative'
+            }), 400
+            
+        # The answer depends only on the reference catalogs and the query
+        tag = content_tag(reference_data.snapshot_tag(), id, origin_code, min_distance, max_distance, limit, offset)
+        cached = not_modified(tag, CATALOG_CACHE_CONTROL)
+        if cached:
+            return cached
+        
+        response, status = operable_airports(id, origin_code, min_distance, max_distance, limit, offset)
+        if status == 200:
+            response.set_etag(tag)
+            response.headers['Cache-Control'] = CATALOG_CACHE_CONTROL
+            
+        return response, status
+            
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to find operable airports',
+            'message': str(e)
+        }), 500
+
+# Upper bound on route ids accepted by one batch recommendation call
+MAX_BATCH_ROUTES = 500
+
+def route_feasibility(routes):
+    """Boolean aircraft x route matrix of range and runway feasibility.
+
+    Runway checks AND the precomputed bitsets of each route's two airports;
+    routes touching an unknown airport are infeasible for every aircraft.
+    """
+    airports = reference_data.airports()
+    origins = airports.positions(route['origin_airport_code'] for route in routes)
+    destinations = airports.positions(route['destination_airport_code'] for route in routes)
+    distance = np.array([route['distance_km'] for route in routes], dtype=np.float64)
+    runway = reference_data.runway_feasibility().aircraft_for_routes(origins, destinations)
+    return (reference_data.aircraft_columns().range_km[:, None] >= distance[None, :]) & runway
+
+def rank_aircraft_for_routes(routes):
+    """Rank feasible aircraft for each route, best first.
+
+    Scores every route against the whole cached catalog in one aircraft x
+    route profit matrix. Returns one list of aircraft dicts per route.
+    """
+    aircraft_list = reference_data.aircraft_rows()
+    columns = reference_data.aircraft_columns()
+    economics = profit_matrix(columns, RouteColumns.from_routes(routes))
+    feasible = route_feasibility(routes)
+    
+    ranked = []
+    for r in range(len(routes)):
+        candidates = np.flatnonzero(feasible[:, r])
+        
+        # Sort by profitability, keeping catalog order for ties
+        order = candidates[np.argsort(-economics['estimated_profit'][candidates, r], kind='stable')]
+        
+        # Rows are copied because the profitability fields must not leak into the shared cache
+        recommended = []
+        for i in order:
+            aircraft = dict(aircraft_list[i])
+            for field in ECONOMICS_FIELDS:
+                aircraft[field] = float(economics[field][i, r])
+            recommended.append(aircraft)
+        ranked.append(recommended)
+        
+    return ranked
+
+def recommend_aircraft_batch(route_ids):
+    """Recommend aircraft for many routes with a single routes query"""
+    if not route_ids:
+        return jsonify({
+            'error': 'Missing required parameters',
+            'message': 'At least one route ID is required'
+        }), 400
+        
+    if len(route_ids) > MAX_BATCH_ROUTES:
+        return jsonify({
+            'error': 'Too many routes',
+            'message': f'At most {MAX_BATCH_ROUTES} routes can be requested at once'
+        }), 400
+        
+    # Query-string ids arrive as text; JSON ids must already be integers,
+    # so 1.7 and true are rejected rather than truncated
+    try:
+        route_ids = [int(route_id) if isinstance(route_id, str) else route_id for route_id in route_ids]
+    except ValueError:
+        route_ids = None
+    if route_ids is None or not all(type(route_id) is int for route_id in route_ids):
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': 'Route IDs must be integers'
+        }), 400
+        
+    # Get all routes in one query while making sure the catalog is loaded
+    routes_by_id = fan_out(
+        routes=lambda: get_repositories().routes.get_many(route_ids),
+        catalog=reference_data.aircraft_list
+    )['routes']
+    
+    recommendations = []
+    missing_route_ids = []
+    scored_routes = []
+    
+    for route_id in route_ids:
+        route = routes_by_id.get(route_id)
+        
+        if not route:
+            missing_route_ids.append(route_id)
+            continue
+            
+        # Get origin and destination airports
+        origin_airport = reference_data.airport(route['origin_airport_code'])
+        destination_airport = reference_data.airport(route['destination_airport_code'])
+        
+        if not origin_airport or not destination_airport:
+            recommendations.append({
+                'route': route,
+                'error': 'Airport not found',
+                'message': 'Origin or destination airport not found'
+            })
+            continue
+            
+        entry = {'route': route}
+        recommendations.append(entry)
+        scored_routes.append(entry)
+        
+    # Score all routes in one pass
+    if scored_routes:
+        ranked = rank_aircraft_for_routes([entry['route'] for entry in scored_routes])
+        for entry, recommended in zip(scored_routes, ranked):
+            entry['recommended_aircraft'] = recommended
+            
+    return jsonify({
+        'recommendations': recommendations,
+        'missing_route_ids': missing_route_ids
+    }), 200
+
+def recommend_aircraft_for_route(route):
+    """Recommended aircraft response for one route row"""
+    # Get origin and destination airports
+    origin_airport = reference_data.airport(route['origin_airport_code'])
+    destination_airport = reference_data.airport(route['destination_airport_code'])
+    
+    if not origin_airport or not destination_airport:
+        return jsonify({
+            'error': 'Airport not found',
+            'message': 'Origin or destination airport not found'
+        }), 404
+        
+    sorted_aircraft = rank_aircraft_for_routes([route])[0]
+    
+    return jsonify({
+        'route': route,
+        'recommended_aircraft': sorted_aircraft
+    }), 200
+
 @aircraft_bp.route('/recommend', methods=['GET'])
 def recommend_aircraft():
     """Recommend aircraft based on route parameters"""
@@ -56,92 +322,109 @@ def recommend_aircraft():
                 'message': 'Route ID is required'
             }), 400
             
-        # Get route data
-        route_data = supabase.table('routes').select('*').eq('id', route_id).execute()
+        # A comma-separated list of route IDs is answered in batch form
+        if ',' in route_id:
+            return recommend_aircraft_batch([r for r in route_id.split(',') if r.strip()])
+            
+        try:
+            route_id = int(route_id)
+        except ValueError:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': 'Route ID must be an integer'
+            }), 400
+            
+        # Get route data while making sure the catalog is loaded
+        route = fan_out(
+            route=lambda: get_repositories().routes.get(route_id),
+            catalog=reference_data.aircraft_list
+        )['route']
         
-        if not route_data.data:
+        if not route:
             return jsonify({
                 'error': 'Route not found',
                 'message': f'No route found with ID {route_id}'
             }), 404
             
-        route = route_data.data[0]
-        
-        # Get origin and destination airports
-        origin_airport = supabase.table('airports').select('*').eq('code', route['origin_airport_code']).execute()
-        destination_airport = supabase.table('airports').select('*').eq('code', route['destination_airport_code']).execute()
+        # Keyed by the route's content, so a change made through any worker
+        # or host leads to a new key rather than a stale hit
+        return result_cache.respond(
+            ('aircraft.recommend', content_tag(route), reference_data.snapshot_tag()),
+            lambda: recommend_aircraft_for_route(route)
+        )
+            
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to recommend aircraft',
+            'message': str(e)
+        }), 500
+
+@aircraft_bp.route('/recommend/batch', methods=['POST'])
+def recommend_aircraft_for_routes():
+    """Recommend aircraft for a list of routes in one call"""
+    try:
+        data = request.get_json() or {}
+        route_ids = data.get('route_ids')
         
-        if not origin_airport.data or not destination_airport.data:
+        if not isinstance(route_ids, list):
             return jsonify({
-                'error': 'Airport not found',
-                'message': 'Origin or destination airport not found'
-            }), 404
+                'error': 'Missing required parameters',
+                'message': 'route_ids must be a list of route IDs'
+            }), 400
             
-        # Calculate distance and determine aircraft category
-        distance_km = route['distance_km']
-        
-        # Determine aircraft category based on distance
-        if distance_km <= 2000:
-            category = 'shorthaul'
-        elif distance_km <= 5000:
-            category = 'midhaul'
-        else:
-            category = 'longhaul'
+        return recommend_aircraft_batch(route_ids)
             
-        # Get suitable aircraft based on range and runway requirements
-        suitable_aircraft = supabase.table('aircraft').select('*').gte('range_km', distance_km).execute()
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to recommend aircraft',
+            'message': str(e)
+        }), 500
+
+@aircraft_bp.route('/profit-matrix', methods=['GET'])
+@require_airline
+def get_profit_matrix():
+    """Profitability of every aircraft type on every route of the user's airline"""
+    try:
+        airline_id = g.airline['id']
         
-        # Filter by runway requirements
-        origin_runway = origin_airport.data[0]['runway_length']
-        destination_runway = destination_airport.data[0]['runway_length']
-        min_runway = min(origin_runway, destination_runway)
+        # Get routes for airline while making sure the catalog is loaded
+        routes = fan_out(
+            routes=lambda: get_repositories().routes.list_for_airline(airline_id),
+            catalog=reference_data.aircraft_list
+        )['routes']
         
-        filtered_aircraft = [a for a in suitable_aircraft.data if a['required_runway_length'] <= min_runway]
+        # Optionally restrict the aircraft axis
+        aircraft_list = reference_data.aircraft_list()
+        columns = reference_data.aircraft_columns()
+        rows = np.arange(len(aircraft_list))
         
-        # Calculate profitability for each aircraft
-        for aircraft in filtered_aircraft:
-            # Calculate basic operational costs
-            flight_time_hours = distance_km / aircraft['speed_kmh']
-            fuel_cost = aircraft['fuel_consumption'] * flight_time_hours * 0.8  # Assuming $0.8 per unit of fuel
-            maintenance_cost = aircraft['maintenance_cost'] * flight_time_hours
-            
-            # Calculate potential revenue based on demand and capacity
-            eco_capacity = aircraft['capacity_eco']
-            business_capacity = aircraft['capacity_business']
-            first_capacity = aircraft['capacity_first']
-            
-            eco_demand = min(route['demand_economy'], eco_capacity)
-            business_demand = min(route['demand_business'], business_capacity)
-            first_demand = min(route['demand_first'], first_capacity)
+        aircraft_ids = request.args.get('aircraft_ids')
+        if aircraft_ids:
+            try:
+                wanted = {int(a) for a in aircraft_ids.split(',') if a.strip()}
+            except ValueError:
+                return jsonify({
+                    'error': 'Invalid parameters',
+                    'message': 'Aircraft IDs must be integers'
+                }), 400
+            rows = np.array([i for i, a in enumerate(aircraft_list) if a['id'] in wanted], dtype=np.intp)
             
-            # Assume average ticket prices
-            eco_price = distance_km * 0.1  # $0.1 per km
-            business_price = distance_km * 0.3  # $0.3 per km
-            first_price = distance_km * 0.5  # $0.5 per km
-            
-            revenue = (eco_demand * eco_price) + (business_demand * business_price) + (first_demand * first_price)
-            
-            # Calculate profit
-            profit = revenue - (fuel_cost + maintenance_cost)
-            
-            # Add profitability data to aircraft
-            aircraft['estimated_profit'] = profit
-            aircraft['flight_time_hours'] = flight_time_hours
-            aircraft['fuel_cost'] = fuel_cost
-            aircraft['maintenance_cost'] = maintenance_cost
-            aircraft['estimated_revenue'] = revenue
-            
-        # Sort by profitability
-        sorted_aircraft = sorted(filtered_aircraft, key=lambda x: x['estimated_profit'], reverse=True)
+        economics = profit_matrix(columns, RouteColumns.from_routes(routes))
+        feasible = route_feasibility(routes)
         
         return jsonify({
-            'route': route,
-            'recommended_aircraft': sorted_aircraft
+            'aircraft_ids': [aircraft_list[i]['id'] for i in rows],
+            'route_ids': [route['id'] for route in routes],
+            'feasible': feasible[rows].tolist(),
+            'estimated_profit': economics['estimated_profit'][rows].tolist(),
+            'estimated_revenue': economics['estimated_revenue'][rows].tolist(),
+            'cost': economics['cost'][rows].tolist(),
+            'flight_time_hours': economics['flight_time_hours'][rows].tolist()
         }), 200
             
     except Exception as e:
         return jsonify({
-            'error': 'Failed to recommend aircraft',
+            'error': 'Failed to compute profit matrix',
             'message': str(e)
         }), 500
 
@@ -156,33 +439,29 @@ def filter_aircraft():
         max_range = request.args.get('max_range')
         aircraft_type = request.args.get('type')  # PAX or cargo
         
-        # Build query
-        query = supabase.table('aircraft').select('*')
+        try:
+            page = page_params(table_columns('aircraft'))
+        except ValueError as e:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': str(e)
+            }), 400
         
-        if manufacturer:
-            query = query.eq('manufacturer', manufacturer)
-            
-        if category:
-            query = query.eq('category', category)
-            
-        if min_range:
-            query = query.gte('range_km', int(min_range))
-            
-        if max_range:
-            query = query.lte('range_km', int(max_range))
-            
-        if aircraft_type:
-            if aircraft_type == 'cargo':
-                query = query.gt('cargo_capacity', 0)
-            elif aircraft_type == 'pax':
-                query = query.gt('capacity_eco', 0)
-                
-        # Execute query
-        result = query.execute()
+        # Intersect the index lookups, then read only the requested page
+        # of the cached catalog, which is in id order
+        index = reference_data.aircraft_index()
+        positions = index.select(
+            manufacturer=manufacturer,
+            category=category,
+            min_range=int(min_range) if min_range else None,
+            max_range=int(max_range) if max_range else None,
+            aircraft_type=aircraft_type
+        )
+        positions = index.after(positions, page.after_id)[:page.limit + 1]
         
-        return jsonify({
-            'aircraft': result.data
-        }), 200
+        catalog = reference_data.aircraft_rows()
+        result = [catalog[i] for i in positions.tolist()]
+        return jsonify(page_body('aircraft', paginate(result, page), page)), 200
             
     except Exception as e:
         return jsonify({
@@ -0,0 +1,80 @@
+import numpy as np
+
+# Text columns with a hash index from value to catalog positions
+HASHED_COLUMNS = ('manufacturer', 'category')
+
+_NONE = np.empty(0, dtype=np.intp)
+
+
+def _group_positions(values):
+    groups = {}
+    for i, value in enumerate(values):
+        if value is not None:
+            groups.setdefault(value, []).append(i)
+    return {value: np.array(positions, dtype=np.intp) for value, positions in groups.items()}
+
+
+class AircraftIndex:
+    """Eligibility lookups over the aircraft catalog.
+
+    Range bounds bisect a copy of ``range_km`` in sorted order, and
+    manufacturer, category and pax/cargo each map to the catalog positions
+    holding that value. A query intersects the candidate sets, smallest
+    first. Positions refer to rows of the id-ordered catalog the index was
+    built from, so sorted positions are also sorted by id.
+    """
+
+    def __init__(self, aircraft):
+        ranges = aircraft.column('range_km')
+        known = np.flatnonzero(~np.isnan(ranges))
+        self.range_order = known[np.argsort(ranges[known], kind='stable')]
+        self.range_sorted = ranges[self.range_order]
+        self.ids = aircraft.column('id')
+        self.hashed = {name: _group_positions(aircraft.values(name)) for name in HASHED_COLUMNS}
+        self.types = {
+            'pax': np.flatnonzero(aircraft.column('capacity_eco', null=0) > 0),
+            'cargo': np.flatnonzero(aircraft.column('cargo_capacity', null=0) > 0)
+        }
+        self.size = len(aircraft)
+
+    def in_range(self, low=None, high=None):
+        """Sorted positions with ``low <= range_km <= high``"""
+        start = 0 if low is None else np.searchsorted(self.range_sorted, low, side='left')
+        stop = len(self.range_sorted) if high is None else np.searchsorted(self.range_sorted, high, side='right')
+        return np.sort(self.range_order[start:stop])
+
+    def matching(self, name, value):
+        """Sorted positions whose ``name`` equals ``value``"""
+        return self.hashed[name].get(value, _NONE)
+
+    def select(self, manufacturer=None, category=None, min_range=None, max_range=None, aircraft_type=None):
+        """Sorted positions matching every given filter.
+
+        ``aircraft_type`` is 'pax' or 'cargo'; other values do not filter.
+        """
+        candidates = []
+        if manufacturer:
+            candidates.append(self.matching('manufacturer', manufacturer))
+        if category:
+            candidates.append(self.matching('category', category))
+        if min_range is not None or max_range is not None:
+            candidates.append(self.in_range(min_range, max_range))
+        if aircraft_type in self.types:
+            candidates.append(self.types[aircraft_type])
+
+        if not candidates:
+            return np.arange(self.size)
+        candidates.sort(key=len)
+        result = candidates[0]
+        for other in candidates[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+    def after(self, positions, after_id):
+        """The part of sorted ``positions`` whose ids come after ``after_id``"""
+        if after_id is None:
+            return positions
+        start = np.searchsorted(self.ids, after_id, side='right')
+        return positions[np.searchsorted(positions, start):]
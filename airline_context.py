@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import g, jsonify, session
+
+from src.repositories import get_repositories
+from src.metrics import record_cache_lookup
+
+# How long a resolved airline row is reused before re-reading it (seconds)
+AIRLINE_CACHE_TTL = float(os.getenv('AIRLINE_CACHE_TTL', '30'))
+
+# Maximum number of users whose airline is kept per worker
+AIRLINE_CACHE_SIZE = int(os.getenv('AIRLINE_CACHE_SIZE', '1024'))
+
+
+class AirlineCache:
+    """Small per-worker LRU of airline rows keyed by user id, with a TTL"""
+
+    def __init__(self, ttl=AIRLINE_CACHE_TTL, max_size=AIRLINE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                record_cache_lookup('airline', hit=True)
+                return entry[1]
+            self.misses += 1
+            record_cache_lookup('airline', hit=False)
+            return None
+
+    def set(self, user_id, airline):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), airline)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared instance used by all blueprints in this worker
+airline_cache = AirlineCache()
+
+
+def load_airline(user_id):
+    """Airline row for a user, from the cache or the airlines table"""
+    airline = airline_cache.get(user_id)
+    if airline is None:
+        airline = get_repositories().airlines.get_by_user(user_id)
+        if airline is None:
+            return None
+        airline_cache.set(user_id, airline)
+    return airline
+
+
+def refresh_airline(user_id):
+    """Airline row read from the airlines table, replacing any cached copy.
+
+    Airline rows can change outside this app (balance, hub, admin edits),
+    which only reach ``load_airline`` once the cached copy expires, so
+    responses that show the row itself read it fresh.
+    """
+    airline_cache.invalidate(user_id)
+    return load_airline(user_id)
+
+
+def current_airline():
+    """Airline of the logged-in user, resolved at most once per request"""
+    if 'airline' not in g:
+        user = session.get('user')
+        g.airline = load_airline(user.get('id')) if user else None
+    return g.airline
+
+
+def require_airline(view):
+    """Reject the request unless the session user has an airline.
+
+    On success ``g.user`` and ``g.airline`` are set for the view.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user = session.get('user')
+
+        if not user:
+            return jsonify({
+                'error': 'Unauthorized',
+                'message': 'User not logged in'
+            }), 401
+
+        g.user = user
+
+        try:
+            airline = current_airline()
+        except Exception as e:
+            return jsonify({
+                'error': 'Failed to get airline data',
+                'message': str(e)
+            }), 500
+
+        if not airline:
+            return jsonify({
+                'error': 'Airline not found',
+                'message': 'No airline found for current user'
+            }), 404
+
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,64 @@
+import math
+
+from flask import Blueprint, request, jsonify
+from src.reference_data import reference_data
+from src.pagination import MAX_PAGE_SIZE
+from src.spatial_index import airports_near
+
+airports_bp = Blueprint('airports', __name__)
+
+@airports_bp.route('/nearby', methods=['GET'])
+def nearby_airports():
+    """Find airports within a radius of, or nearest to, an airport"""
+    try:
+        # Get parameters
+        code = request.args.get('code')
+        radius_km = request.args.get('radius_km', type=float)
+        k = request.args.get('k', type=int)
+        
+        if not code or (radius_km is None and k is None):
+            return jsonify({
+                'error': 'Missing required parameters',
+                'message': 'Airport code and radius_km or k are required'
+            }), 400
+            
+        # float() also accepts nan and inf, which the spatial index cannot use
+        bad_radius = radius_km is not None and not (math.isfinite(radius_km) and radius_km >= 0)
+        bad_k = k is not None and not 1 <= k <= MAX_PAGE_SIZE
+        if bad_radius or bad_k:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': f'radius_km must be a finite non-negative number and k between 1 and {MAX_PAGE_SIZE}'
+            }), 400
+            
+        # Get origin airport
+        origin = reference_data.airport(code)
+        
+        if not origin:
+            return jsonify({
+                'error': 'Airport not found',
+                'message': f'No airport found with code {code}'
+            }), 404
+            
+        # Query the spatial index
+        airports = reference_data.airports()
+        indexes, distances = airports_near(
+            reference_data.spatial_index(), origin, radius_km=radius_km, k=k
+        )
+        
+        nearby = []
+        for i, distance in zip(indexes, distances):
+            airport = dict(airports[i])
+            airport['distance_km'] = round(float(distance))
+            nearby.append(airport)
+            
+        return jsonify({
+            'origin': origin,
+            'airports': nearby
+        }), 200
+            
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to find nearby airports',
+            'message': str(e)
+        }), 500
@@ -29,17 +29,34 @@ export const authAPI = {
   getUser: () => api.get('/auth/user'),
 };
 
+// Follow keyset pages of a list endpoint and return every row under `key`
+const getAllPages = async (url: string, key: string, params: any = {}) => {
+  const rows: any[] = [];
+  let afterId = null;
+  let response;
+  do {
+    response = await api.get(url, {
+      params: { ...params, limit: 1000, ...(afterId !== null ? { after_id: afterId } : {}) },
+    });
+    rows.push(...(response.data[key] || []));
+    afterId = response.data.next_after_id;
+  } while (afterId !== null && afterId !== undefined);
+  return { ...response, data: { ...response.data, [key]: rows, next_after_id: null } };
+};
+
 // Aircraft endpoints
 export const aircraftAPI = {
-  getAll: () => api.get('/aircraft/'),
+  getAll: () => getAllPages('/aircraft/', 'aircraft'),
+  getPage: (params: any) => api.get('/aircraft/', { params }),
   getById: (id: number) => api.get(`/aircraft/${id}`),
   recommend: (routeId: number) => api.get(`/aircraft/recommend?route_id=${routeId}`),
-  filter: (params: any) => api.get('/aircraft/filter', { params }),
+  filter: (params: any) => getAllPages('/aircraft/filter', 'aircraft', params),
 };
 
 // Routes endpoints
 export const routesAPI = {
-  getAll: () => api.get('/routes/'),
+  getAll: () => getAllPages('/routes/', 'routes'),
+  getPage: (params: any) => api.get('/routes/', { params }),
   getById: (id: number) => api.get(`/routes/${id}`),
   create: (data: any) => api.post('/routes/', data),
   update: (id: number, data: any) => api.put(`/routes/${id}`, data),
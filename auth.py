@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify, session
 from src.main import supabase
+from src.airline_context import airline_cache, refresh_airline
+from src.query_executor import fan_out
+from src.repositories import get_repositories
 import json
 
 auth_bp = Blueprint('auth', __name__)
@@ -30,12 +33,13 @@ def register():
             hub_airport_code = data.get('hub_airport_code', 'JFK')
             
             # Insert airline data into the airlines table
-            airline_data = supabase.table('airlines').insert({
+            get_repositories().airlines.create({
                 'user_id': response.user.id,
                 'name': airline_name,
                 'hub_airport_code': hub_airport_code,
                 'balance': 1000000  # Starting balance
-            }).execute()
+            })
+            airline_cache.invalidate(response.user.id)
             
             return jsonify({
                 'message': 'User registered successfully',
@@ -84,8 +88,8 @@ def login():
             'access_token': response.session.access_token
         }
         
-        # Get airline data
-        airline_data = supabase.table('airlines').select('*').eq('user_id', response.user.id).execute()
+        # Get airline data, refreshing the cached row on login
+        airline = refresh_airline(response.user.id)
         
         return jsonify({
             'message': 'Login successful',
@@ -93,7 +97,7 @@ def login():
                 'id': response.user.id,
                 'email': response.user.email
             },
-            'airline': airline_data.data[0] if airline_data.data else None,
+            'airline': airline,
             'token': response.session.access_token
         }), 200
             
@@ -136,18 +140,20 @@ def get_user():
                 'message': 'User not logged in'
             }), 401
             
-        # Get user data from Supabase
-        user_data = supabase.auth.get_user(user.get('access_token'))
-        
-        # Get airline data
-        airline_data = supabase.table('airlines').select('*').eq('user_id', user.get('id')).execute()
+        # Get user and airline data concurrently
+        results = fan_out(
+            user=lambda: supabase.auth.get_user(user.get('access_token')),
+            airline=lambda: refresh_airline(user.get('id'))
+        )
+        user_data = results['user']
+        airline = results['airline']
         
         return jsonify({
             'user': {
                 'id': user_data.user.id,
                 'email': user_data.user.email
             },
-            'airline': airline_data.data[0] if airline_data.data else None
+            'airline': airline
         }), 200
             
     except Exception as e:
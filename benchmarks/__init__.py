@@ -0,0 +1,10 @@
+"""Micro-benchmarks for the compute kernels behind the API.
+
+Run ``python -m src.benchmarks.run --output results.json`` to time every
+kernel on a synthetic world-scale dataset, and pass ``--baseline`` with an
+earlier results file to compare two commits.
+
+``python -m src.benchmarks.load_test`` runs the whole app against a local
+fake Supabase (``fake_supabase.py``) with injected network latency and
+reports per-endpoint throughput and p50/p95/p99 latency.
+"""
@@ -0,0 +1,270 @@
+"""Local stand-in for the Supabase PostgREST and GoTrue HTTP APIs.
+
+Serves the application tables from a ``MemoryStore`` and answers the auth
+calls the app makes (sign up, password login, get user, logout). Every call
+sleeps for a configurable latency plus uniform jitter, so end-to-end runs
+pay realistic round-trip costs.
+"""
+import argparse
+import base64
+import csv
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from src.repositories.stores import FILTER_OPS, MemoryStore
+
+# Query parameters that are not column filters
+RESERVED_PARAMS = ('select', 'order', 'limit', 'offset', 'columns', 'on_conflict')
+
+
+def make_token(user_id, ttl=3600):
+    """Unsigned JWT carrying the user id; the fake never verifies signatures"""
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b'=').decode()
+    now = int(time.time())
+    payload = {'sub': user_id, 'aud': 'authenticated', 'role': 'authenticated', 'iat': now, 'exp': now + ttl}
+    return f'{encode({"alg": "HS256", "typ": "JWT"})}.{encode(payload)}.fake'
+
+
+def parse_filter(expression):
+    """Split ``op.value`` into an (op, value) pair understood by the stores"""
+    op, _, value = expression.partition('.')
+    if op not in FILTER_OPS:
+        raise ValueError(f'Unsupported filter {expression}')
+    if op == 'in':
+        value = next(csv.reader([value.strip('()')])) if value.strip('()') else []
+    return op, value
+
+
+class FakeSupabase:
+    """Tables, users and per-call latency shared by all request handlers"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, seed=None, max_rows=None):
+        self.store = MemoryStore()
+        # Like PostgREST's db-max-rows: no response carries more rows than this
+        self.max_rows = max_rows
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.users = {}
+        self.calls = Counter()
+
+    def load(self, data):
+        for table, rows in data.items():
+            for row in rows:
+                self.store.insert(table, row)
+
+    def add_user(self, email, password, user_id=None):
+        user = {
+            'id': user_id or str(uuid.uuid4()),
+            'email': email,
+            'aud': 'authenticated',
+            'role': 'authenticated',
+            'app_metadata': {'provider': 'email'},
+            'user_metadata': {},
+            'created_at': '2025-01-01T00:00:00Z'
+        }
+        with self._lock:
+            self.users[email] = (password, user)
+        return user
+
+    def user_for_token(self, token):
+        # Tokens embed the user id, so decode instead of keeping a token table
+        try:
+            payload = token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        except (AttributeError, IndexError, ValueError):
+            return None
+        with self._lock:
+            for _, user in self.users.values():
+                if user['id'] == claims.get('sub'):
+                    return user
+        return None
+
+    def session(self, user):
+        return {
+            'access_token': make_token(user['id']),
+            'refresh_token': uuid.uuid4().hex,
+            'token_type': 'bearer',
+            'expires_in': 3600,
+            'expires_at': int(time.time()) + 3600,
+            'user': user
+        }
+
+    def delay(self):
+        seconds = (self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def record(self, key):
+        with self._lock:
+            self.calls[key] += 1
+
+    def stats(self):
+        with self._lock:
+            return {'total_calls': sum(self.calls.values()), 'calls': dict(self.calls)}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one segment so Nagle/delayed ACK add no latency
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    fake = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        payload = b'' if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _bearer(self):
+        header = self.headers.get('Authorization', '')
+        return header[7:] if header.lower().startswith('bearer ') else None
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        body = self._body()
+        self.fake.delay()
+        try:
+            if url.path.startswith('/rest/v1/'):
+                table = url.path[len('/rest/v1/'):].strip('/')
+                self.fake.record(f'{method} {table}')
+                return self._rest(method, table, parse_qsl(url.query, keep_blank_values=True), body)
+            if url.path.startswith('/auth/v1/'):
+                endpoint = url.path[len('/auth/v1/'):].strip('/')
+                self.fake.record(f'{method} auth/{endpoint}')
+                return self._auth(method, endpoint, dict(parse_qsl(url.query)), body)
+            return self._send(404, {'message': f'No route {url.path}'})
+        except (KeyError, ValueError) as e:
+            return self._send(400, {'message': str(e), 'code': 'PGRST100'})
+
+    def _rest(self, method, table, params, body):
+        store = self.fake.store
+        where = [(column, *parse_filter(value)) for column, value in params if column not in RESERVED_PARAMS]
+        options = dict((k, v) for k, v in params if k in RESERVED_PARAMS)
+
+        if method == 'GET':
+            order_by, descending = None, False
+            if options.get('order'):
+                parts = options['order'].split(',')[0].split('.')
+                order_by, descending = parts[0], 'desc' in parts[1:]
+            rows = store.select(table, where=where, columns=options.get('select', '*'),
+                                order_by=order_by, descending=descending)
+            offset = int(options.get('offset', 0))
+            limit = int(options['limit']) if 'limit' in options else len(rows)
+            if self.fake.max_rows is not None:
+                limit = min(limit, self.fake.max_rows)
+            return self._send(200, rows[offset:offset + limit])
+        if method == 'POST':
+            rows = body if isinstance(body, list) else [body]
+            return self._send(201, [store.insert(table, row) for row in rows])
+        if method == 'PATCH':
+            return self._send(200, store.update(table, body or {}, where))
+        if method == 'DELETE':
+            return self._send(200, store.delete(table, where))
+        return self._send(405, {'message': f'{method} not supported'})
+
+    def _auth(self, method, endpoint, query, body):
+        fake = self.fake
+        if method == 'POST' and endpoint == 'signup':
+            if body['email'] in fake.users:
+                return self._send(422, {'msg': 'User already registered', 'error_code': 'user_already_exists'})
+            user = fake.add_user(body['email'], body['password'])
+            return self._send(200, fake.session(user))
+        if method == 'POST' and endpoint == 'token' and query.get('grant_type') == 'password':
+            password, user = fake.users.get(body.get('email'), (None, None))
+            if user is None or password != body.get('password'):
+                return self._send(400, {'error': 'invalid_grant', 'error_description': 'Invalid login credentials'})
+            return self._send(200, fake.session(user))
+        if method == 'GET' and endpoint == 'user':
+            user = fake.user_for_token(self._bearer())
+            if user is None:
+                return self._send(401, {'msg': 'Invalid token', 'error_code': 'bad_jwt'})
+            return self._send(200, user)
+        if method == 'POST' and endpoint == 'logout':
+            return self._send(204)
+        return self._send(404, {'msg': f'Unsupported auth call {method} {endpoint}'})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+def serve(fake, host='127.0.0.1', port=0):
+    """Start the fake in a daemon thread and return the running server"""
+    handler = type('FakeSupabaseHandler', (Handler,), {'fake': fake})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name='fake-supabase').start()
+    return server
+
+
+def seed(fake, data, users):
+    """Load ``data`` and create ``users`` logins, each owning airline ``i``"""
+    fake.load({table: rows for table, rows in data.items() if table != 'airlines'})
+    credentials = []
+    for i in range(1, users + 1):
+        email = f'pilot{i}@example.com'
+        user = fake.add_user(email, 'password')
+        fake.store.insert('airlines', {
+            'id': i, 'user_id': user['id'], 'name': f'Airline {i}',
+            'hub_airport_code': data['airports'][i % len(data['airports'])]['code'], 'balance': 1000000
+        })
+        credentials.append((email, 'password'))
+    return credentials
+
+
+def main(argv=None):
+    from src.benchmarks.synthetic import generate
+
+    parser = argparse.ArgumentParser(description='Run a fake Supabase server with synthetic data')
+    parser.add_argument('--port', type=int, default=54321)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--jitter-ms', type=float, default=5.0)
+    parser.add_argument('--airports', type=int, default=2000)
+    parser.add_argument('--aircraft', type=int, default=100)
+    parser.add_argument('--routes', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    fake = FakeSupabase(args.latency_ms, args.jitter_ms)
+    seed(fake, generate(airports=args.airports, aircraft=args.aircraft, routes=args.routes), args.users)
+    server = serve(fake, port=args.port)
+    print(f'SUPABASE_URL=http://127.0.0.1:{server.server_address[1]}')
+    print(f'Users pilot1..pilot{args.users}@example.com, password "password"')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
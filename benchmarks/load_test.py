@@ -0,0 +1,297 @@
+"""End-to-end load test of the API against the fake Supabase server.
+
+Starts the fake PostgREST/GoTrue server with synthetic data, serves the
+Flask app against it (or targets an already running app with ``--app-url``)
+and drives mixed traffic at a fixed request rate. Latency is measured from
+each request's scheduled start, so queueing behind a saturated server is
+counted rather than hidden.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from src.benchmarks.fake_supabase import FakeSupabase, seed, serve
+from src.benchmarks.synthetic import generate
+
+# Relative weight of each scenario in the traffic mix
+TRAFFIC_MIX = {
+    'login': 5,
+    'recommend_routes': 30,
+    'recommend_aircraft': 25,
+    'list_routes': 10,
+    'create_route': 12,
+    'update_route': 10,
+    'delete_route': 8
+}
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of sorted ``samples``"""
+    if not samples:
+        return None
+    index = min(len(samples) - 1, max(0, int(round(q / 100 * len(samples))) - 1))
+    return samples[index]
+
+
+class VirtualUser:
+    """Logged-in client with its own session cookie and created routes"""
+
+    def __init__(self, base_url, email, password):
+        self.email = email
+        self.password = password
+        self.client = httpx.Client(base_url=base_url, timeout=30)
+        self.route_ids = []
+        self.lock = threading.Lock()
+        self.hub = None
+
+    def login(self):
+        response = self.client.post('/api/auth/login', json={'email': self.email, 'password': self.password})
+        response.raise_for_status()
+        self.hub = response.json()['airline']['hub_airport_code']
+        return response
+
+
+class Traffic:
+    """Issues one request per scenario and names the endpoint it hit"""
+
+    def __init__(self, base_url, users, data, rng):
+        self.base_url = base_url
+        self.users = users
+        self.airports = [a['code'] for a in data['airports']]
+        self.aircraft_ids = [a['id'] for a in data['aircraft']]
+        self.route_ids = [r['id'] for r in data['routes']]
+        self.rng = rng
+        self.scenarios = list(TRAFFIC_MIX)
+        self.weights = [TRAFFIC_MIX[name] for name in self.scenarios]
+
+    def pick(self):
+        scenario = self.rng.choices(self.scenarios, self.weights)[0]
+        return scenario, self.rng.choice(self.users)
+
+    @staticmethod
+    def send(endpoint, request):
+        """Make the request; a transport error counts as a failure of ``endpoint``"""
+        try:
+            return endpoint, request()
+        except httpx.HTTPError:
+            return endpoint, None
+
+    def run(self, scenario, user):
+        rng = self.rng
+        if scenario == 'login':
+            client = httpx.Client(base_url=self.base_url, timeout=30)
+            try:
+                return self.send('POST /api/auth/login', lambda: client.post(
+                    '/api/auth/login', json={'email': user.email, 'password': user.password}
+                ))
+            finally:
+                client.close()
+        if scenario == 'recommend_routes':
+            return self.send('GET /api/routes/recommend', lambda: user.client.get('/api/routes/recommend', params={
+                'hub': user.hub or rng.choice(self.airports),
+                'aircraft': rng.choice(self.aircraft_ids)
+            }))
+        if scenario == 'recommend_aircraft':
+            return self.send('GET /api/aircraft/recommend', lambda: user.client.get(
+                '/api/aircraft/recommend', params={'route_id': rng.choice(self.route_ids)}
+            ))
+        if scenario == 'list_routes':
+            return self.send('GET /api/routes/', lambda: user.client.get('/api/routes/'))
+
+        with user.lock:
+            owned = list(user.route_ids)
+        if scenario == 'create_route' or not owned:
+            origin, destination = rng.sample(self.airports, 2)
+            endpoint, response = self.send('POST /api/routes/', lambda: user.client.post('/api/routes/', json={
+                'origin_airport_code': origin,
+                'destination_airport_code': destination,
+                'demand_economy': rng.randint(50, 300)
+            }))
+            if response is not None and response.status_code == 201:
+                with user.lock:
+                    user.route_ids.append(response.json()['route']['id'])
+            return endpoint, response
+        if scenario == 'update_route':
+            return self.send('PUT /api/routes/<id>', lambda: user.client.put(
+                f'/api/routes/{rng.choice(owned)}', json={'demand_economy': rng.randint(50, 300)}
+            ))
+        with user.lock:
+            if not user.route_ids:
+                return 'DELETE /api/routes/<id>', None
+            route_id = user.route_ids.pop(rng.randrange(len(user.route_ids)))
+        return self.send('DELETE /api/routes/<id>', lambda: user.client.delete(f'/api/routes/{route_id}'))
+
+
+def start_app(supabase_url):
+    """Serve the Flask app on a free local port in a background thread"""
+    os.environ['SUPABASE_URL'] = supabase_url
+    os.environ.setdefault('DISTANCE_MATRIX_DIR', tempfile.mkdtemp(prefix='airline-load-'))
+    from werkzeug.serving import make_server
+    from src.main import app, supabase
+    from src.airline_context import airline_cache
+    from src.reference_data import reference_data
+    from src.result_cache import result_cache
+
+    # The app may have been imported already; point its client at the fake
+    supabase.reset(url=supabase_url)
+    reference_data.invalidate()
+    airline_cache.clear()
+    result_cache.clear()
+    # Keep per-request access and timing lines out of the report
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    logging.getLogger('airline_manager.request').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True, name='load-test-app').start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def summarize(samples, elapsed):
+    """Throughput and latency percentiles per endpoint"""
+    endpoints = {}
+    for endpoint in sorted({s[0] for s in samples}):
+        latencies = sorted(s[2] for s in samples if s[0] == endpoint)
+        errors = sum(1 for s in samples if s[0] == endpoint and not (s[1] and s[1] < 400))
+        endpoints[endpoint] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'throughput_rps': round(len(latencies) / elapsed, 2),
+            'mean_ms': round(statistics.fmean(latencies), 2),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(latencies[-1], 2)
+        }
+    latencies = sorted(s[2] for s in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(e['errors'] for e in endpoints.values()),
+        'elapsed_s': round(elapsed, 2),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0,
+        'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+        'endpoints': endpoints
+    }
+
+
+def run(rps=50, duration=30, concurrency=64, latency_ms=20.0, jitter_ms=5.0, users=20,
+        airports=2000, aircraft=100, routes=5000, seed_value=0, app_url=None):
+    """Run one load test and return the results document"""
+    rng = random.Random(seed_value)
+    data = generate(airports=airports, aircraft=aircraft, routes=routes, seed=seed_value)
+    fake = FakeSupabase(latency_ms, jitter_ms, seed=seed_value)
+    credentials = seed(fake, data, users)
+    fake_server = serve(fake)
+    supabase_url = f'http://127.0.0.1:{fake_server.server_address[1]}'
+
+    app_server = None
+    if app_url is None:
+        app_server, app_url = start_app(supabase_url)
+
+    try:
+        virtual_users = [VirtualUser(app_url, email, password) for email, password in credentials]
+        for user in virtual_users:
+            user.login()
+        traffic = Traffic(app_url, virtual_users, data, rng)
+
+        # Warm the reference cache so the first measured requests do not pay for it
+        virtual_users[0].client.get('/api/routes/recommend', params={'hub': virtual_users[0].hub})
+        warm_calls = fake.stats()['total_calls']
+
+        samples = []
+        samples_lock = threading.Lock()
+
+        def issue(scheduled, scenario, user):
+            endpoint, response = traffic.run(scenario, user)
+            status = response.status_code if response is not None else None
+            latency = (time.perf_counter() - scheduled) * 1000
+            with samples_lock:
+                samples.append((endpoint, status, latency))
+
+        total = int(rps * duration)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='load') as executor:
+            for i in range(total):
+                scheduled = started + i / rps
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                scenario, user = traffic.pick()
+                executor.submit(issue, scheduled, scenario, user)
+        elapsed = time.perf_counter() - started
+
+        upstream = fake.stats()
+        measured_calls = upstream['total_calls'] - warm_calls
+        results = summarize(samples, elapsed)
+        results.update({
+            'target_rps': rps,
+            'concurrency': concurrency,
+            'upstream_latency_ms': latency_ms,
+            'upstream_jitter_ms': jitter_ms,
+            'upstream_calls': measured_calls,
+            'upstream_calls_per_request': round(measured_calls / len(samples), 2) if samples else None,
+            'upstream_calls_by_table': upstream['calls'],
+            'dataset': {'airports': airports, 'aircraft': aircraft, 'routes': routes, 'users': users}
+        })
+        return results
+    finally:
+        if app_server:
+            app_server.shutdown()
+        fake_server.shutdown()
+
+
+def report(results):
+    lines = [
+        f'{results["requests"]} requests in {results["elapsed_s"]}s '
+        f'({results["throughput_rps"]} req/s, {results["errors"]} errors, '
+        f'{results["upstream_calls_per_request"]} upstream calls per request)',
+        f'{"endpoint":32s} {"count":>6s} {"err":>4s} {"p50":>9s} {"p95":>9s} {"p99":>9s}'
+    ]
+    for endpoint, stats in results['endpoints'].items():
+        lines.append(
+            f'{endpoint:32s} {stats["requests"]:6d} {stats["errors"]:4d} '
+            f'{stats["p50_ms"]:9.1f} {stats["p95_ms"]:9.1f} {stats["p99_ms"]:9.1f}'
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the API against a fake Supabase')
+    parser.add_argument('--rps', type=float, default=50)
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of traffic')
+    parser.add_argument('--concurrency', type=int, default=64, help='Maximum requests in flight')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='Added to every upstream call')
+    parser.add_argument('--jitter-ms', type=float, default=5.0)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--airports', type=int, default=2000)
+    parser.add_argument('--aircraft', type=int, default=100)
+    parser.add_argument('--routes', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--app-url', help='Drive an already running app instead of starting one')
+    parser.add_argument('--output', default='load-test-results.json')
+    args = parser.parse_args(argv)
+
+    results = run(
+        rps=args.rps, duration=args.duration, concurrency=args.concurrency,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, users=args.users,
+        airports=args.airports, aircraft=args.aircraft, routes=args.routes,
+        seed_value=args.seed, app_url=args.app_url
+    )
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(report(results))
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
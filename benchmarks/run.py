@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from src.benchmarks.synthetic import AIRCRAFT_COUNT, AIRPORT_COUNT, ROUTE_COUNT, generate
+from src.geodesy import AirportCoordinates
+from src.profitability import AircraftColumns, RouteColumns, profit_matrix
+from src.reference_data import reference_data
+from src.runway_feasibility import RunwayFeasibility
+from src.repositories import Repositories, set_repositories
+from src.repositories.stores import MemoryStore
+
+# Routes scored per recommend_aircraft batch and per profit-matrix call
+BATCH_ROUTES = 200
+MATRIX_ROUTES = 10000
+
+# Endpoint kernels skip the result cache; the *.cached kernels measure hits
+RECOMPUTE = {'Cache-Control': 'no-cache'}
+
+
+def load_dataset(data):
+    """Serve ``data`` from an in-memory store and warm the reference cache.
+
+    Returns the repositories it replaced.
+    """
+    store = MemoryStore()
+    for table, rows in data.items():
+        for row in rows:
+            store.insert(table, row)
+    previous = set_repositories(Repositories(store))
+    reference_data.invalidate()
+    reference_data.airports()
+    return previous
+
+
+def timed(fn, repeat, warmup):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'repeat': repeat,
+        'min_ms': round(samples[0], 4),
+        'median_ms': round(statistics.median(samples), 4),
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        'max_ms': round(samples[-1], 4)
+    }
+
+
+def build_kernels(data, client, json_provider):
+    """Name -> zero-argument callable for every benchmarked kernel"""
+    from src.routes.aircraft import rank_aircraft_for_routes
+    from src.routes.routes import score_candidates, top_indexes, RECOMMEND_SORT_KEYS
+
+    airports = reference_data.airports()
+    aircraft_list = reference_data.aircraft_list()
+    coordinates = reference_data.airport_coordinates()
+    matrix = reference_data.distance_matrix()
+
+    hub = max(airports, key=lambda a: a['hub_size'])
+    hub_index = coordinates.index[hub['code']]
+    aircraft = max(aircraft_list, key=lambda a: a['range_km'])
+    routes = data['routes']
+    batch = routes[:BATCH_ROUTES]
+
+    def recommend_routes_score():
+        columns = score_candidates(
+            hub_index, hub, aircraft, airports, matrix.row(hub_index), np.arange(len(airports))
+        )
+        ranking = RECOMMEND_SORT_KEYS['profit'](columns)
+        return top_indexes(ranking, 20)
+
+    # Result lists serialized by the JSON kernels
+    recommended = client.get(
+        f'/api/routes/recommend?hub={hub["code"]}&aircraft={aircraft["id"]}&limit=200'
+    ).get_json()['recommended_routes']
+    ranked = rank_aircraft_for_routes(batch)
+
+    aircraft_columns = AircraftColumns(aircraft_list)
+    route_columns = RouteColumns.from_routes(routes[:MATRIX_ROUTES])
+
+    return {
+        'haversine.hub_to_all': lambda: coordinates.distances_from(hub_index),
+        'haversine.rebuild_coordinates': lambda: AirportCoordinates.from_airports(airports),
+        'recommend_routes.score': recommend_routes_score,
+        'recommend_routes.endpoint': lambda: client.get(
+            f'/api/routes/recommend?hub={hub["code"]}&aircraft={aircraft["id"]}', headers=RECOMPUTE
+        ),
+        'recommend_routes.cached': lambda: client.get(
+            f'/api/routes/recommend?hub={hub["code"]}&aircraft={aircraft["id"]}'
+        ),
+        'recommend_aircraft.rank_batch': lambda: rank_aircraft_for_routes(batch),
+        'runway_feasibility.build': lambda: RunwayFeasibility.from_catalogs(airports, aircraft_columns),
+        'operable_airports.from_hub': lambda: client.get(
+            f'/api/aircraft/{aircraft["id"]}/airports?origin={hub["code"]}&limit=1000'
+        ),
+        'recommend_aircraft.profit_matrix': lambda: profit_matrix(aircraft_columns, route_columns),
+        'recommend_aircraft.endpoint': lambda: client.get(
+            f'/api/aircraft/recommend?route_id={batch[0]["id"]}', headers=RECOMPUTE
+        ),
+        'recommend_aircraft.cached': lambda: client.get(
+            f'/api/aircraft/recommend?route_id={batch[0]["id"]}'
+        ),
+        'json.recommended_routes': lambda: json_provider.dumps({'recommended_routes': recommended}),
+        'json.ranked_aircraft': lambda: json_provider.dumps({'recommendations': ranked}),
+        'json.aircraft_list': lambda: json_provider.dumps({'aircraft': aircraft_list}),
+        'json.routes': lambda: json_provider.dumps({'routes': routes}),
+        'filter_aircraft.manufacturer_range': lambda: client.get(
+            '/api/aircraft/filter?manufacturer=Boeing&min_range=5000&max_range=12000&type=pax'
+        ),
+        'filter_aircraft.category': lambda: client.get('/api/aircraft/filter?category=widebody'),
+        'filter_aircraft.unfiltered': lambda: client.get('/api/aircraft/filter'),
+        'aircraft_index.select': lambda: reference_data.aircraft_index().select(
+            manufacturer='Boeing', min_range=5000, max_range=12000, aircraft_type='pax'
+        )
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(airports=AIRPORT_COUNT, aircraft=AIRCRAFT_COUNT, routes=ROUTE_COUNT,
+        seed=0, repeat=20, warmup=2, only=None):
+    """Generate the dataset, time every kernel and return the results document"""
+    from src.main import app
+
+    setup = {}
+    started = time.perf_counter()
+    data = generate(airports=airports, aircraft=aircraft, routes=routes, seed=seed)
+    setup['generate_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    # Keep the benchmark's distance matrix away from the one the server uses
+    matrix_dir = tempfile.mkdtemp(prefix='airline-bench-')
+    server_matrix_dir = reference_data.matrix_dir
+    reference_data.matrix_dir = matrix_dir
+    started = time.perf_counter()
+    previous = load_dataset(data)
+    try:
+        setup['load_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+        started = time.perf_counter()
+        reference_data.distance_matrix()
+        setup['distance_matrix_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        setup['reference_data_bytes'] = reference_data.stats()['bytes']
+
+        kernels = build_kernels(data, app.test_client(), app.json)
+        results = {}
+        for name, fn in kernels.items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            results[name] = timed(fn, repeat, warmup)
+    finally:
+        set_repositories(previous)
+        reference_data.matrix_dir = server_matrix_dir
+        reference_data.invalidate()
+        shutil.rmtree(matrix_dir, ignore_errors=True)
+
+    return {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'dataset': {'airports': airports, 'aircraft': aircraft, 'routes': routes, 'seed': seed},
+        'setup': setup,
+        'kernels': results
+    }
+
+
+def compare(results, baseline):
+    """Median-time ratios against an earlier results document"""
+    lines = []
+    for name, current in results['kernels'].items():
+        before = baseline.get('kernels', {}).get(name)
+        if not before:
+            lines.append(f'{name:40s} {current["median_ms"]:10.3f} ms  (new)')
+            continue
+        ratio = current['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        lines.append(
+            f'{name:40s} {current["median_ms"]:10.3f} ms  was {before["median_ms"]:10.3f} ms  x{ratio:.2f}'
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the API compute kernels')
+    parser.add_argument('--airports', type=int, default=AIRPORT_COUNT)
+    parser.add_argument('--aircraft', type=int, default=AIRCRAFT_COUNT)
+    parser.add_argument('--routes', type=int, default=ROUTE_COUNT)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--only', action='append', help='Run kernels starting with this prefix')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='Earlier results file to compare against')
+    args = parser.parse_args(argv)
+
+    results = run(
+        airports=args.airports, aircraft=args.aircraft, routes=args.routes,
+        seed=args.seed, repeat=args.repeat, warmup=args.warmup, only=args.only
+    )
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(compare(results, baseline))
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
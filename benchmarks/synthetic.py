@@ -0,0 +1,132 @@
+import json
+
+import numpy as np
+
+from src.geodesy import pair_distances
+
+# Default world-scale sizes
+AIRPORT_COUNT = 10000
+AIRCRAFT_COUNT = 500
+ROUTE_COUNT = 100000
+
+CONTINENTS = ('Africa', 'Asia', 'Europe', 'North America', 'Oceania', 'South America')
+MANUFACTURERS = ('Airbus', 'Boeing', 'Embraer', 'Bombardier', 'ATR', 'COMAC', 'Tupolev')
+
+# category -> (range km, speed km/h, economy seats, required runway m)
+CATEGORIES = {
+    'regional': ((1500, 4000), (450, 800), (40, 100), (1200, 1800)),
+    'narrowbody': ((3000, 7000), (780, 870), (120, 240), (1800, 2600)),
+    'widebody': ((7000, 16000), (850, 950), (220, 450), (2500, 3500)),
+    'cargo': ((4000, 9000), (800, 900), (0, 0), (2400, 3300))
+}
+COMPETITION_LEVELS = ('low', 'medium', 'high')
+
+
+def airport_codes(count):
+    """Unique airport codes: three letters, then four once those run out"""
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    codes = []
+    for length in (3, 4):
+        for n in range(26 ** length):
+            code = ''
+            for _ in range(length):
+                n, r = divmod(n, 26)
+                code = letters[r] + code
+            codes.append(code)
+            if len(codes) == count:
+                return codes
+    raise ValueError(f'Cannot generate {count} airport codes')
+
+
+def generate_airports(count, rng):
+    # Latitudes uniform on the sphere, limited to inhabited bands
+    lat = np.degrees(np.arcsin(rng.uniform(np.sin(np.radians(-55)), np.sin(np.radians(70)), count)))
+    lon = rng.uniform(-180, 180, count)
+    runway = rng.integers(1200, 4600, count)
+    hub_size = rng.integers(1, 6, count)
+    continents = rng.integers(0, len(CONTINENTS), count)
+    return [
+        {
+            'code': code,
+            'name': f'{code} International',
+            'city': f'City {i}',
+            'country': f'Country {i % 200}',
+            'continent': CONTINENTS[continents[i]],
+            'runway_length': int(runway[i]),
+            'hub_size': int(hub_size[i]),
+            'latitude': round(float(lat[i]), 4),
+            'longitude': round(float(lon[i]), 4)
+        }
+        for i, code in enumerate(airport_codes(count))
+    ]
+
+
+def generate_aircraft(count, rng):
+    aircraft = []
+    categories = list(CATEGORIES)
+    for i in range(count):
+        category = categories[i % len(categories)]
+        (range_lo, range_hi), (speed_lo, speed_hi), (eco_lo, eco_hi), (runway_lo, runway_hi) = CATEGORIES[category]
+        eco = int(rng.integers(eco_lo, eco_hi + 1))
+        aircraft.append({
+            'id': i + 1,
+            'manufacturer': MANUFACTURERS[int(rng.integers(len(MANUFACTURERS)))],
+            'model': f'M{i + 1}',
+            'range_km': int(rng.integers(range_lo, range_hi + 1)),
+            'speed_kmh': int(rng.integers(speed_lo, speed_hi + 1)),
+            'fuel_consumption': round(float(rng.uniform(2, 12)), 2),
+            'capacity_eco': eco,
+            'capacity_business': eco // 8,
+            'capacity_first': eco // 30,
+            'price': round(float(rng.uniform(2e7, 4e8)), 0),
+            'maintenance_cost': round(float(rng.uniform(500, 6000)), 0),
+            'category': category,
+            'cargo_capacity': round(float(rng.uniform(20, 120)), 1) if category == 'cargo' else 0.0,
+            'required_runway_length': int(rng.integers(runway_lo, runway_hi + 1)),
+            'r_and_d_level': int(rng.integers(1, 6))
+        })
+    return aircraft
+
+
+def generate_routes(count, airports, rng, airlines=100):
+    lat = np.radians([a['latitude'] for a in airports])
+    lon = np.radians([a['longitude'] for a in airports])
+    origins = rng.integers(0, len(airports), count)
+    # Shift destinations so a route never returns to its origin
+    destinations = (origins + rng.integers(1, len(airports), count)) % len(airports)
+    distance = pair_distances(lat[origins], lon[origins], lat[destinations], lon[destinations])
+    eco = rng.integers(20, 400, count)
+    competition = rng.integers(0, len(COMPETITION_LEVELS), count)
+    airline_ids = rng.integers(1, airlines + 1, count)
+    return [
+        {
+            'id': i + 1,
+            'airline_id': int(airline_ids[i]),
+            'origin_airport_code': airports[origins[i]]['code'],
+            'destination_airport_code': airports[destinations[i]]['code'],
+            'distance_km': int(round(distance[i])),
+            'demand_economy': int(eco[i]),
+            'demand_business': int(eco[i] // 5),
+            'demand_first': int(eco[i] // 20),
+            'demand_cargo': int(eco[i] // 10),
+            'competition_level': COMPETITION_LEVELS[competition[i]]
+        }
+        for i in range(count)
+    ]
+
+
+def generate(airports=AIRPORT_COUNT, aircraft=AIRCRAFT_COUNT, routes=ROUTE_COUNT, seed=0):
+    """Deterministic synthetic dataset as ``{table: [rows]}``"""
+    rng = np.random.default_rng(seed)
+    airport_rows = generate_airports(airports, rng)
+    return {
+        'airports': airport_rows,
+        'aircraft': generate_aircraft(aircraft, rng),
+        'routes': generate_routes(routes, airport_rows, rng)
+    }
+
+
+def write_fixtures(path, **sizes):
+    """Write a dataset in the DATA_FIXTURES format"""
+    with open(path, 'w') as f:
+        json.dump(generate(**sizes), f)
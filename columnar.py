@@ -0,0 +1,361 @@
+import operator
+import sys
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+# Integer columns are stored in the narrowest of these that holds every value
+INTEGER_DTYPES = (np.int16, np.int32, np.int64)
+
+# Text columns with at most this share of distinct values are dictionary
+# encoded; the rest (codes, names) are packed into one buffer
+DICTIONARY_MAX_DISTINCT = 0.5
+
+
+class NumericColumn:
+    """Integers or floats in a NumPy array, with a mask marking nulls.
+
+    A float column that also holds integers (JSON has no separate type for
+    whole-number reals) remembers which rows were integers, so every value
+    reads back with its original type.
+    """
+
+    def __init__(self, values, kinds):
+        nulls = [v is None for v in values]
+        filled = [0 if v is None else v for v in values]
+        self.integers = None
+        if kinds == {int}:
+            dtype = np.int64
+            if filled:
+                low, high = min(filled), max(filled)
+                dtype = next(t for t in INTEGER_DTYPES if np.iinfo(t).min <= low and high <= np.iinfo(t).max)
+            self.values = np.array(filled, dtype=dtype)
+        else:
+            self.values = np.array(filled, dtype=np.float64)
+            if int in kinds:
+                self.integers = np.array([type(v) is int for v in values], dtype=bool)
+        self.nulls = np.array(nulls, dtype=bool) if any(nulls) else None
+
+    def get(self, i):
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        value = self.values[i].item()
+        if self.integers is not None and self.integers[i]:
+            return int(value)
+        return value
+
+    def array(self, null=np.nan):
+        """Values as float64, with ``null`` where the value is missing"""
+        values = self.values.astype(np.float64)
+        if self.nulls is not None:
+            values[self.nulls] = null
+        return values
+
+    def values_list(self):
+        values = self.values.tolist()
+        if self.integers is not None:
+            values = [int(v) if is_int else v for v, is_int in zip(values, self.integers.tolist())]
+        if self.nulls is not None:
+            for i in np.flatnonzero(self.nulls).tolist():
+                values[i] = None
+        return values
+
+    def equals(self, value):
+        mask = self.values == value
+        if self.nulls is not None:
+            mask &= ~self.nulls
+        return mask
+
+    def nbytes(self):
+        masks = (self.nulls, self.integers)
+        return self.values.nbytes + sum(mask.nbytes for mask in masks if mask is not None)
+
+
+class DictionaryColumn:
+    """Repetitive strings (countries, manufacturers) stored once each,
+    interned, with an int32 code per row (-1 for null)"""
+
+    def __init__(self, values):
+        self.strings = []
+        lookup = {}
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            if value is None:
+                codes[i] = -1
+                continue
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self.strings)
+                self.strings.append(sys.intern(value))
+            codes[i] = code
+        self.codes = codes
+        self._lookup = lookup
+
+    def get(self, i):
+        code = self.codes[i]
+        return None if code < 0 else self.strings[code]
+
+    def values_list(self):
+        return [self.strings[code] if code >= 0 else None for code in self.codes.tolist()]
+
+    def equals(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def nbytes(self):
+        return (
+            self.codes.nbytes + sys.getsizeof(self.strings) + sys.getsizeof(self._lookup)
+            + sum(sys.getsizeof(s) for s in self.strings)
+        )
+
+
+class PackedTextColumn:
+    """Mostly distinct strings (codes, names) as one UTF-8 buffer plus offsets.
+
+    A Python string costs about 50 bytes before its first character, so
+    packing is what keeps a world-scale airport table small; values are
+    decoded when read.
+    """
+
+    def __init__(self, values):
+        encoded = [b'' if v is None else v.encode() for v in values]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        self.offsets = offsets.astype(np.uint32) if offsets[-1] < 2 ** 32 else offsets
+        self.data = b''.join(encoded)
+        nulls = [v is None for v in values]
+        self.nulls = np.array(nulls, dtype=bool) if any(nulls) else None
+
+    def get(self, i):
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode()
+
+    def values_list(self):
+        offsets = self.offsets.tolist()
+        data = self.data
+        values = [data[offsets[i]:offsets[i + 1]].decode() for i in range(len(offsets) - 1)]
+        if self.nulls is not None:
+            for i in np.flatnonzero(self.nulls).tolist():
+                values[i] = None
+        return values
+
+    def equals(self, value):
+        mask = np.zeros(len(self.offsets) - 1, dtype=bool)
+        if not isinstance(value, str):
+            return mask
+        target = value.encode()
+        # Only rows of the right length need their bytes compared
+        candidates = np.flatnonzero(np.diff(self.offsets) == len(target))
+        for i, start in zip(candidates.tolist(), self.offsets[candidates].tolist()):
+            mask[i] = self.data[start:start + len(target)] == target
+        if self.nulls is not None:
+            mask &= ~self.nulls
+        return mask
+
+    def nbytes(self):
+        nulls = self.nulls.nbytes if self.nulls is not None else 0
+        return len(self.data) + self.offsets.nbytes + nulls
+
+
+class ObjectColumn:
+    """Values of any other type, kept as they are"""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def get(self, i):
+        return self.values[i]
+
+    def values_list(self):
+        return list(self.values)
+
+    def equals(self, value):
+        return np.array([v == value for v in self.values], dtype=bool)
+
+    def nbytes(self):
+        return sys.getsizeof(self.values) + sum(sys.getsizeof(v) for v in self.values)
+
+
+def _column_for(values):
+    kinds = {type(v) for v in values if v is not None}
+    if kinds and kinds <= {int, float}:
+        try:
+            return NumericColumn(values, kinds)
+        except (OverflowError, StopIteration):
+            # Integers beyond 64 bits
+            return ObjectColumn(values)
+    if kinds <= {str}:
+        if len(set(values)) <= max(1, len(values) * DICTIONARY_MAX_DISTINCT):
+            return DictionaryColumn(values)
+        return PackedTextColumn(values)
+    return ObjectColumn(values)
+
+
+class KeyIndex:
+    """Sorted copy of a unique key column, searched by bisection.
+
+    Text keys are held as fixed-width bytes, so an index over every airport
+    code takes a few bytes per row instead of a dict entry and a string.
+    Rows with a null key are left out and cannot be looked up. Keys must be
+    all strings or all integers.
+    """
+
+    def __init__(self, values):
+        rows = np.array([i for i, v in enumerate(values) if v is not None], dtype=np.int32)
+        values = [values[i] for i in rows.tolist()]
+        self.text = all(isinstance(v, str) for v in values)
+        if self.text:
+            keys = np.array([v.encode() for v in values], dtype=bytes)
+        elif all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            keys = np.array(values, dtype=np.int64)
+        else:
+            kinds = sorted({type(v).__name__ for v in values})
+            raise ValueError(f'Key column must hold only strings or only integers, not {", ".join(kinds)}')
+        order = np.argsort(keys, kind='stable')
+        self.order = rows[order]
+        self.keys = keys[order]
+
+    def find(self, key):
+        try:
+            probe = key.encode() if self.text else operator.index(key)
+        except (AttributeError, TypeError):
+            return None
+        j = int(np.searchsorted(self.keys, probe))
+        if j < len(self.keys) and self.keys[j] == probe:
+            return int(self.order[j])
+        return None
+
+    def nbytes(self):
+        return self.keys.nbytes + self.order.nbytes
+
+
+class RowView(Mapping):
+    """Read-only dict-like view of one row of a ``ColumnarTable``"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, name):
+        return self._table._columns[name].get(self._index)
+
+    def __contains__(self, name):
+        return name in self._table._columns
+
+    def __iter__(self):
+        return iter(self._table._columns)
+
+    def __len__(self):
+        return len(self._table._columns)
+
+    def __repr__(self):
+        return f'RowView({self.to_dict()!r})'
+
+    def to_dict(self):
+        i = self._index
+        return {name: column.get(i) for name, column in self._table._columns.items()}
+
+
+class ColumnarTable(Sequence):
+    """Rows of one table held column by column.
+
+    Numbers are NumPy arrays, repetitive strings are dictionary encoded and
+    the remaining strings are packed into a single buffer. Indexing returns
+    ``RowView`` objects, so code written for lists of dicts keeps working,
+    while filters can run on whole columns. Rows can be looked up by ``key``
+    when one is given.
+    """
+
+    def __init__(self, rows, key=None):
+        rows = list(rows)
+        names = {}
+        for row in rows:
+            for name in row:
+                names.setdefault(name, None)
+        self._columns = {name: _column_for([row.get(name) for row in rows]) for name in names}
+        self._length = len(rows)
+        self.key = key
+        self._index = None
+        if key is not None and key in self._columns:
+            self._index = KeyIndex(self._columns[key].values_list())
+
+    @property
+    def names(self):
+        return tuple(self._columns)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [RowView(self, j) for j in range(*i.indices(self._length))]
+        i = operator.index(i)
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError('row index out of range')
+        return RowView(self, i)
+
+    def position(self, key):
+        """Row index for ``key``, or None"""
+        return self._index.find(key) if self._index is not None else None
+
+    def positions(self, keys):
+        """Row indexes for many keys as an array, with -1 for unknown keys"""
+        found = (self.position(key) for key in keys)
+        return np.fromiter((-1 if i is None else i for i in found), dtype=np.intp)
+
+    def get(self, key):
+        """Row whose key column equals ``key``, or None"""
+        i = self.position(key)
+        return None if i is None else RowView(self, i)
+
+    def column(self, name, null=np.nan):
+        """Numeric column as a float64 array, with ``null`` for missing values"""
+        column = self._columns.get(name)
+        if column is None:
+            return np.full(self._length, null, dtype=np.float64)
+        if isinstance(column, NumericColumn):
+            return column.array(null)
+        return np.array([null if v is None else v for v in column.values_list()], dtype=np.float64)
+
+    def values(self, name):
+        """Column as a list of Python values"""
+        column = self._columns.get(name)
+        return column.values_list() if column is not None else [None] * self._length
+
+    def equals(self, name, value):
+        """Boolean mask of rows whose ``name`` equals ``value``"""
+        column = self._columns.get(name)
+        if column is None:
+            return np.zeros(self._length, dtype=bool)
+        return column.equals(value)
+
+    def between(self, name, low=None, high=None):
+        """Boolean mask of rows with ``low <= name <= high``; nulls never match"""
+        values = self.column(name)
+        mask = ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def take(self, indexes):
+        """Row views for an array of row indexes"""
+        return [RowView(self, i) for i in np.asarray(indexes, dtype=np.intp).tolist()]
+
+    def to_dicts(self):
+        columns = [(name, column.values_list()) for name, column in self._columns.items()]
+        return [{name: values[i] for name, values in columns} for i in range(self._length)]
+
+    def nbytes(self):
+        """Approximate memory held by the columns and the key index"""
+        index = self._index.nbytes() if self._index is not None else 0
+        return sum(column.nbytes() for column in self._columns.values()) + index
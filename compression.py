@@ -0,0 +1,62 @@
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip is always available
+    brotli = None
+
+# Bodies smaller than this are sent as is; compressing them costs more than it saves
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+
+# Levels favour CPU over ratio; JSON compresses well even at low levels
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '4'))
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/csv')
+
+
+def choose_encoding(accept_encodings):
+    """Best encoding the client accepts: brotli, then gzip, else None"""
+    available = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best = accept_encodings.best_match(available)
+    return best if best and accept_encodings[best] > 0 else None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def init_compression(app):
+    """Compress large responses with brotli or gzip, as negotiated"""
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        # The encoded bytes differ from the identity body, so only a weak tag still holds
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
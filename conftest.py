@@ -0,0 +1,86 @@
+import pytest
+import src.repositories
+from src.main import app
+from src.airline_context import airline_cache
+from src.benchmarks.synthetic import generate
+from src.reference_data import reference_data
+from src.repositories import Repositories
+from src.repositories.stores import MemoryStore
+from src.result_cache import MemoryTier, result_cache
+
+class CountingStore(MemoryStore):
+    """Memory store that records every statement it runs, standing in for Supabase round trips"""
+
+    def __init__(self):
+        super().__init__()
+        self.statements = []
+
+    def count(self, kind, table=None):
+        return sum(1 for k, t in self.statements if k == kind and table in (None, t))
+
+    def route_statements(self):
+        return [kind for kind, table in self.statements if table == 'routes']
+
+    def select(self, table, *args, **kwargs):
+        self.statements.append(('select', table))
+        return super().select(table, *args, **kwargs)
+
+    def update(self, table, values, where):
+        self.statements.append(('update', table))
+        return super().update(table, values, where)
+
+    def delete(self, table, where):
+        self.statements.append(('delete', table))
+        return super().delete(table, where)
+
+@pytest.fixture
+def counting_store():
+    return CountingStore()
+
+@pytest.fixture
+def use_store(monkeypatch):
+    """Serve the app from a given store, with empty reference, airline and result caches"""
+    def use(store):
+        monkeypatch.setattr(src.repositories, '_repositories', Repositories(store))
+        monkeypatch.setattr(result_cache, 'tiers', [MemoryTier()])
+        reference_data.invalidate()
+        airline_cache.clear()
+        return store
+
+    yield use
+    reference_data.invalidate()
+    airline_cache.clear()
+
+@pytest.fixture
+def seeded_client(use_store):
+    """Build a test client over a synthetic world from ``generate()``.
+
+    Only ``tables`` are loaded when given, ``route_airline`` maps a route id
+    to its owning airline and ``user`` logs the client in. The client carries
+    the generated ``data``, its ``store`` and a ``hub`` airport code.
+    """
+    def build(airports, aircraft, routes, seed, store=None, tables=None, route_airline=None,
+              airlines=(), user=None):
+        data = generate(airports=airports, aircraft=aircraft, routes=routes, seed=seed)
+        store = store if store is not None else MemoryStore()
+        for table, rows in data.items():
+            if tables is not None and table not in tables:
+                continue
+            for row in rows:
+                if table == 'routes' and route_airline is not None:
+                    row = dict(row, airline_id=route_airline(row['id']))
+                store.insert(table, row)
+        for airline in airlines:
+            store.insert('airlines', airline)
+        use_store(store)
+
+        client = app.test_client()
+        if user is not None:
+            with client.session_transaction() as session:
+                session['user'] = {'id': user}
+        client.data = data
+        client.store = store
+        client.hub = data['airports'][0]['code']
+        return client
+
+    return build
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from src.geodesy import EARTH_RADIUS_KM
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Directory shared by all workers on a host; matrices are memory-mapped from here
+DISTANCE_MATRIX_DIR = os.getenv(
+    'DISTANCE_MATRIX_DIR',
+    os.path.join(tempfile.gettempdir(), 'airline-manager')
+)
+
+# Number of matrix versions to keep on disk
+DISTANCE_MATRIX_KEEP = int(os.getenv('DISTANCE_MATRIX_KEEP', '2'))
+
+# Rows computed per NumPy block while building
+BUILD_CHUNK_ROWS = 256
+
+
+def coordinates_version(coordinates):
+    """Stable hash of airport codes and coordinates"""
+    digest = hashlib.sha1()
+    digest.update('\n'.join(coordinates.codes).encode('utf-8'))
+    digest.update(np.ascontiguousarray(coordinates.lat).tobytes())
+    digest.update(np.ascontiguousarray(coordinates.lon).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class DistanceMatrix:
+    """Float32 all-pairs great-circle distances, indexed like the airports list"""
+
+    def __init__(self, version, codes, matrix):
+        self.version = version
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.matrix = matrix
+
+    def __len__(self):
+        return len(self.codes)
+
+    def row(self, i):
+        """Distances in km from airport ``i`` to every airport (a view)"""
+        return self.matrix[i]
+
+    def distance(self, origin_code, destination_code):
+        """Distance in km between two airport codes"""
+        return float(self.matrix[self.index[origin_code], self.index[destination_code]])
+
+
+def _fill_rows(matrix, coordinates, rows):
+    """Compute full rows of ``matrix`` for the given airport indexes"""
+    for start in range(0, len(rows), BUILD_CHUNK_ROWS):
+        block = rows[start:start + BUILD_CHUNK_ROWS]
+        lat = coordinates.lat[block][:, None]
+        lon = coordinates.lon[block][:, None]
+        cos_lat = coordinates.cos_lat[block][:, None]
+        a = (np.sin((coordinates.lat - lat) / 2) ** 2
+             + cos_lat * coordinates.cos_lat * np.sin((coordinates.lon - lon) / 2) ** 2)
+        matrix[block] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _find_previous(directory, coordinates):
+    """Newest stored matrix whose airports all still exist with the same coordinates"""
+    current = {
+        code: (coordinates.lat[i], coordinates.lon[i])
+        for i, code in enumerate(coordinates.codes)
+    }
+    candidates = []
+    for name in os.listdir(directory):
+        if not (name.startswith('distances-') and name.endswith('.json')):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        codes = manifest.get('codes', [])
+        if not codes or not os.path.exists(path[:-5] + '.npy'):
+            continue
+        unchanged = all(
+            current.get(code) == (lat, lon)
+            for code, lat, lon in zip(codes, manifest['lat'], manifest['lon'])
+        )
+        if unchanged:
+            candidates.append((os.path.getmtime(path), path[:-5], codes))
+    if not candidates:
+        return None
+    return max(candidates)
+
+
+def _build(coordinates, path):
+    """Write the matrix for ``coordinates`` to ``path``, reusing an older one if possible"""
+    directory = os.path.dirname(path)
+    n = len(coordinates)
+    tmp_path = f'{path}.npy.{os.getpid()}.tmp'
+    matrix = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(n, n))
+
+    previous = _find_previous(directory, coordinates)
+    if previous:
+        # Incremental rebuild: copy known pairs, compute rows for new airports only
+        _, previous_path, previous_codes = previous
+        old = np.load(previous_path + '.npy', mmap_mode='r')
+        new_idx = np.array([coordinates.index[code] for code in previous_codes], dtype=np.intp)
+        for o, i in enumerate(new_idx):
+            matrix[i, new_idx] = old[o]
+        added = np.setdiff1d(np.arange(n), new_idx)
+        _fill_rows(matrix, coordinates, added)
+        matrix[:, added] = matrix[added].T
+    else:
+        _fill_rows(matrix, coordinates, np.arange(n))
+
+    matrix.flush()
+    del matrix
+
+    # Manifest first, then the matrix: a visible .npy always has its manifest
+    manifest_tmp = f'{path}.json.{os.getpid()}.tmp'
+    with open(manifest_tmp, 'w') as f:
+        json.dump({
+            'codes': coordinates.codes,
+            'lat': coordinates.lat.tolist(),
+            'lon': coordinates.lon.tolist()
+        }, f)
+    os.replace(manifest_tmp, path + '.json')
+    os.replace(tmp_path, path + '.npy')
+
+
+def _prune(directory, keep):
+    stored = sorted(
+        (os.path.getmtime(os.path.join(directory, name)), name[:-4])
+        for name in os.listdir(directory)
+        if name.startswith('distances-') and name.endswith('.npy')
+    )
+    for _, stem in stored[:-keep]:
+        for suffix in ('.npy', '.json'):
+            try:
+                os.remove(os.path.join(directory, stem + suffix))
+            except OSError:
+                pass
+
+
+def load_or_build(coordinates, directory=DISTANCE_MATRIX_DIR):
+    """Memory-map the matrix for ``coordinates``, building it on first use.
+
+    Workers on the same host share the file; a lock file ensures only one of
+    them builds a given version. Falls back to an in-memory matrix when the
+    directory is not writable.
+    """
+    version = coordinates_version(coordinates)
+    path = os.path.join(directory, f'distances-{version}')
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(path + '.npy'):
+            with open(path + '.lock', 'w') as lock:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                if not os.path.exists(path + '.npy'):
+                    _build(coordinates, path)
+                    _prune(directory, DISTANCE_MATRIX_KEEP)
+            try:
+                os.remove(path + '.lock')
+            except OSError:
+                pass
+        matrix = np.load(path + '.npy', mmap_mode='r')
+    except OSError:
+        matrix = np.empty((len(coordinates), len(coordinates)), dtype=np.float32)
+        _fill_rows(matrix, coordinates, np.arange(len(coordinates)))
+
+    return DistanceMatrix(version, coordinates.codes, matrix)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.columnar import ColumnarTable
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def pair_distances(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between arrays of points given in radians.
+
+    Inputs broadcast against each other, so any of them may be a scalar.
+    """
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between two points given in degrees"""
+    return float(pair_distances(
+        np.radians(lat1), np.radians(lon1),
+        np.radians(lat2), np.radians(lon2)
+    ))
+
+
+class AirportCoordinates:
+    """Radian coordinate arrays for a list of airports, aligned by position"""
+
+    def __init__(self, codes, latitudes, longitudes):
+        self.codes = list(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+        self.lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+        self.cos_lat = np.cos(self.lat)
+
+    @classmethod
+    def from_airports(cls, airports):
+        if isinstance(airports, ColumnarTable):
+            return cls(airports.values('code'), airports.column('latitude'), airports.column('longitude'))
+        return cls(
+            [a['code'] for a in airports],
+            [a['latitude'] for a in airports],
+            [a['longitude'] for a in airports]
+        )
+
+    def __len__(self):
+        return len(self.codes)
+
+    def distances_from(self, i):
+        """Distances in km from airport ``i`` to every airport"""
+        dlat = self.lat - self.lat[i]
+        dlon = self.lon - self.lon[i]
+        a = np.sin(dlat / 2) ** 2 + self.cos_lat[i] * self.cos_lat * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def distances_between(self, origins, destinations):
+        """Distances in km for index arrays of origin/destination pairs"""
+        origins = np.asarray(origins, dtype=np.intp)
+        destinations = np.asarray(destinations, dtype=np.intp)
+        return pair_distances(
+            self.lat[origins], self.lon[origins],
+            self.lat[destinations], self.lon[destinations]
+        )
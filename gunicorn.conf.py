@@ -0,0 +1,31 @@
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+
+# Handler threads per worker. The default of 1 keeps sync workers; more
+# switches to gthread workers that overlap requests waiting on Supabase
+threads = int(os.getenv('WEB_THREADS', '1'))
+worker_class = 'gthread' if threads > 1 else 'sync'
+wsgi_app = 'src.main:app'
+
+# Workers write Prometheus metrics to files here so /metrics sums all of them
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), 'airline-manager-metrics')
+)
+
+
+def on_starting(server):
+    # Metric files from a previous run would be counted again
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of a worker that exited
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
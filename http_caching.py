@@ -0,0 +1,52 @@
+import hashlib
+import json
+import os
+
+from flask import jsonify, make_response, request
+
+from src.columnar import ColumnarTable, RowView
+
+# Browser cache lifetime for the aircraft catalog (seconds); after it expires
+# the browser revalidates with If-None-Match and usually gets a 304
+CATALOG_MAX_AGE = int(os.getenv('CATALOG_MAX_AGE', '300'))
+
+# Cache-Control policies per kind of resource
+CATALOG_CACHE_CONTROL = f'public, max-age={CATALOG_MAX_AGE}'
+PRIVATE_CACHE_CONTROL = 'private, no-cache'
+
+
+def content_tag(*parts):
+    """Strong entity tag for JSON-serializable parts; equal content gives equal
+    tags in every worker"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=_plain).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def _plain(value):
+    if isinstance(value, RowView):
+        return value.to_dict()
+    if isinstance(value, ColumnarTable):
+        return value.to_dicts()
+    return str(value)
+
+
+def not_modified(tag, cache_control):
+    """304 response if the client already holds ``tag``, otherwise None"""
+    # If-None-Match uses weak comparison, so compressed (weak) tags match too
+    if not request.if_none_match.contains_weak(tag):
+        return None
+    response = make_response('', 304)
+    response.set_etag(tag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def tagged_json(body, tag, cache_control):
+    """JSON 200 response carrying ``tag`` as its ETag"""
+    response = jsonify(body)
+    response.set_etag(tag)
+    response.headers['Cache-Control'] = cache_control
+    return response
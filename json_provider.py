@@ -0,0 +1,84 @@
+import os
+import time
+
+from flask.json.provider import DefaultJSONProvider
+
+from src.columnar import ColumnarTable, RowView
+from src.request_timing import add_serialization_time
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# "orjson" (default when installed) or "stdlib"
+JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson' if orjson else 'stdlib')
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's default provider, with serialization time charged to the request"""
+
+    @staticmethod
+    def default(o):
+        # Rows of the columnar reference catalogs encode as plain objects
+        if isinstance(o, RowView):
+            return o.to_dict()
+        if isinstance(o, ColumnarTable):
+            return o.to_dicts()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            add_serialization_time(time.perf_counter() - started)
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """JSON provider backed by orjson.
+
+    Output matches the default provider: keys are sorted when ``sort_keys``
+    is set, dates go through ``default()`` and NumPy values are accepted.
+    Anything orjson rejects (e.g. integers over 64 bits) falls back to the
+    stdlib encoder.
+    """
+
+    def _encode(self, obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        started = time.perf_counter()
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return None
+        finally:
+            add_serialization_time(time.perf_counter() - started)
+
+    def dumps(self, obj, **kwargs):
+        encoded = None if kwargs else self._encode(obj)
+        if encoded is None:
+            return super().dumps(obj, **kwargs)
+        return encoded.decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        encoded = self._encode(obj, indent=indent)
+        if encoded is None:
+            return super().response(obj)
+        return self._app.response_class(encoded + b'\n', mimetype=self.mimetype)
+
+
+def create_json_provider(app):
+    if JSON_PROVIDER == 'orjson' and orjson is not None:
+        return OrjsonProvider(app)
+    return StdlibJSONProvider(app)
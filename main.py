@@ -3,7 +3,11 @@ import sys
 from flask import Flask, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from src.supabase_client import ManagedSupabase
+from src.request_timing import init_request_timing
+from src.metrics import init_metrics
+from src.json_provider import create_json_provider
+from src.compression import init_compression
 
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -30,23 +34,37 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = SECRET_KEY
 app.config['JSON_SORT_KEYS'] = False
 
+# orjson-backed JSON provider when available, stdlib json otherwise
+app.json = create_json_provider(app)
+
 # Enable CORS for all routes
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Initialize Supabase client (created lazily in each worker process)
+supabase = ManagedSupabase(SUPABASE_URL, SUPABASE_KEY)
 
 # Import routes
 from src.routes.auth import auth_bp
 from src.routes.aircraft import aircraft_bp
 from src.routes.routes import routes_bp
 from src.routes.config import config_bp
+from src.routes.airports import airports_bp
 
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(aircraft_bp, url_prefix='/api/aircraft')
 app.register_blueprint(routes_bp, url_prefix='/api/routes')
 app.register_blueprint(config_bp, url_prefix='/api/config')
+app.register_blueprint(airports_bp, url_prefix='/api/airports')
+
+# Server-Timing header and structured log line for every request
+init_request_timing(app)
+
+# Prometheus metrics at /metrics, summed across gunicorn workers
+init_metrics(app)
+
+# Registered last so it runs first and the timing above includes it
+init_compression(app)
 
 # Root route
 @app.route('/')
@@ -58,6 +76,14 @@ def index():
         'supabase_url': SUPABASE_URL
     })
 
+# Health check with per-worker connection pool usage
+@app.route('/health')
+def health():
+    return jsonify({
+        'status': 'ok',
+        'supabase_pool': supabase.pool_stats()
+    })
+
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
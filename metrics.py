@@ -0,0 +1,121 @@
+import os
+import time
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+# Set by gunicorn.conf.py when several workers run; metric values are then
+# written to files in this directory and summed across workers on scrape
+PROMETHEUS_MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+
+# Latency buckets in seconds, from cache hits up to slow recommendation calls
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+UPSTREAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests served',
+    ['blueprint', 'endpoint', 'method', 'status']
+)
+REQUEST_ERRORS = Counter(
+    'http_request_errors_total', 'HTTP requests answered with a 5xx status',
+    ['blueprint', 'endpoint']
+)
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency',
+    ['blueprint', 'endpoint'], buckets=REQUEST_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight', 'HTTP requests being served',
+    ['blueprint'], multiprocess_mode='livesum'
+)
+UPSTREAM_LATENCY = Histogram(
+    'supabase_request_duration_seconds', 'Supabase call latency by table and operation',
+    ['call'], buckets=UPSTREAM_BUCKETS
+)
+UPSTREAM_ERRORS = Counter(
+    'supabase_request_errors_total', 'Supabase calls that failed at the transport level',
+    ['call']
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    'supabase_requests_in_flight', 'Supabase calls waiting on the network',
+    multiprocess_mode='livesum'
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total', 'Cache lookups by cache and result (hit or miss)',
+    ['cache', 'result']
+)
+COALESCED_REQUESTS = Counter(
+    'coalesced_requests_total', 'Requests that waited for an identical in-flight computation'
+)
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def record_coalesced():
+    COALESCED_REQUESTS.inc()
+
+
+def upstream_started():
+    UPSTREAM_IN_FLIGHT.inc()
+
+
+def upstream_finished(call, seconds, failed=False):
+    UPSTREAM_IN_FLIGHT.dec()
+    UPSTREAM_LATENCY.labels(call).observe(seconds)
+    if failed:
+        UPSTREAM_ERRORS.labels(call).inc()
+
+
+def _labels():
+    # Unmatched URLs share one label so scanners cannot blow up cardinality
+    return request.blueprint or 'app', request.endpoint or 'unmatched'
+
+
+def collect():
+    """Exposition text for this process, or for all workers in multiprocess mode"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def init_metrics(app):
+    """Record request metrics and serve them at /metrics"""
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        g.metrics_blueprint = _labels()[0]
+        REQUESTS_IN_FLIGHT.labels(g.metrics_blueprint).inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        if 'metrics_started' in g:
+            blueprint, endpoint = _labels()
+            REQUESTS.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+            REQUEST_LATENCY.labels(blueprint, endpoint).observe(time.perf_counter() - g.metrics_started)
+            if response.status_code >= 500:
+                REQUEST_ERRORS.labels(blueprint, endpoint).inc()
+        return response
+
+    @app.teardown_request
+    def end_request_metrics(error=None):
+        blueprint = g.pop('metrics_blueprint', None)
+        if blueprint is not None:
+            REQUESTS_IN_FLIGHT.labels(blueprint).dec()
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(collect(), headers={'Content-Type': CONTENT_TYPE_LATEST})
@@ -0,0 +1,75 @@
+import bisect
+
+from flask import request
+
+# Rows per page when the client does not ask for a limit, and the most it may ask for
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class PageParams:
+    """Keyset page request: rows with ``id > after_id``, at most ``limit`` of them"""
+
+    def __init__(self, limit, after_id, fields):
+        self.limit = limit
+        self.after_id = after_id
+        self.fields = fields
+
+    @property
+    def columns(self):
+        """PostgREST select list for the requested fields"""
+        return ','.join(self.fields) if self.fields else '*'
+
+
+def page_params(allowed_fields):
+    """Parse ``limit``, ``after_id`` and ``fields`` from the query string.
+
+    Raises ValueError with a client-facing message on bad input. The id is
+    always part of a projection because it is the cursor.
+    """
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        after_id = request.args.get('after_id')
+        after_id = int(after_id) if after_id not in (None, '') else None
+    except ValueError:
+        raise ValueError('limit and after_id must be integers')
+
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in allowed_fields]
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+
+    return PageParams(limit, after_id, fields)
+
+
+def paginate(rows, page):
+    """Apply a keyset page to id-ordered rows held in memory.
+
+    Returns up to ``limit + 1`` rows so ``page_body`` can tell whether
+    another page follows.
+    """
+    start = 0
+    if page.after_id is not None:
+        start = bisect.bisect_right(rows, page.after_id, key=lambda row: row['id'])
+    rows = rows[start:start + page.limit + 1]
+    if page.fields:
+        rows = [{field: row.get(field) for field in page.fields} for row in rows]
+    return rows
+
+
+def page_body(key, rows, page):
+    """Response body for a page fetched with one extra row to detect the end"""
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+    return {
+        key: rows,
+        'limit': page.limit,
+        'next_after_id': rows[-1]['id'] if has_more else None
+    }
@@ -0,0 +1,104 @@
+import numpy as np
+
+from src.columnar import ColumnarTable
+
+# Assumed cost of one unit of fuel
+FUEL_PRICE = 0.8
+
+# Assumed ticket prices per km for economy, business and first class
+ECONOMY_PRICE_PER_KM = 0.1
+BUSINESS_PRICE_PER_KM = 0.3
+FIRST_PRICE_PER_KM = 0.5
+
+# Per-pair fields added to recommendation results, in response order
+ECONOMICS_FIELDS = (
+    'estimated_profit',
+    'flight_time_hours',
+    'fuel_cost',
+    'maintenance_cost',
+    'estimated_revenue'
+)
+
+
+def _column(rows, key):
+    if isinstance(rows, ColumnarTable):
+        return rows.column(key)
+    return np.array([row[key] for row in rows], dtype=np.float64)
+
+
+class AircraftColumns:
+    """Column arrays of the aircraft attributes used by the profit model"""
+
+    def __init__(self, aircraft_list):
+        if isinstance(aircraft_list, ColumnarTable):
+            self.ids = aircraft_list.values('id')
+        else:
+            self.ids = [a['id'] for a in aircraft_list]
+        self.range_km = _column(aircraft_list, 'range_km')
+        self.speed_kmh = _column(aircraft_list, 'speed_kmh')
+        self.fuel_consumption = _column(aircraft_list, 'fuel_consumption')
+        self.maintenance_cost = _column(aircraft_list, 'maintenance_cost')
+        self.capacity_eco = _column(aircraft_list, 'capacity_eco')
+        self.capacity_business = _column(aircraft_list, 'capacity_business')
+        self.capacity_first = _column(aircraft_list, 'capacity_first')
+        self.required_runway_length = _column(aircraft_list, 'required_runway_length')
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class RouteColumns:
+    """Column arrays of route distance and per-class demand"""
+
+    def __init__(self, distance_km, demand_economy, demand_business, demand_first):
+        self.distance_km = np.asarray(distance_km, dtype=np.float64)
+        self.demand_economy = np.asarray(demand_economy, dtype=np.float64)
+        self.demand_business = np.asarray(demand_business, dtype=np.float64)
+        self.demand_first = np.asarray(demand_first, dtype=np.float64)
+
+    @classmethod
+    def from_routes(cls, routes):
+        return cls(
+            _column(routes, 'distance_km'),
+            _column(routes, 'demand_economy'),
+            _column(routes, 'demand_business'),
+            _column(routes, 'demand_first')
+        )
+
+    def __len__(self):
+        return len(self.distance_km)
+
+
+def profit_matrix(aircraft, routes):
+    """Revenue, cost, profit and flight time for every aircraft x route pair.
+
+    Returns a dict of ``len(aircraft) x len(routes)`` arrays. Seats sold per
+    class are capped by the aircraft's capacity; costs are fuel and
+    maintenance per flight hour.
+    """
+    speed = aircraft.speed_kmh[:, None]
+    distance = routes.distance_km[None, :]
+
+    flight_time_hours = distance / speed
+    fuel_cost = aircraft.fuel_consumption[:, None] * flight_time_hours * FUEL_PRICE
+    maintenance_cost = aircraft.maintenance_cost[:, None] * flight_time_hours
+
+    eco_seats = np.minimum(routes.demand_economy[None, :], aircraft.capacity_eco[:, None])
+    business_seats = np.minimum(routes.demand_business[None, :], aircraft.capacity_business[:, None])
+    first_seats = np.minimum(routes.demand_first[None, :], aircraft.capacity_first[:, None])
+
+    revenue = (
+        (eco_seats * (distance * ECONOMY_PRICE_PER_KM))
+        + (business_seats * (distance * BUSINESS_PRICE_PER_KM))
+        + (first_seats * (distance * FIRST_PRICE_PER_KM))
+    )
+    cost = fuel_cost + maintenance_cost
+
+    return {
+        'flight_time_hours': flight_time_hours,
+        'fuel_cost': fuel_cost,
+        'maintenance_cost': maintenance_cost,
+        'cost': cost,
+        'estimated_revenue': revenue,
+        'estimated_profit': revenue - cost
+    }
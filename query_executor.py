@@ -0,0 +1,57 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Maximum number of PostgREST/GoTrue calls in flight per worker
+QUERY_POOL_SIZE = int(os.getenv('QUERY_POOL_SIZE', '8'))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+# Marks pool threads so nested fan-outs run inline instead of waiting on the pool
+_pool_thread = threading.local()
+
+
+def get_executor():
+    """Bounded thread pool for blocking Supabase calls, created once per process"""
+    global _executor, _executor_pid
+    if _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor_pid != os.getpid():
+                # A pool inherited across fork has no live threads; start a new one
+                _executor = ThreadPoolExecutor(
+                    max_workers=QUERY_POOL_SIZE,
+                    thread_name_prefix='supabase-query'
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def fan_out(**queries):
+    """Run independent zero-argument callables concurrently.
+
+    Returns a dict mapping each keyword to its callable's result, so the
+    request waits for the slowest call instead of the sum of all of them.
+    The first exception raised by any call is re-raised. Calls run in a copy
+    of the caller's context, so Flask's ``g`` and app context stay usable.
+    """
+    if len(queries) <= 1 or getattr(_pool_thread, 'active', False):
+        return {name: query() for name, query in queries.items()}
+
+    executor = get_executor()
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, _run_in_pool, query)
+        for name, query in queries.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _run_in_pool(query):
+    _pool_thread.active = True
+    try:
+        return query()
+    finally:
+        _pool_thread.active = False
+
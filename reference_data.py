@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+
+from src.repositories import get_repositories
+from src.query_executor import fan_out
+from src.geodesy import AirportCoordinates
+from src.distance_matrix import DISTANCE_MATRIX_DIR, load_or_build
+from src.spatial_index import AirportGrid
+from src.profitability import AircraftColumns
+from src.runway_feasibility import RunwayFeasibility
+from src.aircraft_index import AircraftIndex
+from src.metrics import record_cache_lookup
+from src.http_caching import content_tag
+from src.columnar import ColumnarTable
+
+# How long a loaded snapshot of the reference tables stays fresh (seconds)
+REFERENCE_DATA_TTL = int(os.getenv('REFERENCE_DATA_TTL', '3600'))
+
+
+class ReferenceDataCache:
+    """Per-worker in-memory copy of the airports and aircraft catalogs.
+
+    Both tables are loaded together on first use and served from memory until
+    the TTL expires or the version is bumped with ``invalidate()``. They are
+    held as ``ColumnarTable``s, whose rows read like dicts, with the aircraft
+    in id order. Derived structures (coordinate arrays, indexes) can be
+    memoized against the current snapshot with ``derived()`` so they are
+    rebuilt only on reload.
+    """
+
+    def __init__(self, ttl=REFERENCE_DATA_TTL, matrix_dir=DISTANCE_MATRIX_DIR):
+        self.ttl = ttl
+        self.matrix_dir = matrix_dir
+        self.version = 0
+        self._lock = threading.RLock()
+        self._loaded_version = None
+        self._loaded_at = 0.0
+        self._airports = ColumnarTable([], key='code')
+        self._aircraft = ColumnarTable([], key='id')
+        self._derived = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _is_fresh(self):
+        if self._loaded_version != self.version:
+            return False
+        return (time.monotonic() - self._loaded_at) < self.ttl
+
+    def _load(self):
+        # Both tables are fetched concurrently
+        repositories = get_repositories()
+        results = fan_out(
+            airports=repositories.airports.list_all,
+            aircraft=repositories.aircraft.list_all
+        )
+        airports = results['airports'] or []
+        aircraft = sorted(results['aircraft'] or [], key=lambda a: a['id'])
+
+        # The row dicts are dropped once copied into columns
+        self._airports = ColumnarTable(airports, key='code')
+        self._aircraft = ColumnarTable(aircraft, key='id')
+        self._derived = {}
+        self._loaded_version = self.version
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._is_fresh():
+            self.hits += 1
+            record_cache_lookup('reference_data', hit=True)
+            return
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            if self._is_fresh():
+                self.hits += 1
+                record_cache_lookup('reference_data', hit=True)
+                return
+            self.misses += 1
+            record_cache_lookup('reference_data', hit=False)
+            self._load()
+
+    def invalidate(self):
+        """Bump the version so the next lookup reloads both tables"""
+        with self._lock:
+            self.version += 1
+
+    def airports(self):
+        """All airports as a sequence of dict-like rows"""
+        self._ensure_loaded()
+        return self._airports
+
+    def airport(self, code):
+        """Airport by IATA code, or None"""
+        self._ensure_loaded()
+        return self._airports.get(code)
+
+    def aircraft_list(self):
+        """All aircraft types as a sequence of dict-like rows, in id order"""
+        self._ensure_loaded()
+        return self._aircraft
+
+    def aircraft(self, aircraft_id):
+        """Aircraft type by id, or None"""
+        self._ensure_loaded()
+        try:
+            return self._aircraft.get(int(aircraft_id))
+        except (TypeError, ValueError):
+            return None
+
+    def derived(self, name, builder):
+        """Memoize ``builder(airports, aircraft)`` for the current snapshot"""
+        self._ensure_loaded()
+        snapshot = self._derived
+        if name not in snapshot:
+            with self._lock:
+                if name not in snapshot:
+                    snapshot[name] = builder(self._airports, self._aircraft)
+        return snapshot[name]
+
+    def airport_coordinates(self):
+        """Radian coordinate arrays aligned with ``airports()``"""
+        return self.derived(
+            'airport_coordinates',
+            lambda airports, aircraft: AirportCoordinates.from_airports(airports)
+        )
+
+    def distance_matrix(self):
+        """Shared memory-mapped all-pairs distance matrix for ``airports()``"""
+        return self.derived(
+            'distance_matrix',
+            lambda airports, aircraft: load_or_build(self.airport_coordinates(), self.matrix_dir)
+        )
+
+    def spatial_index(self):
+        """Cell grid over airport coordinates for range and nearest queries"""
+        return self.derived(
+            'spatial_index',
+            lambda airports, aircraft: AirportGrid(self.airport_coordinates())
+        )
+
+    def aircraft_columns(self):
+        """Profit-model column arrays aligned with ``aircraft_list()``"""
+        return self.derived(
+            'aircraft_columns',
+            lambda airports, aircraft: AircraftColumns(aircraft)
+        )
+
+    def aircraft_rows(self):
+        """``aircraft_list()`` decoded into plain dicts once per snapshot.
+
+        The catalog is small, so code that copies whole rows for every
+        request reads these rather than decoding the columns each time. Rows
+        are in id order, as keyset pagination needs.
+        """
+        return self.derived('aircraft_rows', lambda airports, aircraft: aircraft.to_dicts())
+
+    def runway_feasibility(self):
+        """Per-aircraft bitsets of the airports whose runways each type can use"""
+        return self.derived(
+            'runway_feasibility',
+            lambda airports, aircraft: RunwayFeasibility.from_catalogs(airports, self.aircraft_columns())
+        )
+
+    def aircraft_index(self):
+        """Range, manufacturer, category and type lookups over ``aircraft_list()``"""
+        return self.derived(
+            'aircraft_index',
+            lambda airports, aircraft: AircraftIndex(aircraft)
+        )
+
+    def aircraft_tag(self):
+        """Content hash of the aircraft catalog snapshot, for ETags"""
+        return self.derived(
+            'aircraft_tag',
+            lambda airports, aircraft: content_tag(self.aircraft_rows())
+        )
+
+    def snapshot_tag(self):
+        """Content hash of both catalogs, for keys of results computed from them"""
+        return self.derived(
+            'snapshot_tag',
+            lambda airports, aircraft: content_tag(
+                self.aircraft_tag(), sorted(airports, key=lambda a: a['code'])
+            )
+        )
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'loaded_version': self._loaded_version,
+            'airports': len(self._airports),
+            'aircraft': len(self._aircraft),
+            'bytes': self._airports.nbytes() + self._aircraft.nbytes(),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+# Shared instance used by all blueprints in this worker
+reference_data = ReferenceDataCache()
@@ -0,0 +1,162 @@
+"""Data-access layer for the airports, aircraft, routes and airlines tables.
+
+Handlers talk to the repositories below instead of building PostgREST
+queries inline. Every repository runs on a store: Supabase (production),
+SQLite or pure in-memory. The local stores use the schema from
+architecture.md, so the API can run with no network. ``DATA_BACKEND``
+selects the store, and ``DATA_FIXTURES`` optionally seeds a local store
+from a JSON file of ``{table: [rows]}``.
+"""
+import json
+import os
+import threading
+
+from src.repositories.stores import MemoryStore, SQLiteStore, SupabaseStore
+
+DATA_BACKEND = os.getenv('DATA_BACKEND', 'supabase')
+DATA_FIXTURES = os.getenv('DATA_FIXTURES')
+SQLITE_PATH = os.getenv('SQLITE_PATH', ':memory:')
+
+
+class AircraftRepository:
+    def __init__(self, store):
+        self.store = store
+
+    def list_all(self):
+        return self.store.select_all('aircraft')
+
+
+class AirportRepository:
+    def __init__(self, store):
+        self.store = store
+
+    def list_all(self):
+        return self.store.select_all('airports')
+
+    def get(self, code):
+        rows = self.store.select('airports', where=[('code', 'eq', code)])
+        return rows[0] if rows else None
+
+
+class AirlineRepository:
+    def __init__(self, store):
+        self.store = store
+
+    def get_by_user(self, user_id):
+        rows = self.store.select('airlines', where=[('user_id', 'eq', user_id)])
+        return rows[0] if rows else None
+
+    def create(self, airline):
+        return self.store.insert('airlines', airline)
+
+
+class RouteRepository:
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, route_id):
+        rows = self.store.select('routes', where=[('id', 'eq', route_id)])
+        return rows[0] if rows else None
+
+    def get_many(self, route_ids):
+        """Routes by id with a single query, as a dict keyed by id"""
+        route_ids = list(dict.fromkeys(route_ids))
+        if not route_ids:
+            return {}
+        rows = self.store.select('routes', where=[('id', 'in', route_ids)])
+        return {row['id']: row for row in rows}
+
+    def existing_ids(self, route_ids):
+        if not route_ids:
+            return set()
+        rows = self.store.select('routes', where=[('id', 'in', list(route_ids))], columns='id')
+        return {row['id'] for row in rows}
+
+    def list_for_airline(self, airline_id, after_id=None, limit=None, columns='*'):
+        """The airline's routes, optionally one keyset page ordered by id"""
+        where = [('airline_id', 'eq', airline_id)]
+        if after_id is not None:
+            where.append(('id', 'gt', after_id))
+        if limit is None:
+            return self.store.select_all('routes', where=where, columns=columns)
+        return self.store.select('routes', where=where, columns=columns, order_by='id', limit=limit)
+
+    def create(self, route):
+        return self.store.insert('routes', route)
+
+    def update_owned(self, route_id, airline_id, values):
+        """Update a route only if it belongs to the airline; returns the changed rows"""
+        return self.store.update('routes', values, where=[
+            ('id', 'eq', route_id),
+            ('airline_id', 'eq', airline_id)
+        ])
+
+    def update_owned_many(self, route_ids, airline_id, values):
+        """Apply the same update to the airline's routes among ``route_ids``"""
+        return self.store.update('routes', values, where=[
+            ('id', 'in', list(route_ids)),
+            ('airline_id', 'eq', airline_id)
+        ])
+
+    def delete_owned(self, route_id, airline_id):
+        """Delete a route only if it belongs to the airline; returns the deleted rows"""
+        return self.store.delete('routes', where=[
+            ('id', 'eq', route_id),
+            ('airline_id', 'eq', airline_id)
+        ])
+
+
+class Repositories:
+    """All repositories over one store"""
+
+    def __init__(self, store):
+        self.store = store
+        self.aircraft = AircraftRepository(store)
+        self.airports = AirportRepository(store)
+        self.airlines = AirlineRepository(store)
+        self.routes = RouteRepository(store)
+
+    def load_fixtures(self, path):
+        """Seed the store from a JSON file of {table: [rows]}"""
+        with open(path) as f:
+            fixtures = json.load(f)
+        for table, rows in fixtures.items():
+            for row in rows:
+                self.store.insert(table, row)
+
+
+def create_store(backend=DATA_BACKEND):
+    if backend == 'supabase':
+        return SupabaseStore()
+    if backend == 'sqlite':
+        return SQLiteStore(SQLITE_PATH)
+    if backend == 'memory':
+        return MemoryStore()
+    raise ValueError(f'Unknown data backend {backend}')
+
+
+_repositories = None
+_lock = threading.Lock()
+
+
+def get_repositories():
+    """Repositories for the configured backend, created once per process"""
+    global _repositories
+    if _repositories is None:
+        with _lock:
+            if _repositories is None:
+                repositories = Repositories(create_store())
+                if DATA_FIXTURES and DATA_BACKEND != 'supabase':
+                    repositories.load_fixtures(DATA_FIXTURES)
+                _repositories = repositories
+    return _repositories
+
+
+def set_repositories(repositories):
+    """Swap the process-wide repositories, e.g. for tests or benchmarks.
+
+    Returns the ones replaced, so the caller can put them back.
+    """
+    global _repositories
+    previous, _repositories = _repositories, repositories
+    return previous
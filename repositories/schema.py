@@ -0,0 +1,105 @@
+# Tables of the application schema (see architecture.md), used to create the
+# SQLite database and to shape rows in the in-memory store. Users live in
+# Supabase Auth and have no table here.
+
+# table -> (primary key, auto-incrementing?, [(column, SQLite type)])
+TABLES = {
+    'airlines': ('id', True, [
+        ('id', 'INTEGER'),
+        ('user_id', 'TEXT'),
+        ('name', 'TEXT'),
+        ('hub_airport_code', 'TEXT'),
+        ('balance', 'REAL'),
+        ('created_at', 'TEXT')
+    ]),
+    'aircraft': ('id', True, [
+        ('id', 'INTEGER'),
+        ('manufacturer', 'TEXT'),
+        ('model', 'TEXT'),
+        ('range_km', 'INTEGER'),
+        ('speed_kmh', 'INTEGER'),
+        ('fuel_consumption', 'REAL'),
+        ('capacity_eco', 'INTEGER'),
+        ('capacity_business', 'INTEGER'),
+        ('capacity_first', 'INTEGER'),
+        ('price', 'REAL'),
+        ('maintenance_cost', 'REAL'),
+        ('category', 'TEXT'),
+        ('cargo_capacity', 'REAL'),
+        ('required_runway_length', 'INTEGER'),
+        ('r_and_d_level', 'INTEGER')
+    ]),
+    'airports': ('code', False, [
+        ('code', 'TEXT'),
+        ('name', 'TEXT'),
+        ('city', 'TEXT'),
+        ('country', 'TEXT'),
+        ('continent', 'TEXT'),
+        ('runway_length', 'INTEGER'),
+        ('hub_size', 'INTEGER'),
+        ('latitude', 'REAL'),
+        ('longitude', 'REAL')
+    ]),
+    'routes': ('id', True, [
+        ('id', 'INTEGER'),
+        ('airline_id', 'INTEGER'),
+        ('origin_airport_code', 'TEXT'),
+        ('destination_airport_code', 'TEXT'),
+        ('distance_km', 'INTEGER'),
+        ('demand_economy', 'INTEGER'),
+        ('demand_business', 'INTEGER'),
+        ('demand_first', 'INTEGER'),
+        ('demand_cargo', 'INTEGER'),
+        ('competition_level', 'TEXT'),
+        ('created_at', 'TEXT')
+    ]),
+    'owned_aircraft': ('id', True, [
+        ('id', 'INTEGER'),
+        ('airline_id', 'INTEGER'),
+        ('aircraft_id', 'INTEGER'),
+        ('purchase_date', 'TEXT'),
+        ('configuration_eco', 'INTEGER'),
+        ('configuration_business', 'INTEGER'),
+        ('configuration_first', 'INTEGER'),
+        ('assigned_route_id', 'INTEGER'),
+        ('status', 'TEXT')
+    ])
+}
+
+# Secondary indexes matching the lookups the API performs
+INDEXES = [
+    ('airlines', 'user_id'),
+    ('routes', 'airline_id')
+]
+
+
+def columns(table):
+    """Column names of a table, in schema order"""
+    return [name for name, _ in TABLES[table][2]]
+
+
+def column_types(table):
+    return dict(TABLES[table][2])
+
+
+def primary_key(table):
+    return TABLES[table][0]
+
+
+def create_statements():
+    """SQLite DDL for every table and index"""
+    statements = []
+    for table, (pk, autoincrement, cols) in TABLES.items():
+        definitions = []
+        for name, sql_type in cols:
+            if name == pk:
+                suffix = ' PRIMARY KEY AUTOINCREMENT' if autoincrement else ' PRIMARY KEY'
+                definitions.append(f'{name} {sql_type}{suffix}')
+            elif name == 'created_at':
+                definitions.append(f"{name} {sql_type} DEFAULT CURRENT_TIMESTAMP")
+            else:
+                definitions.append(f'{name} {sql_type}')
+        statements.append(f'CREATE TABLE IF NOT EXISTS {table} ({", ".join(definitions)})')
+    for table, column in INDEXES:
+        statements.append(f'CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})')
+    return statements
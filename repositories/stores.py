@@ -0,0 +1,286 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from src.repositories.schema import TABLES, column_types, columns, create_statements, primary_key
+
+# Filter operators understood by every store: (column, op, value) triples
+FILTER_OPS = ('eq', 'in', 'gt', 'gte', 'lt', 'lte')
+
+# Rows fetched per request when reading a whole table from Supabase. PostgREST
+# truncates every response at its max-rows setting (1000 by default), so this
+# must not exceed it.
+SUPABASE_PAGE_SIZE = int(os.getenv('SUPABASE_PAGE_SIZE', '1000'))
+
+
+class SupabaseStore:
+    """Table access through the PostgREST client"""
+
+    # Filter operator -> PostgREST query builder method
+    METHODS = {'eq': 'eq', 'in': 'in_', 'gt': 'gt', 'gte': 'gte', 'lt': 'lt', 'lte': 'lte'}
+
+    def __init__(self, client=None, page_size=SUPABASE_PAGE_SIZE):
+        self._client = client
+        self.page_size = page_size
+
+    @property
+    def client(self):
+        if self._client is not None:
+            return self._client
+        # Resolved at call time so the managed per-process client is used
+        from src.main import supabase
+        return supabase
+
+    def _filtered(self, query, where):
+        for column, op, value in where or ():
+            query = getattr(query, self.METHODS[op])(column, value)
+        return query
+
+    def select(self, table, where=None, columns='*', order_by=None, descending=False, limit=None):
+        query = self._filtered(self.client.table(table).select(columns), where)
+        if order_by:
+            query = query.order(order_by, desc=descending)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.execute().data
+
+    def select_all(self, table, where=None, columns='*'):
+        """Every matching row, fetched in primary key order one page at a time"""
+        rows = []
+        while True:
+            query = self._filtered(self.client.table(table).select(columns), where)
+            query = query.order(primary_key(table)).range(len(rows), len(rows) + self.page_size - 1)
+            page = query.execute().data
+            rows.extend(page)
+            # A short page is the last one
+            if len(page) < self.page_size:
+                return rows
+
+    def insert(self, table, row):
+        return self.client.table(table).insert(row).execute().data[0]
+
+    def update(self, table, values, where):
+        return self._filtered(self.client.table(table).update(values), where).execute().data
+
+    def delete(self, table, where):
+        return self._filtered(self.client.table(table).delete(), where).execute().data
+
+
+def _coerce(table, column, value):
+    """Convert query-string values to the column's type, as PostgREST would"""
+    sql_type = column_types(table).get(column)
+    if sql_type is None:
+        raise ValueError(f'Unknown column {table}.{column}')
+    if value is None:
+        return None
+    try:
+        if sql_type == 'INTEGER':
+            return int(value)
+        if sql_type == 'REAL':
+            return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid value for {table}.{column}: {value!r}')
+    return value
+
+
+def _check_filters(table, where):
+    """Reject unknown columns and operators before touching any rows"""
+    for column, op, _ in where or ():
+        if op not in FILTER_OPS:
+            raise ValueError(f'Unknown filter operator {op}')
+        if column not in column_types(table):
+            raise ValueError(f'Unknown column {table}.{column}')
+
+
+def _projection(table, selected):
+    if selected in (None, '*'):
+        return None
+    names = [name.strip() for name in selected.split(',') if name.strip()]
+    known = set(columns(table))
+    for name in names:
+        if name not in known:
+            raise ValueError(f'Unknown column {table}.{name}')
+    return names
+
+
+class MemoryStore:
+    """Pure in-memory tables shaped by the application schema"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tables = {table: {} for table in TABLES}
+        self._next_id = {table: 1 for table in self._tables}
+
+    def _prepare(self, table, where):
+        """Coerce filter values once per query rather than once per row"""
+        _check_filters(table, where)
+        prepared = []
+        for column, op, value in where or ():
+            if op == 'in':
+                value = {_coerce(table, column, v) for v in value}
+            else:
+                value = _coerce(table, column, value)
+            prepared.append((column, op, value))
+        return prepared
+
+    @staticmethod
+    def _matches(row, prepared):
+        for column, op, value in prepared:
+            current = row.get(column)
+            if op == 'in':
+                if current not in value:
+                    return False
+            elif op == 'eq':
+                if current != value:
+                    return False
+            elif current is None:
+                return False
+            elif op == 'gt' and not current > value:
+                return False
+            elif op == 'gte' and not current >= value:
+                return False
+            elif op == 'lt' and not current < value:
+                return False
+            elif op == 'lte' and not current <= value:
+                return False
+        return True
+
+    def _rows(self, table, prepared):
+        """Rows matching the prepared filters, looked up by key when possible"""
+        rows = self._tables[table]
+        pk = primary_key(table)
+        for column, op, value in prepared:
+            if column == pk and op in ('eq', 'in'):
+                keys = value if op == 'in' else (value,)
+                candidates = [rows[key] for key in keys if key in rows]
+                break
+        else:
+            candidates = rows.values()
+        return [row for row in candidates if self._matches(row, prepared)]
+
+    def select(self, table, where=None, columns='*', order_by=None, descending=False, limit=None):
+        names = _projection(table, columns)
+        prepared = self._prepare(table, where)
+        with self._lock:
+            rows = self._rows(table, prepared)
+        if order_by:
+            rows.sort(key=lambda row: (row.get(order_by) is None, row.get(order_by)), reverse=descending)
+        if limit is not None:
+            rows = rows[:limit]
+        if names:
+            return [{name: row.get(name) for name in names} for row in rows]
+        return [dict(row) for row in rows]
+
+    def select_all(self, table, where=None, columns='*'):
+        return self.select(table, where=where, columns=columns)
+
+    def insert(self, table, row):
+        pk = primary_key(table)
+        record = {name: None for name in columns(table)}
+        for name, value in row.items():
+            record[name] = _coerce(table, name, value)
+        if 'created_at' in record and record['created_at'] is None:
+            record['created_at'] = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            if record[pk] is None:
+                record[pk] = self._next_id[table]
+            if record[pk] in self._tables[table]:
+                raise ValueError(f'Duplicate key {table}.{pk}={record[pk]}')
+            if isinstance(record[pk], int):
+                self._next_id[table] = max(self._next_id[table], record[pk] + 1)
+            self._tables[table][record[pk]] = record
+        return dict(record)
+
+    def update(self, table, values, where):
+        values = {name: _coerce(table, name, value) for name, value in values.items()}
+        prepared = self._prepare(table, where)
+        with self._lock:
+            rows = self._rows(table, prepared)
+            for row in rows:
+                row.update(values)
+            return [dict(row) for row in rows]
+
+    def delete(self, table, where):
+        pk = primary_key(table)
+        prepared = self._prepare(table, where)
+        with self._lock:
+            rows = self._rows(table, prepared)
+            for row in rows:
+                del self._tables[table][row[pk]]
+            return [dict(row) for row in rows]
+
+
+class SQLiteStore:
+    """Tables in a local SQLite database created from the application schema"""
+
+    OPERATORS = {'eq': '=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+
+    def __init__(self, path=':memory:'):
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            for statement in create_statements():
+                self._conn.execute(statement)
+
+    def _where(self, table, where):
+        clauses = []
+        params = []
+        _check_filters(table, where)
+        for column, op, value in where or ():
+            if op == 'in':
+                values = [_coerce(table, column, v) for v in value]
+                if not values:
+                    clauses.append('0')
+                    continue
+                clauses.append(f'{column} IN ({", ".join("?" for _ in values)})')
+                params.extend(values)
+            elif value is None and op == 'eq':
+                clauses.append(f'{column} IS NULL')
+            else:
+                clauses.append(f'{column} {self.OPERATORS[op]} ?')
+                params.append(_coerce(table, column, value))
+        sql = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+        return sql, params
+
+    def _execute(self, sql, params=()):
+        with self._lock, self._conn:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def select(self, table, where=None, columns='*', order_by=None, descending=False, limit=None):
+        names = _projection(table, columns)
+        selected = ', '.join(names) if names else '*'
+        sql, params = self._where(table, where)
+        sql = f'SELECT {selected} FROM {table}{sql}'
+        if order_by:
+            if order_by not in column_types(table):
+                raise ValueError(f'Unknown column {table}.{order_by}')
+            sql += f' ORDER BY {order_by} {"DESC" if descending else "ASC"}'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return self._execute(sql, params)
+
+    def select_all(self, table, where=None, columns='*'):
+        return self.select(table, where=where, columns=columns)
+
+    def insert(self, table, row):
+        names = list(row)
+        values = [_coerce(table, name, row[name]) for name in names]
+        sql = (
+            f'INSERT INTO {table} ({", ".join(names)}) '
+            f'VALUES ({", ".join("?" for _ in names)}) RETURNING *'
+        )
+        return self._execute(sql, values)[0]
+
+    def update(self, table, values, where):
+        names = list(values)
+        params = [_coerce(table, name, values[name]) for name in names]
+        where_sql, where_params = self._where(table, where)
+        sql = f'UPDATE {table} SET {", ".join(f"{name} = ?" for name in names)}{where_sql} RETURNING *'
+        return self._execute(sql, params + where_params)
+
+    def delete(self, table, where):
+        where_sql, params = self._where(table, where)
+        return self._execute(f'DELETE FROM {table}{where_sql} RETURNING *', params)
@@ -0,0 +1,188 @@
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from urllib.parse import parse_qsl
+
+from flask import request
+
+# Set to false to drop the Server-Timing header and per-request log line
+REQUEST_TIMING = os.getenv('REQUEST_TIMING', 'True').lower() in ('true', '1', 't')
+
+# Upstream calls slower than this are written to the slow-query log (ms)
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+
+# PostgREST query parameters that are not filters
+NON_FILTER_PARAMS = ('select', 'order', 'limit', 'offset', 'columns', 'on_conflict')
+
+# HTTP method -> PostgREST operation name
+REST_OPERATIONS = {'GET': 'select', 'HEAD': 'select', 'POST': 'insert', 'PATCH': 'update', 'DELETE': 'delete'}
+
+request_logger = logging.getLogger('airline_manager.request')
+slow_query_logger = logging.getLogger('airline_manager.slow_query')
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+
+def upstream_call(method, path, query):
+    """Name an upstream call like ``routes.update`` and describe its filters.
+
+    The filter shape keeps column names and operators but never values,
+    e.g. ``['id=in', 'airline_id=eq']``.
+    """
+    if '/rest/v1/' in path:
+        table = path.split('/rest/v1/', 1)[1].strip('/')
+        filters = [
+            f'{column}={value.split(".", 1)[0]}'
+            for column, value in parse_qsl(query, keep_blank_values=True)
+            if column not in NON_FILTER_PARAMS
+        ]
+        return f'{table}.{REST_OPERATIONS.get(method, method.lower())}', filters
+    if '/auth/v1/' in path:
+        return f'auth.{path.split("/auth/v1/", 1)[1].strip("/").replace("/", ".")}', []
+    return f'other.{method.lower()}', []
+
+
+class RequestTiming:
+    """Time spent by one request in upstream calls, compute and serialization.
+
+    Upstream calls may run concurrently on the query pool, so their
+    wall-clock time is the union of the call intervals, not their sum.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.intervals = []
+        self.serialize_seconds = 0.0
+
+    def add_call(self, name, started, ended):
+        with self._lock:
+            count, seconds = self.calls.get(name, (0, 0.0))
+            self.calls[name] = (count + 1, seconds + ended - started)
+            self.intervals.append((started, ended))
+
+    def add_serialization(self, seconds):
+        with self._lock:
+            self.serialize_seconds += seconds
+
+    def upstream_wall_seconds(self):
+        total = 0.0
+        end = None
+        for start, stop in sorted(self.intervals):
+            if end is None or start > end:
+                total += stop - start
+                end = stop
+            elif stop > end:
+                total += stop - end
+                end = stop
+        return total
+
+    def summary(self):
+        total = time.perf_counter() - self.started
+        upstream = self.upstream_wall_seconds()
+        return {
+            'total_ms': round(total * 1000, 2),
+            'supabase_calls': sum(count for count, _ in self.calls.values()),
+            'supabase_ms': round(upstream * 1000, 2),
+            'upstream': {
+                name: {'count': count, 'ms': round(seconds * 1000, 2)}
+                for name, (count, seconds) in sorted(self.calls.items())
+            },
+            'compute_ms': round(max(0.0, total - upstream - self.serialize_seconds) * 1000, 2),
+            'serialize_ms': round(self.serialize_seconds * 1000, 2)
+        }
+
+
+def current_timing():
+    """Timing of the request being served, or None outside a request"""
+    return _current.get()
+
+
+def record_upstream_call(method, path, query, started, ended):
+    """Attribute one Supabase HTTP call to the current request"""
+    timing = _current.get()
+    if timing is None and (ended - started) * 1000 < SLOW_QUERY_MS:
+        return
+    name, filters = upstream_call(method, path, query)
+    if timing is not None:
+        timing.add_call(name, started, ended)
+    elapsed_ms = (ended - started) * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        slow_query_logger.warning(json.dumps({
+            'event': 'slow_query',
+            'call': name,
+            'ms': round(elapsed_ms, 2),
+            'filters': filters,
+            'path': timing.path if timing is not None else None
+        }))
+
+
+def add_serialization_time(seconds):
+    """Charge JSON encoding time to the current request, if any"""
+    timing = _current.get()
+    if timing is not None:
+        timing.add_serialization(seconds)
+
+
+def server_timing_header(summary):
+    parts = [
+        f'supabase;dur={summary["supabase_ms"]};desc="{summary["supabase_calls"]} calls"'
+    ]
+    for name, call in summary['upstream'].items():
+        parts.append(f'{name};dur={call["ms"]};desc="{call["count"]}x"')
+    parts.append(f'compute;dur={summary["compute_ms"]}')
+    parts.append(f'serialize;dur={summary["serialize_ms"]}')
+    parts.append(f'total;dur={summary["total_ms"]}')
+    return ', '.join(parts)
+
+
+def _configure_logger(logger, level):
+    # Gunicorn does not configure application loggers, so log to stderr by default
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    if logger.level == logging.NOTSET:
+        logger.setLevel(level)
+
+
+def init_request_timing(app):
+    """Add the Server-Timing header and request log line to every response"""
+    _configure_logger(slow_query_logger, logging.WARNING)
+    if not REQUEST_TIMING:
+        return
+    _configure_logger(request_logger, logging.INFO)
+
+    @app.before_request
+    def start_request_timing():
+        request.environ['airline_manager.timing_token'] = _current.set(RequestTiming(request.path))
+
+    @app.after_request
+    def add_server_timing(response):
+        timing = _current.get()
+        if timing is None:
+            return response
+        summary = timing.summary()
+        response.headers['Server-Timing'] = server_timing_header(summary)
+        request_logger.info(json.dumps({
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            **summary
+        }))
+        return response
+
+    @app.teardown_request
+    def end_request_timing(error=None):
+        token = request.environ.pop('airline_manager.timing_token', None)
+        if token is not None:
+            _current.reset(token)
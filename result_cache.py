@@ -0,0 +1,355 @@
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, request
+
+from src.metrics import record_cache_lookup
+from src.single_flight import SingleFlight
+
+# Set to false to recompute every recommendation
+RESULT_CACHE = os.getenv('RESULT_CACHE', 'True').lower() in ('true', '1', 't')
+
+# Tiers looked up in order: 'memory' (per worker) and 'disk' (shared by the
+# workers on a host)
+RESULT_CACHE_TIERS = os.getenv('RESULT_CACHE_TIERS', 'memory')
+
+# Seconds a result is served as fresh, then how much longer it may be served
+# stale while it is recomputed in the background
+RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', '300'))
+RESULT_CACHE_STALE_TTL = int(os.getenv('RESULT_CACHE_STALE_TTL', '600'))
+
+# Size budgets for the cached response bodies (bytes)
+RESULT_CACHE_MEMORY_BYTES = int(os.getenv('RESULT_CACHE_MEMORY_BYTES', str(64 * 1024 * 1024)))
+RESULT_CACHE_DISK_BYTES = int(os.getenv('RESULT_CACHE_DISK_BYTES', str(512 * 1024 * 1024)))
+
+# Disk tier, shared by all workers on a host
+RESULT_CACHE_DIR = os.getenv(
+    'RESULT_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'airline-manager', 'results')
+)
+
+# Bookkeeping charged to the memory budget for each entry besides its body
+ENTRY_OVERHEAD_BYTES = 256
+
+# Disk entry layout: fresh-until, stale-until, key length, then key and body
+_DISK_HEADER = struct.Struct('<ddI')
+
+logger = logging.getLogger('airline_manager.result_cache')
+
+
+class CacheEntry:
+    """Encoded JSON body with its wall-clock expiry times"""
+
+    __slots__ = ('body', 'fresh_until', 'stale_until')
+
+    def __init__(self, body, fresh_until, stale_until):
+        self.body = body
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+    @property
+    def size(self):
+        return len(self.body) + ENTRY_OVERHEAD_BYTES
+
+
+class MemoryTier:
+    """Least recently used entries of this worker, bounded by total size"""
+
+    def __init__(self, max_bytes=RESULT_CACHE_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous.size
+            self._entries[key] = entry
+            self.bytes += entry.size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {
+            'tier': 'memory',
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions
+        }
+
+
+class DiskTier:
+    """Entries stored as files shared by the workers on a host.
+
+    Files are written atomically and the oldest are pruned once the total
+    exceeds ``max_bytes``. Disk errors only make the tier miss.
+    """
+
+    def __init__(self, directory=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_DISK_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._written = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.entry')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < _DISK_HEADER.size:
+            return None
+        fresh_until, stale_until, key_length = _DISK_HEADER.unpack_from(data)
+        start = _DISK_HEADER.size
+        # Guard against hash collisions and truncated files
+        if data[start:start + key_length] != key.encode():
+            return None
+        return CacheEntry(data[start + key_length:], fresh_until, stale_until)
+
+    def set(self, key, entry):
+        encoded_key = key.encode()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_DISK_HEADER.pack(entry.fresh_until, entry.stale_until, len(encoded_key)))
+                f.write(encoded_key)
+                f.write(entry.body)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            return
+        with self._lock:
+            self._written += entry.size
+            prune = self._written > self.max_bytes // 10
+            if prune:
+                self._written = 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Delete the oldest entries until the tier is back under budget"""
+        try:
+            files = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith('.entry')
+            ]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.entry'):
+                    os.remove(entry.path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {'tier': 'disk', 'directory': self.directory, 'max_bytes': self.max_bytes}
+
+
+class ResultCache:
+    """Encoded JSON responses keyed by request parameters plus content tags
+    of the data they were computed from.
+
+    Lookups go through the tiers in order and copy hits into the faster
+    tiers. An entry is fresh for ``ttl`` seconds, then is served for up to
+    ``stale_ttl`` more seconds while one background refresh recomputes it.
+    Only 200 JSON responses are cached; a request sent with
+    ``Cache-Control: no-cache`` is recomputed. Concurrent misses for the
+    same key are computed once through ``flights``.
+    """
+
+    def __init__(self, tiers, flights=None, ttl=RESULT_CACHE_TTL,
+                 stale_ttl=RESULT_CACHE_STALE_TTL, enabled=RESULT_CACHE):
+        self.tiers = tiers
+        self.flights = flights if flights is not None else SingleFlight()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+
+    @staticmethod
+    def make_key(parts):
+        return json.dumps(parts, separators=(',', ':'), default=str)
+
+    def _lookup(self, key):
+        for i, tier in enumerate(self.tiers):
+            entry = tier.get(key)
+            if entry is not None:
+                for faster in self.tiers[:i]:
+                    faster.set(key, entry)
+                return entry
+        return None
+
+    def _store(self, key, body):
+        now = time.time()
+        entry = CacheEntry(body, now + self.ttl, now + self.ttl + self.stale_ttl)
+        for tier in self.tiers:
+            tier.set(key, entry)
+
+    def _compute(self, key, compute, store=True):
+        response = current_app.make_response(compute())
+        if store and response.status_code == 200 and response.mimetype == 'application/json':
+            self._store(key, response.get_data())
+        return response
+
+    def _compute_once(self, key, compute, store=True):
+        """Response for a miss; concurrent identical requests share one computation"""
+        def produce():
+            response = self._compute(key, compute, store)
+            return response.get_data(), response.status_code, list(response.headers.items())
+
+        def recheck():
+            # Another worker may have stored the result while this one waited
+            entry = self._lookup(key) if store else None
+            if entry is not None and time.time() < entry.fresh_until:
+                return entry.body, 200, [('Content-Type', 'application/json')]
+            return None
+
+        # Each request gets its own response object, as after_request hooks modify it
+        body, status, headers = self.flights.do(key, produce, recheck)
+        return current_app.response_class(body, status=status, headers=headers)
+
+    def _get_executor(self):
+        # One refresh thread per process, recreated after fork
+        if self._executor_pid != os.getpid():
+            with self._refresh_lock:
+                if self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='result-refresh')
+                    self._refreshing = set()
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _refresh(self, key, compute):
+        executor = self._get_executor()
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        app = current_app._get_current_object()
+
+        def refresh():
+            try:
+                with app.app_context():
+                    self._compute(key, compute)
+            except Exception:
+                logger.exception('Refreshing cached result failed')
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        executor.submit(refresh)
+
+    def respond(self, parts, compute):
+        """Answer from the cache, or with ``compute()`` and cache its result.
+
+        ``parts`` must identify the result, including tags of the content of
+        all data it reads, so a change anywhere yields a new key. ``compute``
+        returns a view response and must not use the request, because stale
+        entries are refreshed outside of it.
+        """
+        key = self.make_key(parts)
+        if not self.enabled:
+            return self._compute_once(key, compute, store=False)
+        bypass = request.cache_control.no_cache or 'no-cache' in request.pragma
+        entry = None if bypass else self._lookup(key)
+        now = time.time()
+
+        if entry is None or now >= entry.stale_until:
+            self.misses += 1
+            record_cache_lookup('results', hit=False)
+            response = self._compute_once(key, compute)
+            response.headers['X-Result-Cache'] = 'bypass' if bypass else 'miss'
+            return response
+
+        record_cache_lookup('results', hit=True)
+        if now < entry.fresh_until:
+            self.hits += 1
+            state = 'hit'
+        else:
+            self.stale_hits += 1
+            state = 'stale'
+            self._refresh(key, compute)
+        response = current_app.response_class(entry.body, mimetype='application/json')
+        response.headers['X-Result-Cache'] = state
+        return response
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'single_flight': self.flights.stats(),
+            'tiers': [tier.stats() for tier in self.tiers]
+        }
+
+
+def create_tiers(names=RESULT_CACHE_TIERS):
+    """Tiers named in a comma-separated list such as ``memory,disk``"""
+    factories = {'memory': MemoryTier, 'disk': DiskTier}
+    tiers = []
+    for name in names.split(','):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in factories:
+            raise ValueError(f'Unknown result cache tier {name}')
+        tiers.append(factories[name]())
+    return tiers
+
+
+# Shared instance used by all blueprints in this worker
+result_cache = ResultCache(create_tiers())
@@ -1,38 +1,37 @@
-from flask import Blueprint, request, jsonify, session
-from src.main import supabase
+import numpy as np
+from flask import Blueprint, request, jsonify, g
+from src.repositories import get_repositories
+from src.reference_data import reference_data
+from src.airline_context import require_airline
+from src.profitability import AircraftColumns, RouteColumns, profit_matrix, ECONOMICS_FIELDS
+from src.pagination import page_params, page_body
+from src.http_caching import PRIVATE_CACHE_CONTROL, content_tag, not_modified, tagged_json
+from src.result_cache import result_cache
+from src.repositories.schema import columns as table_columns
 
 routes_bp = Blueprint('routes', __name__)
 
 @routes_bp.route('/', methods=['GET'])
+@require_airline
 def get_all_routes():
-    """Get all routes for the current user's airline"""
+    """Get routes for the current user's airline, one id-ordered page at a time"""
     try:
-        # Get user from session
-        user = session.get('user')
+        airline_id = g.airline['id']
         
-        if not user:
+        try:
+            page = page_params(table_columns('routes'))
+        except ValueError as e:
             return jsonify({
-                'error': 'Unauthorized',
-                'message': 'User not logged in'
-            }), 401
-            
-        # Get airline ID
-        airline_data = supabase.table('airlines').select('id').eq('user_id', user.get('id')).execute()
-        
-        if not airline_data.data:
-            return jsonify({
-                'error': 'Airline not found',
-                'message': 'No airline found for current user'
-            }), 404
-            
-        airline_id = airline_data.data[0]['id']
+                'error': 'Invalid parameters',
+                'message': str(e)
+            }), 400
         
-        # Get routes for airline
-        routes_data = supabase.table('routes').select('*').eq('airline_id', airline_id).execute()
+        # Get one page of routes for airline, with one extra row to detect the end
+        routes = get_repositories().routes.list_for_airline(
+            airline_id, after_id=page.after_id, limit=page.limit + 1, columns=page.columns
+        )
         
-        return jsonify({
-            'routes': routes_data.data
-        }), 200
+        return jsonify(page_body('routes', routes, page)), 200
             
     except Exception as e:
         return jsonify({
@@ -45,17 +44,24 @@ def get_route(id):
     """Get a specific route by ID"""
     try:
         # Get route data
-        route_data = supabase.table('routes').select('*').eq('id', id).execute()
+        route = get_repositories().routes.get(id)
         
-        if not route_data.data:
+        if not route:
             return jsonify({
                 'error': 'Route not found',
                 'message': f'No route found with ID {id}'
             }), 404
             
-        return jsonify({
-            'route': route_data.data[0]
-        }), 200
+        # Routes can change through any worker, so the tag hashes the row
+        # itself; a match still saves serializing and sending the body
+        tag = content_tag(route)
+        cached = not_modified(tag, PRIVATE_CACHE_CONTROL)
+        if cached:
+            return cached
+            
+        return tagged_json({
+            'route': route
+        }, tag, PRIVATE_CACHE_CONTROL), 200
             
     except Exception as e:
         return jsonify({
@@ -64,28 +70,11 @@ def get_route(id):
         }), 500
 
 @routes_bp.route('/', methods=['POST'])
+@require_airline
 def create_route():
     """Create a new route for the current user's airline"""
     try:
-        # Get user from session
-        user = session.get('user')
-        
-        if not user:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'User not logged in'
-            }), 401
-            
-        # Get airline ID
-        airline_data = supabase.table('airlines').select('id').eq('user_id', user.get('id')).execute()
-        
-        if not airline_data.data:
-            return jsonify({
-                'error': 'Airline not found',
-                'message': 'No airline found for current user'
-            }), 404
-            
-        airline_id = airline_data.data[0]['id']
+        airline_id = g.airline['id']
         
         # Get route data from request
         data = request.get_json()
@@ -99,34 +88,17 @@ def create_route():
             }), 400
             
         # Check if airports exist
-        origin_airport = supabase.table('airports').select('*').eq('code', origin_code).execute()
-        destination_airport = supabase.table('airports').select('*').eq('code', destination_code).execute()
+        origin = reference_data.airport(origin_code)
+        destination = reference_data.airport(destination_code)
         
-        if not origin_airport.data or not destination_airport.data:
+        if not origin or not destination:
             return jsonify({
                 'error': 'Airport not found',
                 'message': 'Origin or destination airport not found'
             }), 404
             
-        # Calculate distance between airports (simplified calculation)
-        import math
-        
-        origin = origin_airport.data[0]
-        destination = destination_airport.data[0]
-        
-        # Calculate distance using Haversine formula
-        R = 6371  # Earth radius in km
-        lat1 = math.radians(origin['latitude'])
-        lon1 = math.radians(origin['longitude'])
-        lat2 = math.radians(destination['latitude'])
-        lon2 = math.radians(destination['longitude'])
-        
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        distance = R * c
+        # Look up great-circle distance between airports
+        distance = reference_data.distance_matrix().distance(origin_code, destination_code)
         
         # Create route
         route_data = {
@@ -142,11 +114,11 @@ def create_route():
         }
         
         # Insert route
-        result = supabase.table('routes').insert(route_data).execute()
+        route = get_repositories().routes.create(route_data)
         
         return jsonify({
             'message': 'Route created successfully',
-            'route': result.data[0]
+            'route': route
         }), 201
             
     except Exception as e:
@@ -155,123 +127,162 @@ def create_route():
             'message': str(e)
         }), 500
 
+# Route fields a user may change after creation
+UPDATABLE_ROUTE_FIELDS = (
+    'demand_economy',
+    'demand_business',
+    'demand_first',
+    'demand_cargo',
+    'competition_level'
+)
+
+# Upper bound on routes changed by one bulk update
+MAX_BULK_ROUTES = 500
+
+def route_update_fields(data):
+    """Pick the updatable route fields present in a request body"""
+    return {field: data[field] for field in UPDATABLE_ROUTE_FIELDS if field in data}
+
+def route_missing_or_forbidden(id):
+    """Explain why an ownership-scoped write matched no rows"""
+    # Only reached when the conditional write affected nothing
+    if not get_repositories().routes.existing_ids([id]):
+        return jsonify({
+            'error': 'Route not found',
+            'message': f'No route found with ID {id}'
+        }), 404
+        
+    return jsonify({
+        'error': 'Unauthorized',
+        'message': 'Route does not belong to your airline'
+    }), 403
+
 @routes_bp.route('/<int:id>', methods=['PUT'])
+@require_airline
 def update_route(id):
     """Update a route"""
     try:
-        # Get user from session
-        user = session.get('user')
+        # Get update data from request
+        data = request.get_json() or {}
+        update_data = route_update_fields(data)
         
-        if not user:
+        if not update_data:
             return jsonify({
-                'error': 'Unauthorized',
-                'message': 'User not logged in'
-            }), 401
+                'error': 'Missing required fields',
+                'message': f'At least one of {", ".join(UPDATABLE_ROUTE_FIELDS)} is required'
+            }), 400
             
-        # Get route data
-        route_data = supabase.table('routes').select('*').eq('id', id).execute()
+        # Update only if the route belongs to the user's airline
+        updated = get_repositories().routes.update_owned(id, g.airline['id'], update_data)
         
-        if not route_data.data:
-            return jsonify({
-                'error': 'Route not found',
-                'message': f'No route found with ID {id}'
-            }), 404
-            
-        # Get airline ID
-        airline_data = supabase.table('airlines').select('id').eq('user_id', user.get('id')).execute()
+        if not updated:
+            return route_missing_or_forbidden(id)
         
-        if not airline_data.data:
-            return jsonify({
-                'error': 'Airline not found',
-                'message': 'No airline found for current user'
-            }), 404
+        return jsonify({
+            'message': 'Route updated successfully',
+            'route': updated[0]
+        }), 200
             
-        airline_id = airline_data.data[0]['id']
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to update route',
+            'message': str(e)
+        }), 500
+
+@routes_bp.route('/', methods=['PUT'])
+@require_airline
+def update_routes():
+    """Update demand fields on many routes at once"""
+    try:
+        data = request.get_json() or {}
+        changes = data.get('routes')
         
-        # Check if route belongs to user's airline
-        if route_data.data[0]['airline_id'] != airline_id:
+        if not isinstance(changes, list) or not changes:
             return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Route does not belong to your airline'
-            }), 403
-            
-        # Get update data from request
-        data = request.get_json()
-        
-        # Update route
-        update_data = {}
-        
-        if 'demand_economy' in data:
-            update_data['demand_economy'] = data['demand_economy']
-            
-        if 'demand_business' in data:
-            update_data['demand_business'] = data['demand_business']
+                'error': 'Missing required fields',
+                'message': 'routes must be a non-empty list of route updates'
+            }), 400
             
-        if 'demand_first' in data:
-            update_data['demand_first'] = data['demand_first']
+        if len(changes) > MAX_BULK_ROUTES:
+            return jsonify({
+                'error': 'Too many routes',
+                'message': f'At most {MAX_BULK_ROUTES} routes can be updated at once'
+            }), 400
             
-        if 'demand_cargo' in data:
-            update_data['demand_cargo'] = data['demand_cargo']
+        # Group routes receiving identical changes so each group is one statement
+        groups = {}
+        seen_ids = set()
+        for change in changes:
+            if not isinstance(change, dict) or type(change.get('id')) is not int:
+                return jsonify({
+                    'error': 'Invalid parameters',
+                    'message': 'Each route update needs an integer id'
+                }), 400
+                
+            if change['id'] in seen_ids:
+                return jsonify({
+                    'error': 'Invalid parameters',
+                    'message': f'Route {change["id"]} appears more than once'
+                }), 400
+            seen_ids.add(change['id'])
+                
+            update_data = route_update_fields(change)
+            if not update_data:
+                return jsonify({
+                    'error': 'Missing required fields',
+                    'message': f'Route {change["id"]} has no updatable fields'
+                }), 400
+                
+            # Lists and objects are neither valid column values nor hashable
+            if not all(value is None or isinstance(value, (str, int, float)) for value in update_data.values()):
+                return jsonify({
+                    'error': 'Invalid parameters',
+                    'message': f'Route {change["id"]} has a field value that is not a number or string'
+                }), 400
+                
+            key = tuple(sorted(update_data.items()))
+            groups.setdefault(key, (update_data, []))[1].append(change['id'])
             
-        if 'competition_level' in data:
-            update_data['competition_level'] = data['competition_level']
+        routes = get_repositories().routes
+        updated = []
+        for update_data, ids in groups.values():
+            updated.extend(routes.update_owned_many(ids, g.airline['id'], update_data))
             
-        # Update route
-        result = supabase.table('routes').update(update_data).eq('id', id).execute()
+        updated_ids = {route['id'] for route in updated}
         
+        # Classify ids the conditional updates did not touch
+        unmatched = [change['id'] for change in changes if change['id'] not in updated_ids]
+        not_found = []
+        forbidden = []
+        
+        if unmatched:
+            existing_ids = routes.existing_ids(unmatched)
+            for route_id in unmatched:
+                (forbidden if route_id in existing_ids else not_found).append(route_id)
+                
         return jsonify({
-            'message': 'Route updated successfully',
-            'route': result.data[0]
+            'message': f'{len(updated)} routes updated successfully',
+            'routes': updated,
+            'not_found_ids': not_found,
+            'forbidden_ids': forbidden
         }), 200
             
     except Exception as e:
         return jsonify({
-            'error': 'Failed to update route',
+            'error': 'Failed to update routes',
             'message': str(e)
         }), 500
 
 @routes_bp.route('/<int:id>', methods=['DELETE'])
+@require_airline
 def delete_route(id):
     """Delete a route"""
     try:
-        # Get user from session
-        user = session.get('user')
-        
-        if not user:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'User not logged in'
-            }), 401
-            
-        # Get route data
-        route_data = supabase.table('routes').select('*').eq('id', id).execute()
-        
-        if not route_data.data:
-            return jsonify({
-                'error': 'Route not found',
-                'message': f'No route found with ID {id}'
-            }), 404
-            
-        # Get airline ID
-        airline_data = supabase.table('airlines').select('id').eq('user_id', user.get('id')).execute()
-        
-        if not airline_data.data:
-            return jsonify({
-                'error': 'Airline not found',
-                'message': 'No airline found for current user'
-            }), 404
-            
-        airline_id = airline_data.data[0]['id']
+        # Delete only if the route belongs to the user's airline
+        deleted = get_repositories().routes.delete_owned(id, g.airline['id'])
         
-        # Check if route belongs to user's airline
-        if route_data.data[0]['airline_id'] != airline_id:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Route does not belong to your airline'
-            }), 403
-            
-        # Delete route
-        supabase.table('routes').delete().eq('id', id).execute()
+        if not deleted:
+            return route_missing_or_forbidden(id)
         
         return jsonify({
             'message': 'Route deleted successfully'
@@ -283,6 +294,168 @@ def delete_route(id):
             'message': str(e)
         }), 500
 
+# Ranking keys for /recommend, computed from the scored candidate columns;
+# profit-based keys need an aircraft
+RECOMMEND_SORT_KEYS = {
+    'profit': lambda c: c['estimated_profit'],
+    'profit_per_hour': lambda c: np.divide(
+        c['estimated_profit'], c['flight_time_hours'],
+        out=np.zeros_like(c['estimated_profit']), where=c['flight_time_hours'] > 0
+    ),
+    'demand': lambda c: c['demand_economy'],
+    'distance': lambda c: -c['distance_km']
+}
+
+DEFAULT_RECOMMEND_LIMIT = 20
+MAX_RECOMMEND_LIMIT = 200
+# Deepest page served; keeps the top-K selection small and the cache keys bounded
+MAX_RECOMMEND_OFFSET = 1000
+
+def top_indexes(ranking, k):
+    """Indexes of the ``k`` largest values, largest first, ties in index order"""
+    if k >= len(ranking):
+        return np.argsort(-ranking, kind='stable')
+    # The k-th largest value; everything above it is in, ties fill up by index
+    threshold = -np.partition(-ranking, k - 1)[k - 1]
+    above = np.flatnonzero(ranking > threshold)
+    tied = np.flatnonzero(ranking == threshold)[:k - len(above)]
+    top = np.sort(np.concatenate([above, tied]))
+    return top[np.argsort(-ranking[top], kind='stable')]
+
+def score_candidates(hub_index, hub_airport, aircraft, airports, distances, candidates):
+    """Score candidate destinations as column arrays.
+
+    Returns a dict with the surviving airport indexes plus distance, demand
+    and (with an aircraft) profitability columns aligned with them.
+    """
+    candidates = np.sort(np.asarray(candidates, dtype=np.intp))
+    candidates = candidates[candidates != hub_index]
+    distance = distances[candidates].astype(np.float64)
+    
+    # Check range, and runway length through the aircraft's feasibility bitset
+    if aircraft:
+        usable = reference_data.runway_feasibility().airports_for(
+            reference_data.aircraft_list().position(aircraft['id'])
+        )
+        keep = (distance <= aircraft['range_km']) & usable[candidates]
+        candidates = candidates[keep]
+        distance = distance[keep]
+        
+    # Base demand calculation based on airport size
+    dest_size = airports.column('hub_size')[candidates].astype(np.int64)
+    base_demand = (hub_airport['hub_size'] + dest_size) * 10
+    
+    # Distance factor (demand decreases with distance)
+    distance_factor = np.maximum(0.5, 1 - (distance / 10000))
+    
+    # Calculate demand for each class
+    eco_demand = (base_demand * distance_factor).astype(np.int64)
+    columns = {
+        'index': candidates,
+        'distance_km': distance,
+        'demand_economy': eco_demand,
+        'demand_business': (eco_demand * 0.2).astype(np.int64),
+        'demand_first': (eco_demand * 0.05).astype(np.int64),
+        'demand_cargo': (eco_demand * 0.1).astype(np.int64)
+    }
+    
+    # Calculate profitability if aircraft is specified
+    if aircraft:
+        economics = profit_matrix(
+            AircraftColumns([aircraft]),
+            RouteColumns(distance, columns['demand_economy'], columns['demand_business'], columns['demand_first'])
+        )
+        for field in ECONOMICS_FIELDS:
+            columns[field] = economics[field][0]
+            
+    return columns
+
+def build_recommended_route(hub, airport, columns, j):
+    """Materialize the response dict for the ``j``-th scored candidate"""
+    route = {
+        'origin_airport_code': hub,
+        'destination_airport_code': airport['code'],
+        'destination_name': airport['name'],
+        'destination_city': airport['city'],
+        'destination_country': airport['country'],
+        'distance_km': round(float(columns['distance_km'][j])),
+        'demand_economy': int(columns['demand_economy'][j]),
+        'demand_business': int(columns['demand_business'][j]),
+        'demand_first': int(columns['demand_first'][j]),
+        'demand_cargo': int(columns['demand_cargo'][j])
+    }
+    for field in ECONOMICS_FIELDS:
+        if field in columns:
+            route[field] = float(columns[field][j])
+    return route
+
+def recommend_routes_from(hub, aircraft_id, limit, offset, sort):
+    """Recommended routes response for validated query parameters"""
+    # Get hub airport
+    hub_airport = reference_data.airport(hub)
+    
+    if not hub_airport:
+        return jsonify({
+            'error': 'Airport not found',
+            'message': f'No airport found with code {hub}'
+        }), 404
+        
+    # Get aircraft if specified
+    aircraft = None
+    if aircraft_id:
+        aircraft = reference_data.aircraft(aircraft_id)
+        
+        if not aircraft:
+            return jsonify({
+                'error': 'Aircraft not found',
+                'message': f'No aircraft found with ID {aircraft_id}'
+            }), 404
+    
+    # Rank by profitability if aircraft is specified, otherwise by demand
+    if not sort:
+        sort = 'profit' if aircraft else 'demand'
+        
+    if sort not in RECOMMEND_SORT_KEYS or (sort.startswith('profit') and not aircraft):
+        return jsonify({
+            'error': 'Invalid parameters',
+            'message': f'Unsupported sort key {sort}'
+        }), 400
+    
+    # Distances from the hub to every airport, read from the shared matrix
+    airports = reference_data.airports()
+    matrix = reference_data.distance_matrix()
+    distances = matrix.row(matrix.index[hub])
+    
+    # With an aircraft, only airports within its range are candidates
+    if aircraft:
+        candidates, _ = reference_data.spatial_index().within(
+            hub_airport['latitude'], hub_airport['longitude'], aircraft['range_km']
+        )
+    else:
+        candidates = np.arange(len(airports))
+    
+    # Score all candidates at once, then keep only the requested page
+    # with a partial sort of the ranking column
+    columns = score_candidates(
+        matrix.index[hub], hub_airport, aircraft, airports, distances, candidates
+    )
+    ranking = RECOMMEND_SORT_KEYS[sort](columns)
+    top = top_indexes(ranking, offset + limit).tolist()
+    
+    recommended_routes = [
+        build_recommended_route(hub, airports[columns['index'][j]], columns, j)
+        for j in top[offset:]
+    ]
+    
+    return jsonify({
+        'hub': hub_airport,
+        'aircraft': aircraft,
+        'sort': sort,
+        'limit': limit,
+        'offset': offset,
+        'recommended_routes': recommended_routes
+    }), 200
+
 @routes_bp.route('/recommend', methods=['GET'])
 def recommend_routes():
     """Recommend routes based on hub and aircraft"""
@@ -290,6 +463,7 @@ def recommend_routes():
         # Get parameters
         hub = request.args.get('hub')
         aircraft_id = request.args.get('aircraft')
+        sort = request.args.get('sort')
         
         if not hub:
             return jsonify({
@@ -297,133 +471,26 @@ def recommend_routes():
                 'message': 'Hub airport code is required'
             }), 400
             
-        # Get hub airport
-        hub_airport = supabase.table('airports').select('*').eq('code', hub).execute()
-        
-        if not hub_airport.data:
+        try:
+            limit = int(request.args.get('limit', DEFAULT_RECOMMEND_LIMIT))
+            offset = int(request.args.get('offset', 0))
+        except ValueError:
             return jsonify({
-                'error': 'Airport not found',
-                'message': f'No airport found with code {hub}'
-            }), 404
-            
-        # Get aircraft if specified
-        aircraft = None
-        if aircraft_id:
-            aircraft_data = supabase.table('aircraft').select('*').eq('id', aircraft_id).execute()
-            if aircraft_data.data:
-                aircraft = aircraft_data.data[0]
-        
-        # Get all airports
-        all_airports = supabase.table('airports').select('*').execute()
-        
-        # Calculate potential routes
-        potential_routes = []
-        
-        for airport in all_airports.data:
-            if airport['code'] == hub:
-                continue
-                
-            # Calculate distance
-            import math
-            
-            # Calculate distance using Haversine formula
-            R = 6371  # Earth radius in km
-            lat1 = math.radians(hub_airport.data[0]['latitude'])
-            lon1 = math.radians(hub_airport.data[0]['longitude'])
-            lat2 = math.radians(airport['latitude'])
-            lon2 = math.radians(airport['longitude'])
-            
-            dlon = lon2 - lon1
-            dlat = lat2 - lat1
-            
-            a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-            distance = R * c
-            
-            # Check if aircraft can reach this destination
-            if aircraft and distance > aircraft['range_km']:
-                continue
-                
-            # Check runway requirements
-            if aircraft and airport['runway_length'] < aircraft['required_runway_length']:
-                continue
-                
-            # Generate demand based on airport size and distance
-            hub_size = hub_airport.data[0]['hub_size']
-            dest_size = airport['hub_size']
-            
-            # Base demand calculation
-            base_demand = (hub_size + dest_size) * 10
-            
-            # Distance factor (demand decreases with distance)
-            distance_factor = max(0.5, 1 - (distance / 10000))
-            
-            # Calculate demand for each class
-            eco_demand = int(base_demand * distance_factor)
-            business_demand = int(eco_demand * 0.2)
-            first_demand = int(eco_demand * 0.05)
-            cargo_demand = int(eco_demand * 0.1)
-            
-            # Create route object
-            route = {
-                'origin_airport_code': hub,
-                'destination_airport_code': airport['code'],
-                'destination_name': airport['name'],
-                'destination_city': airport['city'],
-                'destination_country': airport['country'],
-                'distance_km': round(distance),
-                'demand_economy': eco_demand,
-                'demand_business': business_demand,
-                'demand_first': first_demand,
-                'demand_cargo': cargo_demand
-            }
-            
-            # Calculate profitability if aircraft is specified
-            if aircraft:
-                # Calculate basic operational costs
-                flight_time_hours = distance / aircraft['speed_kmh']
-                fuel_cost = aircraft['fuel_consumption'] * flight_time_hours * 0.8  # Assuming $0.8 per unit of fuel
-                maintenance_cost = aircraft['maintenance_cost'] * flight_time_hours
-                
-                # Calculate potential revenue based on demand and capacity
-                eco_capacity = aircraft['capacity_eco']
-                business_capacity = aircraft['capacity_business']
-                first_capacity = aircraft['capacity_first']
-                
-                eco_demand = min(eco_demand, eco_capacity)
-                business_demand = min(business_demand, business_capacity)
-                first_demand = min(first_demand, first_capacity)
-                
-                # Assume average ticket prices
-                eco_price = distance * 0.1  # $0.1 per km
-                business_price = distance * 0.3  # $0.3 per km
-                first_price = distance * 0.5  # $0.5 per km
-                
-                revenue = (eco_demand * eco_price) + (business_demand * business_price) + (first_demand * first_price)
-                
-                # Calculate profit
-                profit = revenue - (fuel_cost + maintenance_cost)
-                
-                # Add profitability data to route
-                route['estimated_profit'] = profit
-                route['flight_time_hours'] = flight_time_hours
-                route['fuel_cost'] = fuel_cost
-                route['maintenance_cost'] = maintenance_cost
-                route['estimated_revenue'] = revenue
+                'error': 'Invalid parameters',
+                'message': 'limit and offset must be integers'
+            }), 400
             
-            potential_routes.append(route)
+        if limit < 1 or limit > MAX_RECOMMEND_LIMIT or offset < 0 or offset > MAX_RECOMMEND_OFFSET:
+            return jsonify({
+                'error': 'Invalid parameters',
+                'message': f'limit must be between 1 and {MAX_RECOMMEND_LIMIT} and offset between 0 and {MAX_RECOMMEND_OFFSET}'
+            }), 400
             
-        # Sort routes by profitability if aircraft is specified, otherwise by demand
-        if aircraft:
-            sorted_routes = sorted(potential_routes, key=lambda x: x['estimated_profit'], reverse=True)
-        else:
-            sorted_routes = sorted(potential_routes, key=lambda x: x['demand_economy'], reverse=True)
-        
-        return jsonify({
-            'hub': hub_airport.data[0],
-            'aircraft': aircraft,
-            'recommended_routes': sorted_routes[:20]  # Return top 20 routes
-        }), 200
+        # Results depend only on the parameters and the reference catalogs
+        return result_cache.respond(
+            ('routes.recommend', hub, aircraft_id, limit, offset, sort, reference_data.snapshot_tag()),
+            lambda: recommend_routes_from(hub, aircraft_id, limit, offset, sort)
+        )
             
     except Exception as e:
         return jsonify({
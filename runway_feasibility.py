@@ -0,0 +1,51 @@
+import numpy as np
+
+
+class RunwayFeasibility:
+    """One bitset per aircraft type marking the airports whose runway it can use.
+
+    Row ``i`` belongs to the ``i``-th aircraft of the catalog and bit ``j`` of
+    it to the ``j``-th airport, packed eight airports to a byte. An airport or
+    aircraft with no runway figure is never feasible. Aircraft feasible at
+    both ends of a route come from ANDing two bit columns, and the airports an
+    aircraft can reach from a hub from ANDing its row with a range mask.
+    """
+
+    def __init__(self, runway_length, required_runway_length):
+        runway_length = np.asarray(runway_length, dtype=np.float64)
+        required = np.asarray(required_runway_length, dtype=np.float64)
+        self.airports = len(runway_length)
+        self.bits = np.zeros((len(required), (self.airports + 7) // 8), dtype=np.uint8)
+        # One row at a time, so building never needs a full boolean matrix
+        for i, needed in enumerate(required):
+            self.bits[i] = np.packbits(runway_length >= needed)
+
+    @classmethod
+    def from_catalogs(cls, airports, aircraft_columns):
+        return cls(airports.column('runway_length'), aircraft_columns.required_runway_length)
+
+    def __len__(self):
+        return len(self.bits)
+
+    def airports_for(self, aircraft_index):
+        """Boolean mask of the airports the aircraft can use"""
+        return np.unpackbits(self.bits[aircraft_index], count=self.airports).astype(bool)
+
+    def aircraft_at(self, airport_indexes):
+        """Boolean aircraft x airport matrix for the given airport indexes.
+
+        Negative indexes stand for unknown airports and are never feasible.
+        """
+        airport_indexes = np.asarray(airport_indexes, dtype=np.intp)
+        known = airport_indexes >= 0
+        j = np.where(known, airport_indexes, 0)
+        bytes_ = self.bits[:, j >> 3]
+        feasible = ((bytes_ >> (7 - (j & 7)).astype(np.uint8)) & 1).astype(bool)
+        return feasible & known
+
+    def aircraft_for_routes(self, origin_indexes, destination_indexes):
+        """Boolean aircraft x route matrix of runway feasibility at both ends"""
+        return self.aircraft_at(origin_indexes) & self.aircraft_at(destination_indexes)
+
+    def nbytes(self):
+        return self.bits.nbytes
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import threading
+import time
+
+from src.metrics import record_coalesced
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Directory of lock files that extends coalescing across the workers on a
+# host; unset keeps it per worker
+SINGLE_FLIGHT_LOCK_DIR = os.getenv('SINGLE_FLIGHT_LOCK_DIR')
+
+# Longest a caller waits for another's computation before running its own (seconds)
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', '30'))
+
+
+class _Call:
+    """One in-flight computation and the callers waiting for it"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run a computation once for concurrent callers with the same key.
+
+    The first caller for a key runs it; callers arriving meanwhile wait and
+    share its result or exception. With a lock directory the leaders of
+    different workers also take turns on a lock file for the key, and
+    ``recheck`` lets one that waited pick up a result another worker stored
+    in the meantime. The lock file is removed when its leader finishes.
+    """
+
+    def __init__(self, lock_dir=SINGLE_FLIGHT_LOCK_DIR, timeout=SINGLE_FLIGHT_TIMEOUT):
+        self.lock_dir = lock_dir
+        self.timeout = timeout
+        self.leaders = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, recheck=None):
+        """Result of ``fn()``, shared with concurrent callers for ``key``"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            record_coalesced()
+            # A stuck leader must not hold up every later request
+            if not call.done.wait(self.timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run(key, fn, recheck)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _lock_path(self, key):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.lock_dir, f'flight-{digest}.lock')
+
+    def _run(self, key, fn, recheck):
+        if self.lock_dir is None or fcntl is None:
+            return fn()
+        path = self._lock_path(key)
+        try:
+            os.makedirs(self.lock_dir, exist_ok=True)
+            lock, waited = self._lock_file(path)
+        except OSError:
+            return fn()
+        if lock is None:
+            return fn()
+
+        with lock:
+            try:
+                if waited and recheck is not None:
+                    result = recheck()
+                    if result is not None:
+                        return result
+                return fn()
+            finally:
+                # Remove the file before unlocking; workers blocked on it
+                # notice and move to a fresh one
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _lock_file(self, path):
+        """Open and lock the file at ``path``.
+
+        Returns the open file and whether another worker held the lock first,
+        or ``(None, waited)`` on timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            lock = open(path, 'a')
+            acquired = self._acquire(lock, deadline)
+            if acquired is None:
+                lock.close()
+                return None, waited
+            waited = waited or acquired
+            # The previous holder may have removed the file while we waited
+            try:
+                current = os.path.samestat(os.fstat(lock.fileno()), os.stat(path))
+            except FileNotFoundError:
+                current = False
+            if current:
+                return lock, waited
+            lock.close()
+            waited = True
+
+    def _acquire(self, lock, deadline):
+        """Take the file lock; True if another worker held it, None on timeout"""
+        waited = False
+        while True:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return waited
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return None
+                waited = True
+                time.sleep(0.005)
+
+    def stats(self):
+        return {
+            'in_flight': len(self._calls),
+            'leaders': self.leaders,
+            'coalesced': self.coalesced,
+            'cross_worker': self.lock_dir is not None
+        }
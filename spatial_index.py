@@ -0,0 +1,131 @@
+import math
+
+import numpy as np
+
+from src.geodesy import EARTH_RADIUS_KM, pair_distances
+
+# Size of a grid cell in degrees of latitude and longitude
+CELL_DEGREES = 5.0
+
+# Largest possible great-circle distance
+HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+class AirportGrid:
+    """Latitude/longitude cell grid over airport coordinates.
+
+    Range queries visit only the cells overlapping the bounding box of the
+    search circle, then filter those candidates by exact great-circle
+    distance. Indexes refer to positions in the coordinates the grid was
+    built from (the same order as ``reference_data.airports()``).
+    """
+
+    def __init__(self, coordinates, cell_degrees=CELL_DEGREES):
+        self.coordinates = coordinates
+        self.cell = math.radians(cell_degrees)
+        self.lat_cells = int(math.ceil(math.pi / self.cell))
+        self.lon_cells = int(math.ceil(2 * math.pi / self.cell))
+
+        lat_idx, lon_idx = self._cells(coordinates.lat, coordinates.lon)
+        order = np.lexsort((lon_idx, lat_idx))
+        keys = lat_idx[order] * self.lon_cells + lon_idx[order]
+        boundaries = np.flatnonzero(np.diff(keys)) + 1
+        self.buckets = {
+            int(keys[group[0]]): order[group]
+            for group in np.split(np.arange(len(keys)), boundaries) if len(group)
+        }
+
+    def _cells(self, lat, lon):
+        lat_idx = np.clip(((lat + math.pi / 2) / self.cell).astype(np.intp), 0, self.lat_cells - 1)
+        lon_idx = np.clip(((lon + math.pi) / self.cell).astype(np.intp), 0, self.lon_cells - 1)
+        return lat_idx, lon_idx
+
+    def _candidates(self, lat, lon, angle):
+        """Indexes in cells overlapping the bounding box of the search cap"""
+        lat_min = lat - angle
+        lat_max = lat + angle
+        if angle >= math.pi / 2 or lat_min <= -math.pi / 2 or lat_max >= math.pi / 2:
+            # The cap contains a pole or a whole hemisphere, so it spans every longitude
+            lon_ranges = [(0, self.lon_cells - 1)]
+        else:
+            dlon = math.asin(min(1.0, math.sin(angle) / math.cos(lat)))
+            first = int((lon - dlon + math.pi) // self.cell)
+            last = int((lon + dlon + math.pi) // self.cell)
+            if last - first + 1 >= self.lon_cells:
+                lon_ranges = [(0, self.lon_cells - 1)]
+            else:
+                first %= self.lon_cells
+                last %= self.lon_cells
+                if first <= last:
+                    lon_ranges = [(first, last)]
+                else:
+                    lon_ranges = [(first, self.lon_cells - 1), (0, last)]
+
+        lat_first = max(0, int((lat_min + math.pi / 2) // self.cell))
+        lat_last = min(self.lat_cells - 1, int((lat_max + math.pi / 2) // self.cell))
+
+        found = []
+        for lat_cell in range(lat_first, lat_last + 1):
+            for first, last in lon_ranges:
+                for lon_cell in range(first, last + 1):
+                    bucket = self.buckets.get(lat_cell * self.lon_cells + lon_cell)
+                    if bucket is not None:
+                        found.append(bucket)
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(found)
+
+    def within(self, lat, lon, radius_km):
+        """Indexes and distances of airports within ``radius_km`` of a point.
+
+        ``lat``/``lon`` are in degrees. Results are sorted by distance.
+        """
+        lat = math.radians(lat)
+        lon = math.radians(lon)
+        angle = min(radius_km, HALF_CIRCUMFERENCE_KM) / EARTH_RADIUS_KM
+        candidates = self._candidates(lat, lon, angle)
+        distances = pair_distances(
+            lat, lon,
+            self.coordinates.lat[candidates], self.coordinates.lon[candidates]
+        )
+        keep = distances <= radius_km
+        candidates = candidates[keep]
+        distances = distances[keep]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    def nearest(self, lat, lon, k, max_radius_km=HALF_CIRCUMFERENCE_KM):
+        """Indexes and distances of the ``k`` airports closest to a point"""
+        # Grow the search radius until it holds k airports. Everything outside
+        # the radius is farther than everything inside, so the first k inside
+        # are the k nearest.
+        radius = min(math.degrees(self.cell) * 111.0, max_radius_km)
+        while True:
+            indexes, distances = self.within(lat, lon, radius)
+            if len(indexes) >= k or radius >= max_radius_km:
+                return indexes[:k], distances[:k]
+            radius = min(radius * 2, max_radius_km)
+
+
+def airports_near(grid, airport, radius_km=None, k=None):
+    """Airports within ``radius_km`` and/or the ``k`` nearest, excluding ``airport``.
+
+    Returns ``(indexes, distances)`` sorted by distance.
+    """
+    lat, lon = airport['latitude'], airport['longitude']
+    origin = grid.coordinates.index.get(airport['code'])
+    extra = 1 if origin is not None else 0
+
+    if k is not None:
+        indexes, distances = grid.nearest(
+            lat, lon, k + extra,
+            max_radius_km=HALF_CIRCUMFERENCE_KM if radius_km is None else radius_km
+        )
+    else:
+        indexes, distances = grid.within(lat, lon, radius_km)
+
+    keep = indexes != origin if origin is not None else slice(None)
+    indexes, distances = indexes[keep], distances[keep]
+    if k is not None:
+        indexes, distances = indexes[:k], distances[:k]
+    return indexes, distances
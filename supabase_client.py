@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+
+import httpx
+from supabase import ClientOptions, create_client
+
+from src.metrics import upstream_finished, upstream_started
+from src.request_timing import record_upstream_call, upstream_call
+
+# Connection pool and timeout settings for the shared HTTP transport
+SUPABASE_MAX_CONNECTIONS = int(os.getenv('SUPABASE_MAX_CONNECTIONS', '20'))
+SUPABASE_KEEPALIVE_CONNECTIONS = int(os.getenv('SUPABASE_KEEPALIVE_CONNECTIONS', '10'))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv('SUPABASE_KEEPALIVE_EXPIRY', '60'))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv('SUPABASE_CONNECT_TIMEOUT', '3'))
+SUPABASE_READ_TIMEOUT = float(os.getenv('SUPABASE_READ_TIMEOUT', '10'))
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+SUPABASE_HTTP2 = os.getenv('SUPABASE_HTTP2', 'False').lower() in ('true', '1', 't')
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """HTTP transport that counts calls, in-flight requests and errors"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_seconds = 0.0
+
+    def handle_request(self, request):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        upstream_started()
+        failed = False
+        started = time.perf_counter()
+        try:
+            return super().handle_request(request)
+        except Exception:
+            failed = True
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                self.in_flight -= 1
+                self.total_seconds += ended - started
+            call, _ = upstream_call(request.method, request.url.path, '')
+            upstream_finished(call, ended - started, failed)
+            record_upstream_call(request.method, request.url.path, request.url.query.decode(), started, ended)
+
+    def stats(self):
+        connections = getattr(self._pool, 'connections', [])
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'total_seconds': round(self.total_seconds, 3),
+            'open_connections': len(connections),
+            'idle_connections': sum(1 for c in connections if c.is_idle()),
+            'max_connections': SUPABASE_MAX_CONNECTIONS,
+            'max_keepalive_connections': SUPABASE_KEEPALIVE_CONNECTIONS
+        }
+
+
+def create_http_client():
+    """Keep-alive HTTP client shared by the PostgREST and GoTrue clients"""
+    transport = InstrumentedTransport(
+        http2=SUPABASE_HTTP2,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY
+        )
+    )
+    client = httpx.Client(
+        transport=transport,
+        timeout=httpx.Timeout(
+            SUPABASE_READ_TIMEOUT,
+            connect=SUPABASE_CONNECT_TIMEOUT,
+            pool=SUPABASE_CONNECT_TIMEOUT
+        )
+    )
+    return client, transport
+
+
+class ManagedSupabase:
+    """Per-process Supabase client created on first use.
+
+    Attribute access is forwarded to the real client, so this can stand in
+    for the module-level ``supabase`` object. The client and its connection
+    pool are created lazily in each process, so workers forked from a
+    preloaded master never share sockets.
+    """
+
+    def __init__(self, url, key):
+        self._url = url
+        self._key = key
+        self._lock = threading.Lock()
+        self._pid = None
+        self._client = None
+        self._transport = None
+
+    def get_client(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    http_client, transport = create_http_client()
+                    self._client = create_client(
+                        self._url,
+                        self._key,
+                        options=ClientOptions(httpx_client=http_client)
+                    )
+                    self._transport = transport
+                    self._pid = os.getpid()
+        return self._client
+
+    def reset(self, url=None, key=None):
+        """Drop this process's client, optionally pointing at another project"""
+        with self._lock:
+            self._url = url or self._url
+            self._key = key or self._key
+            self._pid = None
+            self._client = None
+            self._transport = None
+            # Forget client attributes pinned on the wrapper, e.g. by test patches
+            for name in [name for name in vars(self) if not name.startswith('_')]:
+                delattr(self, name)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get_client(), name)
+
+    def pool_stats(self):
+        """Connection pool usage for this process, or None before first use"""
+        if self._pid != os.getpid() or self._transport is None:
+            return None
+        return self._transport.stats()
@@ -0,0 +1,65 @@
+import itertools
+
+import pytest
+from src.aircraft_index import AircraftIndex
+from src.benchmarks.synthetic import generate
+from src.columnar import ColumnarTable
+
+def brute_force(aircraft, manufacturer, category, min_range, max_range, aircraft_type):
+    keep = []
+    for i, a in enumerate(aircraft):
+        if manufacturer and a['manufacturer'] != manufacturer:
+            continue
+        if category and a['category'] != category:
+            continue
+        if min_range is not None and not (a['range_km'] is not None and a['range_km'] >= min_range):
+            continue
+        if max_range is not None and not (a['range_km'] is not None and a['range_km'] <= max_range):
+            continue
+        if aircraft_type == 'cargo' and not (a['cargo_capacity'] or 0) > 0:
+            continue
+        if aircraft_type == 'pax' and not (a['capacity_eco'] or 0) > 0:
+            continue
+        keep.append(i)
+    return keep
+
+def test_select_matches_brute_force():
+    """Test every filter combination returns the positions a full scan finds"""
+    aircraft = sorted(generate(airports=10, aircraft=120, routes=1, seed=11)['aircraft'], key=lambda a: a['id'])
+    aircraft[3]['range_km'] = None
+    index = AircraftIndex(ColumnarTable(aircraft, key='id'))
+    manufacturers = sorted({a['manufacturer'] for a in aircraft})[:2] + ['Nobody']
+    categories = sorted({a['category'] for a in aircraft})[:2]
+
+    for combination in itertools.product(
+        [None] + manufacturers, [None] + categories, [None, 5000], [None, 9000], [None, 'pax', 'cargo', 'other']
+    ):
+        assert index.select(*combination).tolist() == brute_force(aircraft, *combination)
+
+def test_after_skips_earlier_ids():
+    """Test keyset paging starts after the given id"""
+    aircraft = [{'id': i, 'range_km': i * 100} for i in (2, 5, 9, 12)]
+    index = AircraftIndex(ColumnarTable(aircraft, key='id'))
+    positions = index.select()
+    assert index.after(positions, 5).tolist() == [2, 3]
+    assert index.after(positions, 4).tolist() == [1, 2, 3]
+    assert index.after(positions, None).tolist() == [0, 1, 2, 3]
+
+@pytest.fixture
+def client(seeded_client):
+    client = seeded_client(airports=10, aircraft=60, routes=1, seed=12, tables={'aircraft'})
+    client.aircraft = sorted(client.data['aircraft'], key=lambda a: a['id'])
+    return client
+
+def test_filter_pages_through_index(client):
+    """Test the filter endpoint pages through exactly the matching aircraft"""
+    expected = [client.aircraft[i]['id'] for i in brute_force(client.aircraft, None, None, 3000, None, 'pax')]
+    seen = []
+    after = ''
+    while True:
+        body = client.get(f'/api/aircraft/filter?min_range=3000&type=pax&limit=7&after_id={after}').get_json()
+        seen += [a['id'] for a in body['aircraft']]
+        if body['next_after_id'] is None:
+            break
+        after = body['next_after_id']
+    assert seen == expected
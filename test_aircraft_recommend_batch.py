@@ -0,0 +1,85 @@
+import pytest
+from src.routes.aircraft import MAX_BATCH_ROUTES
+
+@pytest.fixture
+def client(seeded_client, counting_store):
+    # Routes 1-3 belong to airline 1, the rest to airline 2
+    client = seeded_client(airports=30, aircraft=10, routes=6, seed=4, store=counting_store,
+                           route_airline=lambda route_id: 1 if route_id <= 3 else 2)
+    # A route whose destination is not in the catalog
+    client.store.insert('routes', dict(client.data['routes'][0], id=99, destination_airport_code='ZZZ'))
+    return client
+
+def batch(client, route_ids):
+    response = client.post('/api/aircraft/recommend/batch', json={'route_ids': route_ids})
+    return response.status_code, response.get_json()
+
+def test_batch_matches_the_single_endpoint(client):
+    """Test every batch entry equals the single-route response, in request order"""
+    status, body = batch(client, [5, 2, 4])
+    assert status == 200
+    assert body['missing_route_ids'] == []
+    for route_id, entry in zip([5, 2, 4], body['recommendations']):
+        single = client.get(f'/api/aircraft/recommend?route_id={route_id}').get_json()
+        assert entry == single
+
+def test_comma_form_matches_the_post_form(client):
+    """Test GET with comma-separated ids answers like POST /recommend/batch"""
+    response = client.get('/api/aircraft/recommend?route_id=1,3,,42')
+    assert response.status_code == 200
+    assert response.get_json() == batch(client, [1, 3, 42])[1]
+
+def test_unknown_ids_are_reported_as_missing(client):
+    """Test ids with no route are listed in missing_route_ids, not as errors"""
+    status, body = batch(client, [42, 1, 43])
+    assert status == 200
+    assert body['missing_route_ids'] == [42, 43]
+    assert [entry['route']['id'] for entry in body['recommendations']] == [1]
+
+def test_other_airlines_routes_are_answered_like_the_single_endpoint(client):
+    """Test ids of another airline's routes get the same answer as GET /recommend"""
+    status, body = batch(client, [1, 5])
+    assert status == 200
+    assert [entry['route']['airline_id'] for entry in body['recommendations']] == [1, 2]
+    assert body['recommendations'][1] == client.get('/api/aircraft/recommend?route_id=5').get_json()
+
+def test_duplicates_are_answered_each_time_with_one_query(client):
+    """Test repeated ids keep their positions but the routes are read once"""
+    client.store.statements.clear()
+    status, body = batch(client, [2, 2, 1, 2])
+    assert status == 200
+    assert [entry['route']['id'] for entry in body['recommendations']] == [2, 2, 1, 2]
+    assert body['recommendations'][0] == body['recommendations'][1]
+    assert client.store.count('select', 'routes') == 1
+
+def test_unknown_airport_is_reported_per_route(client):
+    """Test a route with an unknown airport fails alone rather than the whole batch"""
+    status, body = batch(client, [99, 1])
+    assert status == 200
+    assert body['recommendations'][0]['error'] == 'Airport not found'
+    assert 'recommended_aircraft' in body['recommendations'][1]
+    assert client.get('/api/aircraft/recommend?route_id=99').status_code == 404
+
+def test_batch_size_limit(client):
+    """Test MAX_BATCH_ROUTES ids are accepted and one more is rejected"""
+    status, body = batch(client, list(range(1, MAX_BATCH_ROUTES + 1)))
+    assert status == 200
+    assert len(body['recommendations']) + len(body['missing_route_ids']) == MAX_BATCH_ROUTES
+
+    status, body = batch(client, list(range(1, MAX_BATCH_ROUTES + 2)))
+    assert status == 400
+    assert body['error'] == 'Too many routes'
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'route_ids': []},
+    {'route_ids': '1,2'},
+    {'route_ids': [1, 'x']},
+    {'route_ids': [1.7]},
+    {'route_ids': [True]},
+    {'route_ids': [None]}
+])
+def test_invalid_batches_are_rejected(client, payload):
+    """Test missing, empty, non-list, non-integer, float and boolean ids return 400"""
+    response = client.post('/api/aircraft/recommend/batch', json=payload)
+    assert response.status_code == 400
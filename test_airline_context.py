@@ -0,0 +1,76 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import g, session
+from src.main import app, supabase
+from src.airline_context import AirlineCache, airline_cache, current_airline, require_airline
+from src.repositories.stores import MemoryStore
+
+def test_cache_hit_and_invalidate():
+    """Test a stored airline is returned until it is invalidated"""
+    cache = AirlineCache(ttl=60, max_size=10)
+    assert cache.get('u1') is None
+    cache.set('u1', {'id': 1})
+    assert cache.get('u1') == {'id': 1}
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.invalidate('u1')
+    assert cache.get('u1') is None
+
+def test_cache_entries_expire():
+    """Test entries older than the TTL are misses"""
+    cache = AirlineCache(ttl=0.05, max_size=10)
+    cache.set('u1', {'id': 1})
+    time.sleep(0.06)
+    assert cache.get('u1') is None
+
+def test_cache_evicts_least_recently_used():
+    """Test the size bound drops the entry used longest ago"""
+    cache = AirlineCache(ttl=60, max_size=2)
+    cache.set('u1', {'id': 1})
+    cache.set('u2', {'id': 2})
+    cache.get('u1')
+    cache.set('u3', {'id': 3})
+    assert cache.get('u2') is None
+    assert cache.get('u1') == {'id': 1}
+    assert cache.get('u3') == {'id': 3}
+
+@pytest.fixture
+def store(use_store):
+    store = MemoryStore()
+    store.insert('airlines', {'id': 1, 'user_id': 'u1', 'name': 'Test Air', 'balance': 100})
+    return use_store(store)
+
+def test_airline_is_resolved_once_per_request(store):
+    """Test repeated lookups in one request reuse g instead of the cache"""
+    lookups = airline_cache.hits + airline_cache.misses
+    with app.test_request_context():
+        session['user'] = {'id': 'u1'}
+        assert current_airline()['name'] == 'Test Air'
+        assert current_airline() is g.airline
+    assert airline_cache.hits + airline_cache.misses == lookups + 1
+
+def test_require_airline(store):
+    """Test the decorator answers 401 and 404 and sets g for the view"""
+    view = require_airline(lambda: g.airline['id'])
+    with app.test_request_context():
+        assert view()[1] == 401
+    with app.test_request_context():
+        session['user'] = {'id': 'nobody'}
+        assert view()[1] == 404
+    with app.test_request_context():
+        session['user'] = {'id': 'u1'}
+        assert view() == 1
+        assert g.user == {'id': 'u1'}
+
+def test_current_user_reads_the_airline_fresh(store, monkeypatch):
+    """Test /api/auth/user shows an airline change made outside the app at once"""
+    user = SimpleNamespace(id='u1', email='u1@example.com')
+    monkeypatch.setattr(supabase, 'auth', SimpleNamespace(get_user=lambda token: SimpleNamespace(user=user)))
+    client = app.test_client()
+    with client.session_transaction() as s:
+        s['user'] = {'id': 'u1', 'access_token': 'token'}
+
+    assert client.get('/api/auth/user').get_json()['airline']['balance'] == 100
+    store.update('airlines', {'balance': 250}, where=[('id', 'eq', 1)])
+    assert client.get('/api/auth/user').get_json()['airline']['balance'] == 250
@@ -0,0 +1,37 @@
+import tempfile
+
+import src.repositories
+from src.benchmarks.synthetic import generate
+from src.benchmarks.run import compare, run
+from src.reference_data import reference_data
+from src.repositories import Repositories
+from src.repositories.stores import MemoryStore
+
+def test_synthetic_dataset_is_deterministic():
+    """Test the generator returns the same world for the same seed"""
+    first = generate(airports=50, aircraft=8, routes=40, seed=3)
+    second = generate(airports=50, aircraft=8, routes=40, seed=3)
+
+    assert first == second
+    assert len({a['code'] for a in first['airports']}) == 50
+    assert all(r['origin_airport_code'] != r['destination_airport_code'] for r in first['routes'])
+    assert any(a['category'] == 'cargo' and a['capacity_eco'] == 0 for a in first['aircraft'])
+
+def test_benchmark_suite_runs_every_kernel(monkeypatch, tmp_path):
+    """Test a tiny run times each kernel and can be compared to itself"""
+    serving = Repositories(MemoryStore())
+    monkeypatch.setattr(src.repositories, '_repositories', serving)
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    matrix_dir = reference_data.matrix_dir
+    results = run(airports=60, aircraft=12, routes=300, repeat=1, warmup=0)
+
+    # The in-memory dataset and its matrix directory are gone afterwards
+    assert src.repositories._repositories is serving
+    assert reference_data.matrix_dir == matrix_dir
+    assert list(tmp_path.iterdir()) == []
+
+    assert results['dataset']['routes'] == 300
+    assert {'haversine.hub_to_all', 'recommend_aircraft.rank_batch', 'json.routes',
+            'filter_aircraft.category'} <= set(results['kernels'])
+    assert all(k['median_ms'] >= 0 for k in results['kernels'].values())
+    assert 'x1.00' in compare(results, results)
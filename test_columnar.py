@@ -0,0 +1,79 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+from src.main import app
+from src.columnar import ColumnarTable, DictionaryColumn, PackedTextColumn
+
+AIRPORTS = [
+    {'code': 'JFK', 'name': 'John F Kennedy', 'country': 'USA', 'runway_length': 4423, 'latitude': 40.64, 'longitude': -73.78},
+    {'code': 'LHR', 'name': 'Heathrow', 'country': 'UK', 'runway_length': 3902, 'latitude': 51.47, 'longitude': -0.45},
+    {'code': 'BOS', 'name': 'Logan', 'country': 'USA', 'runway_length': None, 'latitude': 42.36, 'longitude': -71.01}
+]
+
+def test_rows_read_back_unchanged():
+    """Test row views equal the source dicts, including nulls and mixed numbers"""
+    rows = AIRPORTS + [{'code': 'ZRH', 'name': 'Zürich', 'country': 'CH', 'runway_length': 3700,
+                        'latitude': 47, 'longitude': 8.55}]
+    table = ColumnarTable(rows, key='code')
+    assert len(table) == 4
+    assert [dict(row) for row in table] == rows
+    assert table.to_dicts() == rows
+    assert type(table[3]['latitude']) is int and type(table[0]['latitude']) is float
+    assert table[-1]['name'] == 'Zürich'
+    assert table.get('LHR') == AIRPORTS[1]
+    assert table.get('XXX') is None and table.get(None) is None
+    assert table.positions(['ZRH', 'XXX', 'JFK']).tolist() == [3, -1, 0]
+
+def test_null_keys_are_not_indexed():
+    """Test rows without a key stay readable but cannot be looked up"""
+    for rows, key in (
+        ([{'id': 3}, {'id': None}, {'id': 1}], 'id'),
+        ([{'code': 'JFK'}, {'code': None}, {'code': 'BOS'}], 'code'),
+        ([{'id': None}, {'id': None}], 'id')
+    ):
+        table = ColumnarTable(rows, key=key)
+        assert table.to_dicts() == rows
+        assert table.get(None) is None
+        keys = [row[key] for row in rows if row[key] is not None]
+        assert [table.position(k) for k in keys] == [i for i, row in enumerate(rows) if row[key] is not None]
+
+def test_mixed_key_column_is_rejected():
+    """Test a key column mixing integers and strings fails with a clear error"""
+    with pytest.raises(ValueError, match='only strings or only integers'):
+        ColumnarTable([{'id': 1}, {'id': 'two'}], key='id')
+    with pytest.raises(ValueError, match='float'):
+        ColumnarTable([{'id': 1}, {'id': 2.5}], key='id')
+
+def test_text_encoding_depends_on_cardinality():
+    """Test repeated strings are dictionary encoded and unique ones packed"""
+    rows = [dict(AIRPORTS[i % 3], code=f'A{i:02d}') for i in range(12)]
+    table = ColumnarTable(rows, key='code')
+    assert isinstance(table._columns['country'], DictionaryColumn)
+    assert isinstance(table._columns['code'], PackedTextColumn)
+
+def test_vectorized_filters():
+    """Test masks computed on the columns match row-by-row filtering"""
+    table = ColumnarTable(AIRPORTS, key='code')
+    assert table.equals('country', 'USA').tolist() == [True, False, True]
+    assert table.equals('code', 'LHR').tolist() == [False, True, False]
+    assert table.equals('country', 'FR').tolist() == [False, False, False]
+    assert table.between('runway_length', low=4000).tolist() == [True, False, False]
+    assert np.isnan(table.column('runway_length')[2])
+    assert [row['code'] for row in table.take(np.flatnonzero(table.between('runway_length', high=4000)))] == ['LHR']
+
+def test_rows_serialize_as_objects():
+    """Test the JSON provider and content tags treat row views as dicts"""
+    table = ColumnarTable(AIRPORTS, key='code')
+    assert json.loads(app.json.dumps({'airport': table[0], 'all': table})) == {'airport': AIRPORTS[0], 'all': AIRPORTS}
+
+def test_columns_use_less_memory_than_dicts():
+    """Test a table of distinct airports is several times smaller than its dicts"""
+    rows = [
+        {'code': f'{i:05d}', 'name': f'Airport {i}', 'country': f'C{i % 50}', 'runway_length': 2000 + i % 3000,
+         'latitude': i * 1e-3, 'longitude': -i * 1e-3}
+        for i in range(5000)
+    ]
+    dict_bytes = sum(sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values()) for row in rows)
+    assert ColumnarTable(rows, key='code').nbytes() * 5 < dict_bytes
@@ -133,6 +133,17 @@ def test_mock_aircraft_recommendation(client, monkeypatch):
     class MockAirportSelect:
         def eq(self, field, value):
             return MockAirportExecute(value)
+        
+        def order(self, field):
+            return self
+        
+        def range(self, start, end):
+            return self
+        
+        def execute(self):
+            response = MockAirportResponse("JFK")
+            response.data += MockAirportResponse("LAX").data
+            return response
     
     class MockAirportExecute:
         def __init__(self, code):
@@ -144,6 +155,15 @@ def test_mock_aircraft_recommendation(client, monkeypatch):
     class MockAircraftSelect:
         def gte(self, field, value):
             return MockAircraftExecute()
+        
+        def order(self, field):
+            return self
+        
+        def range(self, start, end):
+            return self
+        
+        def execute(self):
+            return MockAircraftResponse()
     
     class MockAircraftExecute:
         def execute(self):
@@ -164,9 +184,11 @@ def test_mock_aircraft_recommendation(client, monkeypatch):
     def mock_table(name):
         return MockTable(name)
     
-    # Apply the monkeypatch
+    # Apply the monkeypatch and drop any cached reference data
     from src.main import supabase
+    from src.reference_data import reference_data
     monkeypatch.setattr(supabase, "table", mock_table)
+    reference_data.invalidate()
     
     # Test the aircraft recommendation endpoint
     response = client.get('/api/aircraft/recommend?route_id=1')
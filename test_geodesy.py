@@ -0,0 +1,57 @@
+import math
+import pytest
+from src.geodesy import AirportCoordinates, haversine_km
+
+AIRPORTS = [
+    {"code": "JFK", "latitude": 40.6413, "longitude": -73.7781},
+    {"code": "LAX", "latitude": 33.9416, "longitude": -118.4085},
+    {"code": "LHR", "latitude": 51.4700, "longitude": -0.4543},
+]
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    """Reference implementation matching the original per-airport loop"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+def test_haversine_matches_scalar_formula():
+    """Test the shared haversine matches the original formula"""
+    jfk, lax = AIRPORTS[0], AIRPORTS[1]
+    expected = scalar_haversine(jfk['latitude'], jfk['longitude'], lax['latitude'], lax['longitude'])
+
+    assert haversine_km(jfk['latitude'], jfk['longitude'], lax['latitude'], lax['longitude']) == pytest.approx(expected)
+
+def test_distances_from_hub():
+    """Test hub-to-all distances are aligned with the airport list"""
+    coordinates = AirportCoordinates.from_airports(AIRPORTS)
+    distances = coordinates.distances_from(coordinates.index['JFK'])
+
+    assert distances[0] == pytest.approx(0.0)
+    for i, airport in enumerate(AIRPORTS):
+        expected = scalar_haversine(40.6413, -73.7781, airport['latitude'], airport['longitude'])
+        assert distances[i] == pytest.approx(expected)
+
+def test_distances_between_pairs():
+    """Test batched distances for arbitrary origin/destination pairs"""
+    coordinates = AirportCoordinates.from_airports(AIRPORTS)
+    distances = coordinates.distances_between([0, 1, 2], [1, 2, 0])
+
+    assert len(distances) == 3
+    assert distances[0] == pytest.approx(haversine_km(40.6413, -73.7781, 33.9416, -118.4085))
+    assert distances[2] == pytest.approx(haversine_km(51.4700, -0.4543, 40.6413, -73.7781))
+
+def test_distance_matrix_incremental_rebuild(tmp_path):
+    """Test the persisted matrix matches direct computation after airports are added"""
+    from src.distance_matrix import load_or_build
+
+    first = load_or_build(AirportCoordinates.from_airports(AIRPORTS[:2]), str(tmp_path))
+    assert first.distance('JFK', 'LAX') == pytest.approx(haversine_km(40.6413, -73.7781, 33.9416, -118.4085), rel=1e-5)
+
+    extended = AIRPORTS + [{"code": "NRT", "latitude": 35.7720, "longitude": 140.3929}]
+    coordinates = AirportCoordinates.from_airports(extended)
+    matrix = load_or_build(coordinates, str(tmp_path))
+
+    assert matrix.version != first.version
+    for i, code in enumerate(coordinates.codes):
+        expected = coordinates.distances_from(i)
+        assert list(matrix.row(matrix.index[code])) == pytest.approx(list(expected), rel=1e-5)
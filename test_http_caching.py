@@ -0,0 +1,49 @@
+import pytest
+from src.main import app
+from src.reference_data import reference_data
+
+@pytest.fixture
+def store(use_store, counting_store):
+    for i in range(1, 4):
+        counting_store.insert('aircraft', {'id': i, 'manufacturer': 'Airbus', 'model': f'A3{i}0', 'range_km': 5000})
+    counting_store.insert('routes', {'airline_id': 1, 'origin_airport_code': 'JFK', 'destination_airport_code': 'LHR'})
+    return use_store(counting_store)
+
+def test_aircraft_catalog_revalidates_without_upstream_calls(store):
+    """Test a matching If-None-Match gets a 304 served from the cached snapshot"""
+    client = app.test_client()
+    first = client.get('/api/aircraft/')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'].startswith('public')
+
+    selects = store.count('select')
+    again = client.get('/api/aircraft/', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.headers['ETag'] == etag
+    assert again.get_data() == b''
+    assert store.count('select') == selects
+
+def test_aircraft_tags_depend_on_query_and_catalog(store):
+    """Test different pages and a changed catalog get different tags"""
+    client = app.test_client()
+    etag = client.get('/api/aircraft/').headers['ETag']
+    assert client.get('/api/aircraft/?limit=1').headers['ETag'] != etag
+    assert client.get('/api/aircraft/1').headers['ETag'] != client.get('/api/aircraft/2').headers['ETag']
+
+    store.update('aircraft', {'range_km': 6000}, where=[('id', 'eq', 1)])
+    reference_data.invalidate()
+    assert client.get('/api/aircraft/', headers={'If-None-Match': etag}).status_code == 200
+
+def test_route_etag_follows_row_content(store):
+    """Test a route revalidates to 304 until the row changes"""
+    client = app.test_client()
+    first = client.get('/api/routes/1')
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert client.get('/api/routes/1', headers={'If-None-Match': etag}).status_code == 304
+
+    store.update('routes', {'demand_economy': 250}, where=[('id', 'eq', 1)])
+    changed = client.get('/api/routes/1', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.get_json()['route']['demand_economy'] == 250
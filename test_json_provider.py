@@ -0,0 +1,81 @@
+import datetime
+import decimal
+import gzip
+import json
+import numpy as np
+import pytest
+from src.main import app
+from src.json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+from src.compression import brotli, choose_encoding
+from src.repositories.stores import MemoryStore
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+PAYLOAD = {
+    'recommended_routes': [
+        {'destination_airport_code': 'LHR', 'estimated_profit': 12345.678901, 'distance_km': 5540},
+        {'destination_airport_code': 'CDG', 'estimated_profit': -0.1, 'distance_km': 5834}
+    ],
+    'hub': {'code': 'JFK', 'name': 'John F. Kennedy ✈'},
+    'when': datetime.date(2025, 5, 1),
+    'price': decimal.Decimal('1.50'),
+    'empty': None
+}
+
+@pytest.mark.skipif(orjson is None, reason='orjson not installed')
+def test_orjson_provider_matches_default_output():
+    """Test the fast provider produces the same JSON as Flask's default"""
+    fast, default = OrjsonProvider(app), StdlibJSONProvider(app)
+
+    assert json.loads(fast.dumps(PAYLOAD)) == json.loads(default.dumps(PAYLOAD))
+    assert list(json.loads(fast.dumps({'b': 1, 'a': 2}))) == ['a', 'b']
+    assert fast.loads('{"a": [1, 2.5]}') == {'a': [1, 2.5]}
+
+@pytest.mark.skipif(orjson is None, reason='orjson not installed')
+def test_orjson_provider_handles_numpy_and_falls_back():
+    """Test NumPy values serialize and oversized integers use the stdlib"""
+    fast = OrjsonProvider(app)
+    assert json.loads(fast.dumps({'x': np.float64(1.5), 'n': np.int64(3)})) == {'x': 1.5, 'n': 3}
+    assert json.loads(fast.dumps({'big': 2 ** 70})) == {'big': 2 ** 70}
+
+    with app.app_context():
+        response = fast.response({'big': 2 ** 70})
+    assert json.loads(response.get_data()) == {'big': 2 ** 70}
+
+def test_choose_encoding_prefers_brotli_when_available():
+    """Test Accept-Encoding negotiation honours quality values"""
+    accept = lambda value: parse_accept_header(value, Accept)
+    assert choose_encoding(accept('gzip, br')) == ('br' if brotli else 'gzip')
+    assert choose_encoding(accept('gzip;q=1.0, br;q=0')) == 'gzip'
+    assert choose_encoding(accept('identity')) is None
+    assert choose_encoding(accept('')) is None
+
+@pytest.fixture
+def catalog(use_store):
+    store = MemoryStore()
+    for i in range(1, 41):
+        store.insert('aircraft', {'id': i, 'manufacturer': 'Boeing', 'model': f'7{i:02d}', 'range_km': 9000})
+    use_store(store)
+
+def test_large_json_responses_are_compressed(catalog):
+    """Test responses above the threshold are compressed and tagged weakly"""
+    client = app.test_client()
+    plain = client.get('/api/aircraft/')
+    compressed = client.get('/api/aircraft/', headers={'Accept-Encoding': 'gzip'})
+
+    assert len(plain.get_data()) > 1024
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+
+    # The weak tag of the compressed body still revalidates
+    etag = compressed.headers['ETag']
+    assert etag.startswith('W/')
+    assert client.get('/api/aircraft/', headers={'If-None-Match': etag}).status_code == 304
+
+def test_small_responses_are_not_compressed():
+    """Test bodies under the threshold are sent as is"""
+    response = app.test_client().get('/health', headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
@@ -0,0 +1,79 @@
+import random
+import threading
+
+import httpx
+import pytest
+import src.repositories
+from src.main import supabase
+from src.airline_context import airline_cache
+from src.reference_data import reference_data
+from src.benchmarks.fake_supabase import FakeSupabase, parse_filter, seed, serve
+from src.benchmarks.load_test import Traffic, percentile, run
+from src.benchmarks.synthetic import generate
+
+@pytest.fixture
+def fake_server():
+    fake = FakeSupabase()
+    seed(fake, generate(airports=30, aircraft=5, routes=20), users=2)
+    server = serve(fake)
+    yield fake, f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+def test_parse_filter():
+    """Test PostgREST filter expressions map to store filters"""
+    assert parse_filter('eq.5') == ('eq', '5')
+    assert parse_filter('in.(1,2,3)') == ('in', ['1', '2', '3'])
+    assert parse_filter('in.("a,b",c)') == ('in', ['a,b', 'c'])
+    with pytest.raises(ValueError):
+        parse_filter('like.x%')
+
+def test_fake_server_speaks_postgrest(fake_server):
+    """Test the fake answers the query shapes the app sends"""
+    fake, url = fake_server
+    rows = httpx.get(f'{url}/rest/v1/routes', params={'select': 'id', 'id': 'in.(1,2,999)'}).json()
+    assert sorted(r['id'] for r in rows) == [1, 2]
+
+    updated = httpx.patch(f'{url}/rest/v1/routes', params={'id': 'eq.1'}, json={'demand_economy': 7}).json()
+    assert updated[0]['demand_economy'] == 7
+    assert fake.stats()['calls'] == {'GET routes': 1, 'PATCH routes': 1}
+
+def test_percentile_nearest_rank():
+    """Test percentiles pick an observed sample"""
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([], 50) is None
+
+def test_transport_errors_are_recorded_under_the_endpoint():
+    """Test a failed connection is counted against the endpoint that was requested"""
+    class Unreachable:
+        def get(self, *args, **kwargs):
+            raise httpx.ConnectError('refused')
+
+    class User:
+        client = Unreachable()
+        hub = 'AAA'
+        lock = threading.Lock()
+        route_ids = []
+
+    data = {'airports': [{'code': 'AAA'}], 'aircraft': [{'id': 1}], 'routes': [{'id': 1}]}
+    traffic = Traffic('http://unused', [User()], data, random.Random(0))
+    assert traffic.run('recommend_routes', User()) == ('GET /api/routes/recommend', None)
+    assert traffic.run('list_routes', User()) == ('GET /api/routes/', None)
+
+def test_short_load_test_has_no_errors(monkeypatch):
+    """Test a short run drives every endpoint through the real Supabase client"""
+    monkeypatch.setattr(src.repositories, '_repositories', None)
+    original_url = supabase._url
+    try:
+        results = run(rps=30, duration=1, latency_ms=0, jitter_ms=0, users=2,
+                      airports=40, aircraft=5, routes=50)
+    finally:
+        supabase.reset(url=original_url)
+        reference_data.invalidate()
+        airline_cache.clear()
+
+    assert results['errors'] == 0
+    assert results['requests'] == 30
+    assert 'GET /api/routes/recommend' in results['endpoints']
+    assert results['upstream_calls'] > 0
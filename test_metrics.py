@@ -0,0 +1,41 @@
+from src.main import app
+
+def sample(text, name, **labels):
+    """Value of one sample in Prometheus exposition text, or 0"""
+    wanted = ','.join(f'{k}="{v}"' for k, v in labels.items())
+    prefix = f'{name}{{{wanted}}}' if labels else name
+    for line in text.splitlines():
+        if line.startswith(prefix + ' '):
+            return float(line.split()[-1])
+    return 0.0
+
+def test_metrics_count_requests_by_blueprint():
+    """Test requests are counted and timed per blueprint and endpoint"""
+    client = app.test_client()
+    before = client.get('/metrics').get_data(as_text=True)
+    client.get('/api/routes/recommend')
+    after = client.get('/metrics').get_data(as_text=True)
+
+    labels = dict(blueprint='routes', endpoint='routes.recommend_routes', method='GET', status='400')
+    assert sample(after, 'http_requests_total', **labels) == sample(before, 'http_requests_total', **labels) + 1
+    count = dict(blueprint='routes', endpoint='routes.recommend_routes')
+    assert sample(after, 'http_request_duration_seconds_count', **count) >= 1
+
+def test_unmatched_urls_share_one_label():
+    """Test unknown paths do not create new label values"""
+    client = app.test_client()
+    client.get('/no/such/path/123')
+    client.get('/no/such/path/456')
+    text = client.get('/metrics').get_data(as_text=True)
+
+    assert sample(text, 'http_requests_total', blueprint='app', endpoint='unmatched', method='GET', status='404') >= 2
+    assert '/no/such/path' not in text
+
+def test_in_flight_gauge_returns_to_zero():
+    """Test the in-flight gauge is decremented after each request"""
+    client = app.test_client()
+    client.get('/health')
+    text = client.get('/metrics').get_data(as_text=True)
+
+    # Only the /metrics request itself is in flight while it renders
+    assert sample(text, 'http_requests_in_flight', blueprint='app') == 1
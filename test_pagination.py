@@ -0,0 +1,62 @@
+import pytest
+from src.main import app
+from src.repositories.stores import MemoryStore
+
+@pytest.fixture
+def client(use_store):
+    store = MemoryStore()
+    store.insert('airlines', {'id': 1, 'user_id': 'u1', 'name': 'Test Air', 'hub_airport_code': 'JFK'})
+    store.insert('airlines', {'id': 2, 'user_id': 'u2', 'name': 'Other Air', 'hub_airport_code': 'LHR'})
+    for i in range(1, 8):
+        store.insert('aircraft', {'id': i, 'manufacturer': 'Boeing' if i % 2 else 'Airbus',
+                                  'model': f'M{i}', 'range_km': 1000 * i, 'capacity_eco': 100})
+    for i in range(1, 11):
+        store.insert('routes', {'airline_id': 1 if i != 5 else 2, 'origin_airport_code': 'JFK',
+                                'destination_airport_code': 'LHR', 'distance_km': 5540})
+    use_store(store)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = {'id': 'u1'}
+    return client
+
+def collect(client, url):
+    """Follow next_after_id until the last page"""
+    rows, after_id = [], None
+    while True:
+        suffix = f'&after_id={after_id}' if after_id is not None else ''
+        body = client.get(url + suffix).get_json()
+        rows.extend(body[url.split('/')[2]])
+        after_id = body['next_after_id']
+        if after_id is None:
+            return rows
+
+def test_routes_keyset_pages_cover_airline_routes_once(client):
+    """Test route pages are id-ordered, disjoint and scoped to the airline"""
+    first = client.get('/api/routes/?limit=4').get_json()
+    assert [r['id'] for r in first['routes']] == [1, 2, 3, 4]
+    assert first['next_after_id'] == 4
+
+    ids = [r['id'] for r in collect(client, '/api/routes/?limit=4')]
+    assert ids == [1, 2, 3, 4, 6, 7, 8, 9, 10]
+
+def test_routes_field_projection_keeps_cursor(client):
+    """Test fields= narrows the columns but always returns the id"""
+    body = client.get('/api/routes/?limit=2&fields=distance_km').get_json()
+    assert body['routes'] == [{'id': 1, 'distance_km': 5540}, {'id': 2, 'distance_km': 5540}]
+
+def test_aircraft_pages_and_filter(client):
+    """Test the catalog and filter results page by id"""
+    assert [a['id'] for a in collect(client, '/api/aircraft/?limit=3')] == list(range(1, 8))
+
+    body = client.get('/api/aircraft/filter?manufacturer=Boeing&limit=2&fields=model').get_json()
+    assert body['aircraft'] == [{'id': 1, 'model': 'M1'}, {'id': 3, 'model': 'M3'}]
+    assert body['next_after_id'] == 3
+    last = client.get('/api/aircraft/filter?manufacturer=Boeing&limit=2&after_id=5').get_json()
+    assert [a['id'] for a in last['aircraft']] == [7]
+    assert last['next_after_id'] is None
+
+@pytest.mark.parametrize('query', ['limit=0', 'limit=5000', 'after_id=abc', 'fields=id,password'])
+def test_invalid_page_parameters(client, query):
+    """Test bad paging parameters are rejected"""
+    assert client.get(f'/api/routes/?{query}').status_code == 400
+    assert client.get(f'/api/aircraft/?{query}').status_code == 400
@@ -0,0 +1,36 @@
+import pytest
+from src.profitability import AircraftColumns, RouteColumns, profit_matrix
+
+AIRCRAFT = [
+    {"id": 1, "range_km": 5000, "speed_kmh": 850, "fuel_consumption": 2500, "maintenance_cost": 5000,
+     "capacity_eco": 160, "capacity_business": 16, "capacity_first": 0, "required_runway_length": 2000},
+    {"id": 2, "range_km": 12000, "speed_kmh": 900, "fuel_consumption": 7000, "maintenance_cost": 9000,
+     "capacity_eco": 300, "capacity_business": 40, "capacity_first": 8, "required_runway_length": 3000},
+]
+
+ROUTES = [
+    {"id": 1, "distance_km": 4000, "demand_economy": 200, "demand_business": 50, "demand_first": 20},
+    {"id": 2, "distance_km": 9000, "demand_economy": 120, "demand_business": 10, "demand_first": 2},
+]
+
+def scalar_profit(aircraft, route):
+    """Reference implementation matching the original per-aircraft loop"""
+    distance_km = route['distance_km']
+    flight_time_hours = distance_km / aircraft['speed_kmh']
+    fuel_cost = aircraft['fuel_consumption'] * flight_time_hours * 0.8
+    maintenance_cost = aircraft['maintenance_cost'] * flight_time_hours
+    revenue = (min(route['demand_economy'], aircraft['capacity_eco']) * distance_km * 0.1
+               + min(route['demand_business'], aircraft['capacity_business']) * distance_km * 0.3
+               + min(route['demand_first'], aircraft['capacity_first']) * distance_km * 0.5)
+    return revenue - (fuel_cost + maintenance_cost), flight_time_hours
+
+def test_profit_matrix_matches_scalar_formula():
+    """Test every cell of the matrix matches the scalar profit formula"""
+    economics = profit_matrix(AircraftColumns(AIRCRAFT), RouteColumns.from_routes(ROUTES))
+
+    assert economics['estimated_profit'].shape == (2, 2)
+    for i, aircraft in enumerate(AIRCRAFT):
+        for r, route in enumerate(ROUTES):
+            profit, flight_time_hours = scalar_profit(aircraft, route)
+            assert economics['estimated_profit'][i, r] == pytest.approx(profit)
+            assert economics['flight_time_hours'][i, r] == pytest.approx(flight_time_hours)
@@ -0,0 +1,74 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import src.query_executor
+from flask import g
+from src.main import app
+from src.query_executor import fan_out, get_executor
+
+request_tag = contextvars.ContextVar('request_tag', default=None)
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    """A one-thread pool, so any nested wait on the pool would deadlock"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(src.query_executor, '_executor', executor)
+    monkeypatch.setattr(src.query_executor, '_executor_pid', src.query_executor.os.getpid())
+    yield executor
+    executor.shutdown(wait=False)
+
+def test_calls_run_concurrently():
+    """Test every call is in flight at once, so they can all meet at a barrier"""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def meet(value):
+        return lambda: (barrier.wait(), value)[1]
+
+    assert fan_out(a=meet(1), b=meet(2), c=meet(3)) == {'a': 1, 'b': 2, 'c': 3}
+
+def test_single_call_runs_inline():
+    """Test one call is not handed to the pool"""
+    assert fan_out(only=threading.current_thread) == {'only': threading.current_thread()}
+
+def test_exception_is_propagated():
+    """Test a failing call's exception reaches the caller"""
+    def fail():
+        raise LookupError('no such row')
+
+    with pytest.raises(LookupError, match='no such row'):
+        fan_out(ok=lambda: 1, failing=fail)
+
+def test_context_is_copied_into_the_pool():
+    """Test context variables and Flask's g are visible to pooled calls"""
+    request_tag.set('outer')
+    with app.app_context():
+        g.airline = {'id': 7}
+        result = fan_out(tag=request_tag.get, airline=lambda: g.airline)
+    assert result == {'tag': 'outer', 'airline': {'id': 7}}
+
+def test_pooled_calls_do_not_leak_context_changes():
+    """Test a call setting a variable changes only its own copy"""
+    request_tag.set('outer')
+    fan_out(a=lambda: request_tag.set('inner'), b=lambda: None)
+    assert request_tag.get() == 'outer'
+
+def test_nested_fan_out_runs_inline(small_pool):
+    """Test a fan-out inside a pooled call does not wait on the saturated pool"""
+    def nested():
+        return fan_out(x=lambda: 'x', y=lambda: 'y')
+
+    outcome = {}
+    caller = threading.Thread(target=lambda: outcome.update(fan_out(outer=nested, other=lambda: 'other')), daemon=True)
+    caller.start()
+    caller.join(5)
+    assert not caller.is_alive()
+    assert outcome == {'outer': {'x': 'x', 'y': 'y'}, 'other': 'other'}
+
+def test_pool_is_rebuilt_in_a_new_process(monkeypatch):
+    """Test a pool inherited from another pid is replaced"""
+    executor = get_executor()
+    assert get_executor() is executor
+    monkeypatch.setattr(src.query_executor, '_executor_pid', -1)
+    assert get_executor() is not executor
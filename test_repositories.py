@@ -0,0 +1,95 @@
+import pytest
+from src.main import SUPABASE_KEY
+from src.repositories import Repositories
+from src.repositories.stores import MemoryStore, SQLiteStore, SupabaseStore
+from src.supabase_client import ManagedSupabase
+from src.benchmarks.fake_supabase import FakeSupabase, serve
+from src.benchmarks.synthetic import generate
+
+AIRPORTS = [
+    {"code": "JFK", "name": "John F. Kennedy", "city": "New York", "country": "USA", "runway_length": 4423, "hub_size": 5, "latitude": 40.6413, "longitude": -73.7781},
+    {"code": "LHR", "name": "Heathrow", "city": "London", "country": "UK", "runway_length": 3902, "hub_size": 5, "latitude": 51.47, "longitude": -0.4543},
+]
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repos(request):
+    store = MemoryStore() if request.param == "memory" else SQLiteStore()
+    repositories = Repositories(store)
+    for airport in AIRPORTS:
+        store.insert('airports', airport)
+    return repositories
+
+def make_route(repos, airline_id, **fields):
+    route = {
+        'airline_id': airline_id,
+        'origin_airport_code': 'JFK',
+        'destination_airport_code': 'LHR',
+        'distance_km': 5540,
+        'demand_economy': 100
+    }
+    route.update(fields)
+    return repos.routes.create(route)
+
+def test_airport_lookup(repos):
+    """Test airports are listed and fetched by code"""
+    assert {a['code'] for a in repos.airports.list_all()} == {'JFK', 'LHR'}
+    assert repos.airports.get('LHR')['city'] == 'London'
+    assert repos.airports.get('XXX') is None
+
+def test_route_create_assigns_id(repos):
+    """Test new routes get increasing ids and defaults"""
+    first = make_route(repos, 1)
+    second = make_route(repos, 1)
+
+    assert second['id'] > first['id']
+    assert first['created_at']
+    assert repos.routes.get(first['id'])['distance_km'] == 5540
+
+def test_route_writes_are_scoped_to_airline(repos):
+    """Test owned updates and deletes only touch the airline's routes"""
+    mine = make_route(repos, 1)
+    theirs = make_route(repos, 2)
+
+    assert repos.routes.update_owned(theirs['id'], 1, {'demand_economy': 5}) == []
+    updated = repos.routes.update_owned(mine['id'], 1, {'demand_economy': 5})
+    assert updated[0]['demand_economy'] == 5
+
+    changed = repos.routes.update_owned_many([mine['id'], theirs['id']], 1, {'demand_first': 3})
+    assert [r['id'] for r in changed] == [mine['id']]
+
+    assert repos.routes.delete_owned(theirs['id'], 1) == []
+    assert repos.routes.delete_owned(mine['id'], 1)[0]['id'] == mine['id']
+    assert repos.routes.existing_ids([mine['id'], theirs['id']]) == {theirs['id']}
+
+def test_route_get_many_coerces_ids(repos):
+    """Test batch lookups accept string ids like the query string provides"""
+    route = make_route(repos, 1)
+
+    assert set(repos.routes.get_many([route['id'], route['id'], 999])) == {route['id']}
+    assert repos.routes.get(str(route['id']))['id'] == route['id']
+    assert [r['id'] for r in repos.routes.list_for_airline(1)] == [route['id']]
+
+def test_unknown_column_is_rejected(repos):
+    """Test filters on columns outside the schema fail loudly"""
+    with pytest.raises(ValueError):
+        repos.store.select('routes', where=[('nope', 'eq', 1)])
+
+def test_list_all_pages_past_the_row_cap():
+    """Test whole-table reads page through a server that truncates responses"""
+    fake = FakeSupabase(max_rows=7)
+    data = generate(airports=30, aircraft=9, routes=1)
+    fake.load({'airports': data['airports'], 'aircraft': data['aircraft']})
+    server = serve(fake)
+    try:
+        client = ManagedSupabase(f'http://127.0.0.1:{server.server_address[1]}', SUPABASE_KEY)
+        store = SupabaseStore(client, page_size=7)
+
+        # A single select only sees the first capped page
+        assert len(store.select('airports')) == 7
+
+        repositories = Repositories(store)
+        assert sorted(a['code'] for a in repositories.airports.list_all()) == sorted(a['code'] for a in data['airports'])
+        assert len(repositories.aircraft.list_all()) == 9
+        assert fake.stats()['calls']['GET airports'] == 1 + 5
+    finally:
+        server.shutdown()
@@ -0,0 +1,79 @@
+import json
+import logging
+import pytest
+import src.repositories
+from src.main import app, supabase
+from src.reference_data import reference_data
+from src.request_timing import RequestTiming, server_timing_header, upstream_call
+from src.benchmarks.fake_supabase import FakeSupabase, seed, serve
+from src.benchmarks.synthetic import generate
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """Serve the app's Supabase calls from a local fake"""
+    fake = FakeSupabase()
+    seed(fake, generate(airports=30, aircraft=5, routes=20), users=1)
+    server = serve(fake)
+    original_url = supabase._url
+    monkeypatch.setattr(src.repositories, '_repositories', None)
+    supabase.reset(url=f'http://127.0.0.1:{server.server_address[1]}')
+    reference_data.invalidate()
+    yield fake
+    supabase.reset(url=original_url)
+    reference_data.invalidate()
+    server.shutdown()
+
+def test_upstream_call_names_and_filter_shape():
+    """Test calls are named table.op and filters keep no values"""
+    assert upstream_call('PATCH', '/rest/v1/routes', 'id=in.(1,2)&airline_id=eq.7&select=*') == (
+        'routes.update', ['id=in', 'airline_id=eq']
+    )
+    assert upstream_call('POST', '/auth/v1/token', 'grant_type=password') == ('auth.token', [])
+
+def test_concurrent_calls_are_not_double_counted():
+    """Test overlapping calls count once towards Supabase wall time"""
+    timing = RequestTiming()
+    timing.add_call('airports.select', 0.0, 0.010)
+    timing.add_call('aircraft.select', 0.002, 0.008)
+    timing.add_call('routes.select', 0.020, 0.025)
+
+    assert timing.upstream_wall_seconds() == pytest.approx(0.015)
+    summary = timing.summary()
+    assert summary['supabase_calls'] == 3
+    assert 'routes.select;dur=5.0;desc="1x"' in server_timing_header(summary)
+
+def test_responses_carry_server_timing(fake_backend, caplog):
+    """Test a request reports its Supabase calls, compute and serialization"""
+    client = app.test_client()
+    with caplog.at_level(logging.INFO, logger='airline_manager.request'):
+        logging.getLogger('airline_manager.request').propagate = True
+        try:
+            response = client.get('/api/routes/1')
+        finally:
+            logging.getLogger('airline_manager.request').propagate = False
+
+    assert response.status_code == 200
+    header = response.headers['Server-Timing']
+    assert 'supabase;dur=' in header and '1 calls' in header
+    assert 'routes.select;dur=' in header
+    assert 'serialize;dur=' in header
+
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line['path'] == '/api/routes/1'
+    assert line['upstream']['routes.select']['count'] == 1
+
+def test_slow_calls_are_logged(fake_backend, monkeypatch, caplog):
+    """Test calls over the threshold are logged with their filter shape"""
+    monkeypatch.setattr('src.request_timing.SLOW_QUERY_MS', 0)
+    logger = logging.getLogger('airline_manager.slow_query')
+    logger.propagate = True
+    try:
+        with caplog.at_level(logging.WARNING, logger='airline_manager.slow_query'):
+            app.test_client().get('/api/routes/1')
+    finally:
+        logger.propagate = False
+
+    slow = [json.loads(r.getMessage()) for r in caplog.records if r.name == 'airline_manager.slow_query']
+    assert slow[0]['call'] == 'routes.select'
+    assert slow[0]['filters'] == ['id=eq']
+    assert slow[0]['path'] == '/api/routes/1'
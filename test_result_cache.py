@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from src.result_cache import CacheEntry, DiskTier, MemoryTier, result_cache
+
+@pytest.fixture
+def client(seeded_client):
+    return seeded_client(airports=60, aircraft=12, routes=10, seed=3, route_airline=lambda route_id: 1,
+                         airlines=[{'id': 1, 'user_id': 'u1', 'name': 'Test Air'}], user='u1')
+
+def test_repeated_route_recommendations_are_served_from_cache(client):
+    """Test the second identical request is a hit with the same body"""
+    url = f'/api/routes/recommend?hub={client.hub}&limit=5'
+    first = client.get(url)
+    second = client.get(url)
+    assert first.headers['X-Result-Cache'] == 'miss'
+    assert second.headers['X-Result-Cache'] == 'hit'
+    assert second.get_json() == first.get_json()
+    assert client.get(url + '&offset=1').headers['X-Result-Cache'] == 'miss'
+    assert client.get(url, headers={'Cache-Control': 'no-cache'}).headers['X-Result-Cache'] == 'bypass'
+
+def test_errors_are_not_cached(client):
+    """Test a 404 is recomputed rather than remembered"""
+    assert client.get('/api/routes/recommend?hub=ZZZ').status_code == 404
+    assert client.get('/api/routes/recommend?hub=ZZZ').headers['X-Result-Cache'] == 'miss'
+    assert client.get('/api/aircraft/recommend?route_id=abc').status_code == 400
+
+def test_route_update_invalidates_only_that_route(client):
+    """Test updating route 1 recomputes its recommendation but not route 2's"""
+    for route_id in (1, 2):
+        client.get(f'/api/aircraft/recommend?route_id={route_id}')
+    assert client.put('/api/routes/1', json={'demand_economy': 999}).status_code == 200
+
+    first = client.get('/api/aircraft/recommend?route_id=1')
+    assert first.headers['X-Result-Cache'] == 'miss'
+    assert first.get_json()['route']['demand_economy'] == 999
+    assert client.get('/api/aircraft/recommend?route_id=2').headers['X-Result-Cache'] == 'hit'
+
+    client.put('/api/routes/', json={'routes': [{'id': 2, 'demand_economy': 5}]})
+    assert client.get('/api/aircraft/recommend?route_id=2').headers['X-Result-Cache'] == 'miss'
+
+    assert client.delete('/api/routes/1').status_code == 200
+    assert client.get('/api/aircraft/recommend?route_id=1').status_code == 404
+
+def test_route_changed_elsewhere_is_not_served_from_cache(client):
+    """Test a write that bypassed this worker still changes the cache key"""
+    client.get('/api/aircraft/recommend?route_id=3')
+    # As if another host updated the route
+    client.store.update('routes', {'demand_business': 77}, where=[('id', 'eq', 3)])
+
+    response = client.get('/api/aircraft/recommend?route_id=3')
+    assert response.headers['X-Result-Cache'] == 'miss'
+    assert response.get_json()['route']['demand_business'] == 77
+
+def test_stale_entries_are_served_while_refreshing(client):
+    """Test an expired entry is served once more and refreshed in the background"""
+    url = f'/api/routes/recommend?hub={client.hub}&limit=3'
+    client.get(url)
+    for entry in result_cache.tiers[0]._entries.values():
+        entry.fresh_until = time.time() - 1
+
+    stale = client.get(url)
+    assert stale.headers['X-Result-Cache'] == 'stale'
+    deadline = time.time() + 5
+    while client.get(url).headers['X-Result-Cache'] != 'hit':
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+def test_memory_tier_evicts_least_recently_used_by_size():
+    """Test the byte budget evicts the oldest untouched entry"""
+    tier = MemoryTier(max_bytes=3 * CacheEntry(b'x' * 100, 0, 0).size)
+    for key in ('a', 'b', 'c'):
+        tier.set(key, CacheEntry(b'x' * 100, 0, 0))
+    tier.get('a')
+    tier.set('d', CacheEntry(b'x' * 100, 0, 0))
+    assert tier.get('b') is None
+    assert tier.get('a') is not None
+    assert tier.bytes <= tier.max_bytes
+    tier.set('huge', CacheEntry(b'x' * 1000, 0, 0))
+    assert tier.get('huge') is None
+
+def test_disk_tier_round_trip_and_prune(tmp_path):
+    """Test entries survive a new tier instance and pruning respects the budget"""
+    tier = DiskTier(str(tmp_path), max_bytes=10_000)
+    tier.set('key', CacheEntry(b'{"a":1}', 10.0, 20.0))
+    entry = DiskTier(str(tmp_path)).get('key')
+    assert (entry.body, entry.fresh_until, entry.stale_until) == (b'{"a":1}', 10.0, 20.0)
+    assert tier.get('other') is None
+
+    for i in range(40):
+        tier.set(f'k{i}', CacheEntry(b'x' * 1000, 0, 0))
+    tier.prune()
+    assert sum(p.stat().st_size for p in tmp_path.glob('*.entry')) <= 10_000
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from src.routes.routes import MAX_RECOMMEND_LIMIT, MAX_RECOMMEND_OFFSET, top_indexes
+
+@pytest.fixture
+def client(seeded_client):
+    client = seeded_client(airports=80, aircraft=6, routes=5, seed=11)
+    client.aircraft_id = max(client.data['aircraft'], key=lambda a: a['range_km'] or 0)['id']
+    return client
+
+def recommend(client, query):
+    response = client.get(f'/api/routes/recommend?hub={client.hub}&{query}',
+                          headers={'Cache-Control': 'no-cache'})
+    assert response.status_code == 200
+    return response.get_json()['recommended_routes']
+
+@pytest.mark.parametrize('k', [1, 5, 17, 50, 60, 200])
+def test_top_indexes_match_a_stable_full_sort(k):
+    """Test the partial sort picks and orders like a full stable sort, ties included"""
+    rng = np.random.default_rng(k)
+    for ranking in (rng.integers(0, 8, 60), rng.normal(size=60), np.zeros(60)):
+        expected = sorted(range(len(ranking)), key=ranking.__getitem__, reverse=True)[:k]
+        assert top_indexes(ranking, k).tolist() == expected
+
+@pytest.mark.parametrize('sort, field, descending', [
+    ('profit', 'estimated_profit', True),
+    ('demand', 'demand_economy', True),
+    ('distance', 'distance_km', False)
+])
+def test_pages_are_slices_of_the_full_ranking(client, sort, field, descending):
+    """Test each page equals the same slice of one response holding every candidate"""
+    query = f'aircraft={client.aircraft_id}&sort={sort}'
+    ranking = recommend(client, f'{query}&limit={MAX_RECOMMEND_LIMIT}')
+    values = [route[field] for route in ranking]
+    assert values == sorted(values, reverse=descending)
+    assert len(ranking) > 14
+
+    codes = [route['destination_airport_code'] for route in ranking]
+    for offset in (0, 5, len(codes) - 3):
+        page = recommend(client, f'{query}&limit=7&offset={offset}')
+        assert [route['destination_airport_code'] for route in page] == codes[offset:offset + 7]
+
+def test_offset_past_the_candidates_is_empty(client):
+    """Test a page beyond the last candidate has no routes"""
+    assert recommend(client, f'limit=5&offset={MAX_RECOMMEND_OFFSET}') == []
+
+@pytest.mark.parametrize('query', [
+    'limit=0',
+    'limit=abc',
+    'offset=1.5',
+    f'limit={MAX_RECOMMEND_LIMIT + 1}',
+    'offset=-1',
+    f'offset={MAX_RECOMMEND_OFFSET + 1}',
+    'sort=unknown',
+    'sort=profit'
+])
+def test_invalid_parameters_are_rejected(client, query):
+    """Test malformed or out-of-range paging and unsupported sorts return 400"""
+    response = client.get(f'/api/routes/recommend?hub={client.hub}&{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid parameters'
+
+def test_missing_hub_is_rejected(client):
+    """Test the hub parameter is required"""
+    assert client.get('/api/routes/recommend').status_code == 400
+
+def test_unknown_aircraft_is_404(client):
+    """Test an aircraft id with no aircraft is reported as such, whatever the sort"""
+    for query in ('aircraft=99999', 'aircraft=99999&sort=profit'):
+        response = client.get(f'/api/routes/recommend?hub={client.hub}&{query}')
+        assert response.status_code == 404
+        assert response.get_json()['error'] == 'Aircraft not found'
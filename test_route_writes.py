@@ -0,0 +1,67 @@
+import pytest
+
+@pytest.fixture
+def client(seeded_client, counting_store):
+    # Routes 1-3 belong to airline 1, the rest to airline 2
+    return seeded_client(airports=20, aircraft=4, routes=6, seed=8, store=counting_store,
+                         route_airline=lambda route_id: 1 if route_id <= 3 else 2, user='u1', airlines=[
+                             {'id': 1, 'user_id': 'u1', 'name': 'Test Air'},
+                             {'id': 2, 'user_id': 'u2', 'name': 'Other Air'}
+                         ])
+
+def test_single_update_is_one_conditional_statement(client):
+    """Test updating an owned route runs a single scoped UPDATE"""
+    response = client.put('/api/routes/1', json={'demand_economy': 42})
+    assert response.status_code == 200
+    assert response.get_json()['route']['demand_economy'] == 42
+    assert client.store.route_statements() == ['update']
+
+def test_single_delete_is_one_conditional_statement(client):
+    """Test deleting an owned route runs a single scoped DELETE"""
+    assert client.delete('/api/routes/2').status_code == 200
+    assert client.store.route_statements() == ['delete']
+
+def test_missing_route_is_404_and_foreign_route_is_403(client):
+    """Test writes that match nothing tell missing and foreign routes apart"""
+    assert client.put('/api/routes/999', json={'demand_economy': 1}).status_code == 404
+    assert client.put('/api/routes/5', json={'demand_economy': 1}).status_code == 403
+    assert client.delete('/api/routes/999').status_code == 404
+    assert client.delete('/api/routes/5').status_code == 403
+    assert client.store.select('routes', where=[('id', 'eq', 5)])[0]['demand_economy'] != 1
+
+def test_bulk_update_mixed_batch(client):
+    """Test a batch updates owned routes and reports missing and foreign ids"""
+    response = client.put('/api/routes/', json={'routes': [
+        {'id': 1, 'demand_economy': 10},
+        {'id': 2, 'demand_economy': 10},
+        {'id': 3, 'demand_first': 4},
+        {'id': 5, 'demand_economy': 10},
+        {'id': 999, 'demand_economy': 10}
+    ]})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert sorted(route['id'] for route in body['routes']) == [1, 2, 3]
+    assert body['not_found_ids'] == [999]
+    assert body['forbidden_ids'] == [5]
+    # Identical changes share one statement
+    assert client.store.route_statements().count('update') == 2
+
+def test_bulk_update_rejects_duplicate_ids(client):
+    """Test a batch naming a route twice is rejected before any write"""
+    response = client.put('/api/routes/', json={'routes': [
+        {'id': 1, 'demand_economy': 10},
+        {'id': 1, 'demand_economy': 20}
+    ]})
+    assert response.status_code == 400
+    assert client.store.route_statements() == []
+
+def test_bulk_update_rejects_bad_bodies(client):
+    """Test empty, malformed, field-less and non-scalar batches are 400s"""
+    assert client.put('/api/routes/', json={}).status_code == 400
+    assert client.put('/api/routes/', json={'routes': []}).status_code == 400
+    assert client.put('/api/routes/', json={'routes': [{'id': 'x', 'demand_economy': 1}]}).status_code == 400
+    assert client.put('/api/routes/', json={'routes': [{'id': 1}]}).status_code == 400
+    assert client.put('/api/routes/', json={'routes': [{'id': True, 'demand_economy': 1}]}).status_code == 400
+    assert client.put('/api/routes/', json={'routes': [{'id': 1, 'demand_economy': [1]}]}).status_code == 400
+    assert client.put('/api/routes/', json={'routes': [{'id': 1, 'demand_economy': {'a': 1}}]}).status_code == 400
+    assert client.store.route_statements() == []
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from src.runway_feasibility import RunwayFeasibility
+
+def test_bitsets_match_runway_comparison():
+    """Test every bit equals the runway comparison it replaces"""
+    rng = np.random.default_rng(4)
+    runways = rng.integers(1000, 4500, size=77).astype(np.float64)
+    runways[5] = np.nan
+    required = np.array([1500, 2500, 3800, np.nan])
+    feasibility = RunwayFeasibility(runways, required)
+    expected = required[:, None] <= runways[None, :]
+
+    assert feasibility.bits.shape == (4, 10)
+    for i in range(4):
+        assert (feasibility.airports_for(i) == expected[i]).all()
+    assert (feasibility.aircraft_at(np.arange(77)) == expected).all()
+    assert not feasibility.aircraft_at([5, -1]).any()
+
+def test_route_feasibility_needs_both_ends():
+    """Test a route is feasible only where the aircraft can use both airports"""
+    feasibility = RunwayFeasibility([3000, 2000, 1000], [1500, 2500])
+    routes = feasibility.aircraft_for_routes([0, 0, 1, -1], [1, 2, 0, 0])
+    assert routes.tolist() == [[True, False, True, False], [False, False, False, False]]
+
+@pytest.fixture
+def client(seeded_client):
+    return seeded_client(airports=80, aircraft=10, routes=5, seed=9)
+
+def test_operable_airports_endpoint(client):
+    """Test the endpoint lists airports by runway and, from an origin, by range"""
+    airports = client.data['airports']
+    aircraft = max(client.data['aircraft'], key=lambda a: a['required_runway_length'])
+    usable = [a for a in airports if a['runway_length'] >= aircraft['required_runway_length']]
+
+    body = client.get(f'/api/aircraft/{aircraft["id"]}/airports?limit=1000').get_json()
+    assert [a['code'] for a in body['airports']] == [a['code'] for a in usable]
+    assert body['count'] == len(usable)
+
+    origin = usable[0]
+    response = client.get(f'/api/aircraft/{aircraft["id"]}/airports?origin={origin["code"]}&min_distance_km=500')
+    body = response.get_json()
+    distances = [a['distance_km'] for a in body['airports']]
+    assert distances == sorted(distances)
+    assert all(500 <= d <= aircraft['range_km'] + 1 for d in distances)
+    assert {a['code'] for a in body['airports']} <= {a['code'] for a in usable} - {origin['code']}
+    assert client.get(response.request.full_path, headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+def test_operable_airports_errors(client):
+    """Test unknown ids and origins, bounds without an origin and bad bounds are rejected"""
+    assert client.get('/api/aircraft/9999/airports').status_code == 404
+    assert client.get('/api/aircraft/1/airports?origin=ZZZ').status_code == 404
+    assert client.get('/api/aircraft/1/airports?max_distance_km=100').status_code == 400
+    assert client.get('/api/aircraft/1/airports?limit=0').status_code == 400
+    origin = client.data['airports'][0]['code']
+    for bound in ('min_distance_km=nan', 'max_distance_km=inf', 'max_distance_km=-1'):
+        assert client.get(f'/api/aircraft/1/airports?origin={origin}&{bound}').status_code == 400
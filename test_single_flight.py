@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import src.routes.routes
+from src.main import app
+from src.result_cache import result_cache
+from src.single_flight import SingleFlight
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.005)
+
+def test_concurrent_callers_share_one_computation():
+    """Test callers arriving while the leader runs get its result"""
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'result'
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flights.do, 'key', compute) for _ in range(5)]
+        wait_for(lambda: flights.coalesced == 4)
+        release.set()
+        assert [f.result() for f in futures] == ['result'] * 5
+    assert len(calls) == 1
+    assert flights.stats()['in_flight'] == 0
+
+    # Later calls start a new computation
+    release.set()
+    flights.do('key', compute)
+    assert len(calls) == 2
+
+def test_leader_exception_is_shared():
+    """Test waiters see the leader's failure instead of a result"""
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError('upstream down')
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flights.do, 'key', fail) for _ in range(3)]
+        wait_for(lambda: flights.coalesced == 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+
+def test_lock_file_coalesces_across_workers(tmp_path):
+    """Test a second worker waits on the lock file and reuses the stored result"""
+    worker_a = SingleFlight(lock_dir=str(tmp_path))
+    worker_b = SingleFlight(lock_dir=str(tmp_path))
+    shared = {}
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute_a():
+        started.set()
+        release.wait(5)
+        shared['key'] = 'from a'
+        return 'from a'
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(worker_a.do, 'key', compute_a)
+        # compute_a runs while worker A holds the lock file
+        assert started.wait(5)
+        second = pool.submit(worker_b.do, 'key', lambda: 'computed by b', lambda: shared.get('key'))
+        time.sleep(0.05)
+        assert not second.done()
+        release.set()
+        assert first.result() == 'from a'
+        assert second.result() == 'from a'
+
+def test_lock_files_are_per_key_and_removed(tmp_path):
+    """Test a held key does not block another key and leaves no file behind"""
+    worker_a = SingleFlight(lock_dir=str(tmp_path))
+    worker_b = SingleFlight(lock_dir=str(tmp_path))
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute_a():
+        started.set()
+        release.wait(5)
+        return 'a'
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(worker_a.do, 'key-a', compute_a)
+        assert started.wait(5)
+        assert len(list(tmp_path.iterdir())) == 1
+        # Worker A still holds its lock while B runs an unrelated key
+        # recheck only runs after waiting on another worker's lock
+        assert worker_b.do('key-b', lambda: 'b', lambda: 'waited') == 'b'
+        release.set()
+        assert first.result() == 'a'
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.fixture
+def hub(seeded_client, monkeypatch):
+    monkeypatch.setattr(result_cache, 'flights', SingleFlight())
+    return seeded_client(airports=40, aircraft=8, routes=5, seed=5).hub
+
+def test_identical_recommend_requests_compute_once(hub, monkeypatch):
+    """Test concurrent identical misses run the recommendation once"""
+    compute = src.routes.routes.recommend_routes_from
+    calls = []
+
+    def slow_compute(*args):
+        calls.append(args)
+        time.sleep(0.3)
+        return compute(*args)
+
+    monkeypatch.setattr(src.routes.routes, 'recommend_routes_from', slow_compute)
+    url = f'/api/routes/recommend?hub={hub}&limit=4'
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        responses = list(pool.map(lambda _: app.test_client().get(url), range(6)))
+
+    assert len(calls) == 1
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.get_data() for response in responses}) == 1
@@ -0,0 +1,78 @@
+import random
+import pytest
+from src.geodesy import AirportCoordinates
+from src.pagination import MAX_PAGE_SIZE
+from src.reference_data import reference_data
+from src.spatial_index import AirportGrid, airports_near
+
+def make_airports(n=500, seed=7):
+    rnd = random.Random(seed)
+    return [
+        {"code": f"A{i:03d}", "latitude": rnd.uniform(-89, 89), "longitude": rnd.uniform(-180, 180)}
+        for i in range(n)
+    ]
+
+def brute_force(coordinates, i, radius_km):
+    distances = coordinates.distances_from(i)
+    return sorted((d, j) for j, d in enumerate(distances) if d <= radius_km)
+
+@pytest.mark.parametrize("radius_km", [300, 1500, 6000, 15000, 25000])
+def test_within_matches_brute_force(radius_km):
+    """Test range queries return exactly the airports a full scan finds"""
+    airports = make_airports()
+    coordinates = AirportCoordinates.from_airports(airports)
+    grid = AirportGrid(coordinates)
+
+    for i in (0, 17, 123, 499):
+        indexes, distances = grid.within(airports[i]['latitude'], airports[i]['longitude'], radius_km)
+        expected = brute_force(coordinates, i, radius_km)
+        assert sorted(indexes.tolist()) == sorted(j for _, j in expected)
+        assert list(distances) == sorted(distances)
+
+def test_within_across_antimeridian():
+    """Test range queries wrap around the 180th meridian"""
+    airports = [
+        {"code": "EAST", "latitude": 0.0, "longitude": 179.5},
+        {"code": "WEST", "latitude": 0.0, "longitude": -179.5},
+        {"code": "FAR", "latitude": 0.0, "longitude": 0.0},
+    ]
+    grid = AirportGrid(AirportCoordinates.from_airports(airports))
+
+    indexes, _ = grid.within(0.0, 179.5, 200)
+    assert sorted(indexes.tolist()) == [0, 1]
+
+def test_nearest_excludes_origin():
+    """Test k-nearest queries return the k closest other airports"""
+    airports = make_airports()
+    coordinates = AirportCoordinates.from_airports(airports)
+    grid = AirportGrid(coordinates)
+
+    indexes, distances = airports_near(grid, airports[42], k=5)
+    expected = brute_force(coordinates, 42, float('inf'))[1:6]
+    assert indexes.tolist() == [j for _, j in expected]
+    assert 42 not in indexes.tolist()
+
+@pytest.fixture
+def client(seeded_client):
+    return seeded_client(airports=50, aircraft=2, routes=1, seed=2, tables={"airports"})
+
+def test_nearby_endpoint(client):
+    """Test the endpoint answers radius and k queries sorted by distance"""
+    code = reference_data.airports()[0]["code"]
+    body = client.get(f"/api/airports/nearby?code={code}&k=3").get_json()
+    assert len(body["airports"]) == 3
+    distances = [airport["distance_km"] for airport in body["airports"]]
+    assert distances == sorted(distances)
+
+    body = client.get(f"/api/airports/nearby?code={code}&radius_km=2000").get_json()
+    assert all(airport["distance_km"] <= 2000 for airport in body["airports"])
+
+@pytest.mark.parametrize("query", [
+    "radius_km=nan", "radius_km=inf", "radius_km=-inf", "radius_km=-1", "k=0", f"k={MAX_PAGE_SIZE + 1}", "k=100000000"
+])
+def test_nearby_rejects_invalid_bounds(client, query):
+    """Test non-finite or negative radii and k outside 1..MAX_PAGE_SIZE return 400"""
+    code = reference_data.airports()[0]["code"]
+    response = client.get(f"/api/airports/nearby?code={code}&{query}")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid parameters"
@@ -0,0 +1,96 @@
+import os
+
+import httpx
+import pytest
+import src.main
+from src.main import app
+from src.supabase_client import InstrumentedTransport, ManagedSupabase
+
+URL = 'https://project.supabase.co'
+KEY = 'header.payload.signature'
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Answer every upstream request with an empty result instead of the network"""
+    requests = []
+
+    def handle_request(transport, request):
+        requests.append(request)
+        return httpx.Response(200, json=[], request=request)
+
+    monkeypatch.setattr(httpx.HTTPTransport, 'handle_request', handle_request)
+    return requests
+
+def test_client_is_created_lazily_once_per_process(upstream):
+    """Test no client exists before first use and later uses share it"""
+    managed = ManagedSupabase(URL, KEY)
+    assert managed._client is None
+    assert managed.pool_stats() is None
+
+    client = managed.get_client()
+    assert managed.get_client() is client
+    assert managed.table('airports').select('*').execute().data == []
+    assert managed.get_client() is client
+    assert upstream[0].url.host == 'project.supabase.co'
+
+def test_pool_stats_count_requests(upstream):
+    """Test calls made through the client show up in its transport stats"""
+    managed = ManagedSupabase(URL, KEY)
+    managed.table('airports').select('*').execute()
+    managed.table('aircraft').select('*').execute()
+
+    stats = managed.pool_stats()
+    assert isinstance(managed._transport, InstrumentedTransport)
+    assert stats['requests'] == 2
+    assert stats['errors'] == 0
+    assert stats['in_flight'] == 0
+
+def test_client_is_rebuilt_in_a_new_process(upstream):
+    """Test a client inherited from another pid is replaced on next use"""
+    managed = ManagedSupabase(URL, KEY)
+    inherited = managed.get_client()
+    managed._pid = os.getpid() + 1
+    assert managed.pool_stats() is None
+    assert managed.get_client() is not inherited
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+def test_forked_child_builds_its_own_client(upstream):
+    """Test a child process never reuses the parent's client or pool"""
+    managed = ManagedSupabase(URL, KEY)
+    parent_client = managed.get_client()
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        rebuilt = managed.get_client() is not parent_client and managed._pid == os.getpid()
+        os.write(write_end, b'1' if rebuilt else b'0')
+        os._exit(0)
+    os.close(write_end)
+    assert os.read(read_end, 1) == b'1'
+    os.waitpid(pid, 0)
+    assert managed.get_client() is parent_client
+
+def test_reset_drops_the_client_and_patched_attributes(upstream):
+    """Test reset() forgets the client, stats and attributes set on the wrapper"""
+    managed = ManagedSupabase(URL, KEY)
+    client = managed.get_client()
+    managed.auth = 'patched'
+    managed.reset(url='https://other.supabase.co')
+
+    assert managed.pool_stats() is None
+    assert managed.get_client() is not client
+    assert managed.auth is managed.get_client().auth
+    managed.table('airports').select('*').execute()
+    assert upstream[-1].url.host == 'other.supabase.co'
+
+def test_health_reports_pool_stats(upstream, monkeypatch):
+    """Test /health shows None before first use and the pool stats after"""
+    managed = ManagedSupabase(URL, KEY)
+    monkeypatch.setattr(src.main, 'supabase', managed)
+    client = app.test_client()
+    assert client.get('/health').get_json() == {'status': 'ok', 'supabase_pool': None}
+
+    managed.table('airports').select('*').execute()
+    pool = client.get('/health').get_json()['supabase_pool']
+    assert pool['requests'] == 1
+    assert pool['max_connections'] > 0